@@ -0,0 +1,249 @@
+"""
+Order-update parsing benchmark: raw GRVT / Paradex order payloads -> what the consumer holds.
+
+Compares the previous path (walk the payload into a dict of strings, which the consumer re-parses
+into Decimals; OrderInfo with Decimals for open orders) with the direct parsers in
+exchanges/records.py (one OrderRecord with fixed-point ints). Reports microseconds per update and,
+from tracemalloc, the blocks and bytes still held per update and the per-update peak.
+
+Usage:
+    python benchmarks/bench_order_records.py [--updates 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exchanges.base import OrderInfo  # noqa: E402
+from exchanges.records import FixedScale, grvt_order_record, paradex_order_record  # noqa: E402
+
+GRVT_INSTRUMENT = "BTC_USDT_Perp"
+PARADEX_MARKET = "BTC-USD-PERP"
+CLOSE_SIDE = "sell"
+GRVT_SCALE = FixedScale.from_tick(Decimal("0.1"), 9)
+PARADEX_SCALE = FixedScale.from_increments(Decimal("0.1"), Decimal("0.0001"))
+
+
+def grvt_payloads(n: int, rng: random.Random) -> list[dict]:
+    payloads = []
+    for i in range(n):
+        size = rng.choice(("0.01", "0.02", "0.05"))
+        traded = rng.choice(("0.0", "0.0", "0.005", size))
+        status = "FILLED" if traded == size else rng.choice(("OPEN", "OPEN", "CANCELLED"))
+        payloads.append({
+            "order_id": f"0x{rng.getrandbits(124):031x}",
+            "sub_account_id": "2345678901234",
+            "is_market": False,
+            "time_in_force": "GOOD_TILL_TIME",
+            "post_only": True,
+            "reduce_only": False,
+            "legs": [{
+                "instrument": GRVT_INSTRUMENT,
+                "size": size,
+                "limit_price": f"{60000 + rng.randint(-500, 500) / 10:.1f}",
+                "is_buying_asset": bool(i & 1),
+            }],
+            "metadata": {"client_order_id": str(rng.getrandbits(63)), "create_time": str(1_700_000_000_000_000_000 + i)},
+            "state": {
+                "status": status,
+                "reject_reason": "UNSPECIFIED",
+                "book_size": [str(Decimal(size) - Decimal(traded))],
+                "traded_size": [traded],
+                "update_time": str(1_700_000_000_000_000_000 + i),
+                "avg_fill_price": ["0.0"],
+            },
+        })
+    return payloads
+
+
+def paradex_payloads(n: int, rng: random.Random) -> list[dict]:
+    payloads = []
+    for i in range(n):
+        size = rng.choice(("0.01", "0.02", "0.05"))
+        remaining = rng.choice((size, size, "0.005", "0"))
+        status = "CLOSED" if remaining == "0" else rng.choice(("NEW", "OPEN"))
+        payloads.append({
+            "id": str(1_700_000_000_000_000 + rng.getrandbits(40)),
+            "account": "0x" + "ab" * 32,
+            "market": PARADEX_MARKET,
+            "side": "BUY" if i & 1 else "SELL",
+            "type": "MARKET" if i % 7 == 0 else "LIMIT",
+            "size": size,
+            "remaining_size": remaining,
+            "price": f"{60000 + rng.randint(-500, 500) / 10:.1f}",
+            "status": status,
+            "created_at": 1_700_000_000_000 + i,
+            "last_updated_at": 1_700_000_000_000 + i,
+            "cancel_reason": "",
+            "client_id": "",
+            "instruction": "GTC",
+        })
+    return payloads
+
+
+# ==================== Previous implementation ====================
+
+GRVT_STATUS_MAP = {'OPEN': 'OPEN', 'FILLED': 'FILLED', 'CANCELLED': 'CANCELED', 'REJECTED': 'CANCELED'}
+PARADEX_STATUS_MAP = {'NEW': 'OPEN', 'OPEN': 'OPEN'}
+
+
+def legacy_grvt_update(data: dict):
+    leg = data.get('legs', [])[0] if data.get('legs') else None
+    if not leg or leg.get('instrument', '') != GRVT_INSTRUMENT:
+        return None
+    order_state = data.get('state', {})
+    order_id = data.get('order_id', '')
+    status = order_state.get('status', '')
+    side = 'buy' if leg.get('is_buying_asset') else 'sell'
+    size = leg.get('size', '0')
+    price = leg.get('limit_price', '0')
+    filled_size = order_state.get('traded_size')[0] if order_state.get('traded_size') else '0'
+    if Decimal(price) == 0:
+        price = data.get('state', {}).get('avg_fill_price', ['0'])[0]
+    order_type = "CLOSE" if side == CLOSE_SIDE else "OPEN"
+    mapped_status = GRVT_STATUS_MAP.get(status, status)
+    if status == 'OPEN' and Decimal(filled_size) > 0:
+        mapped_status = "PARTIALLY_FILLED"
+    update = {'order_id': order_id, 'side': side, 'order_type': order_type, 'status': mapped_status,
+              'size': size, 'price': price, 'contract_id': GRVT_INSTRUMENT, 'filled_size': filled_size}
+    # The consumer turns the strings back into numbers
+    return update, Decimal(update['size']), Decimal(update['price']), Decimal(update['filled_size'])
+
+
+def legacy_paradex_update(data: dict):
+    order_id = data.get("id")
+    status = data.get("status")
+    side = data.get("side", "").lower()
+    remaining_size = data.get("remaining_size")
+    size = data.get("size")
+    price = data.get("price")
+    contract_id = data.get("market")
+    filled_size = str(Decimal(size) - Decimal(remaining_size))
+    if contract_id != PARADEX_MARKET:
+        return None
+    order_type = "CLOSE" if side == CLOSE_SIDE else "OPEN"
+    status_map = dict(PARADEX_STATUS_MAP, CLOSED='CANCELED' if data.get("cancel_reason") else 'FILLED')
+    mapped_status = status_map.get(status, status)
+    if status == 'OPEN' and Decimal(filled_size) > 0:
+        mapped_status = "PARTIALLY_FILLED"
+    update = {'order_id': order_id, 'side': side, 'order_type': order_type, 'status': mapped_status,
+              'size': size, 'price': price, 'contract_id': contract_id, 'filled_size': filled_size}
+    return update, Decimal(update['size']), Decimal(update['price']), Decimal(update['filled_size'])
+
+
+def legacy_grvt_open_order(order: dict):
+    legs = order.get('legs', [])
+    if not legs:
+        return None
+    leg = legs[0]
+    state = order.get('state', {})
+    return OrderInfo(
+        order_id=order.get('order_id', ''),
+        side=leg.get('is_buying_asset', False) and 'buy' or 'sell',
+        size=Decimal(leg.get('size', 0)),
+        price=Decimal(leg.get('limit_price', 0)),
+        status=state.get('status', ''),
+        filled_size=(Decimal(state.get('traded_size', ['0'])[0])
+                     if isinstance(state.get('traded_size'), list) else Decimal(0)),
+        remaining_size=(Decimal(state.get('book_size', ['0'])[0])
+                        if isinstance(state.get('book_size'), list) else Decimal(0))
+    )
+
+
+def legacy_paradex_open_order(order: dict):
+    return OrderInfo(
+        order_id=order.get('id', ''),
+        side=order.get('side', '').lower(),
+        size=Decimal(order.get('remaining_size', 0)),
+        price=Decimal(order.get('price', 0)),
+        status=order.get('status', ''),
+        filled_size=Decimal(order.get('size', 0)) - Decimal(order.get('remaining_size', 0)),
+        remaining_size=Decimal(order.get('remaining_size', 0))
+    )
+
+
+# ==================== Measurement ====================
+
+def time_per_update(parse, payloads: list[dict], repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            parse(payload)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads) * 1e6
+
+
+def allocations_per_update(parse, payloads: list[dict]) -> tuple[float, float, float]:
+    """(blocks held, bytes held, peak bytes) per update, keeping every parsed result alive."""
+    held = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    base, _ = tracemalloc.get_traced_memory()
+    peak_bytes = 0
+    for payload in payloads:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        held.append(parse(payload))
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes += peak - current
+    current, _ = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename")
+                 if not stat.traceback[0].filename == tracemalloc.__file__)
+    n = len(payloads)
+    del held
+    return blocks / n, (current - base) / n, peak_bytes / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order payload parsing benchmark")
+    parser.add_argument("--updates", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    grvt = grvt_payloads(args.updates, rng)
+    paradex = paradex_payloads(args.updates, rng)
+
+    # Both paths must agree on what they extract
+    for payload in grvt[:1000]:
+        update, size, price, filled = legacy_grvt_update(payload)
+        record = grvt_order_record(payload, GRVT_SCALE, CLOSE_SIDE)
+        assert (record.status, record.order_type) == (update['status'], update['order_type'])
+        assert (GRVT_SCALE.to_size(record.size), GRVT_SCALE.to_price(record.price),
+                GRVT_SCALE.to_size(record.filled_size)) == (size, price, filled)
+    for payload in paradex[:1000]:
+        update, size, price, filled = legacy_paradex_update(payload)
+        record = paradex_order_record(payload, PARADEX_SCALE, CLOSE_SIDE)
+        assert (record.status, record.order_type) == (update['status'], update['order_type'])
+        assert (PARADEX_SCALE.to_size(record.size), PARADEX_SCALE.to_price(record.price),
+                PARADEX_SCALE.to_size(record.filled_size)) == (size, price, filled)
+
+    cases = [
+        ("grvt order update", grvt, legacy_grvt_update,
+         lambda p: grvt_order_record(p, GRVT_SCALE, CLOSE_SIDE)),
+        ("grvt open order", grvt, legacy_grvt_open_order, lambda p: grvt_order_record(p, GRVT_SCALE)),
+        ("paradex order update", paradex, legacy_paradex_update,
+         lambda p: paradex_order_record(p, PARADEX_SCALE, CLOSE_SIDE)),
+        ("paradex open order", paradex, legacy_paradex_open_order, lambda p: paradex_order_record(p, PARADEX_SCALE)),
+    ]
+    sample = min(args.updates, 5000)
+    print(f"{args.updates} updates per case")
+    print(f"  {'case':<22} {'path':<8} {'us/update':>10} {'blocks':>7} {'bytes':>7} {'peak':>7}")
+    for name, payloads, legacy, direct in cases:
+        for path, parse in (("previous", legacy), ("records", direct)):
+            us = time_per_update(parse, payloads)
+            blocks, held, peak = allocations_per_update(parse, payloads[:sample])
+            print(f"  {name:<22} {path:<8} {us:>10.2f} {blocks:>7.1f} {held:>7.0f} {peak:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Order signing microbenchmark: legacy get_order_payload() vs cached OrderSigner.
+
+Usage:
+    python benchmarks/bench_order_signing.py [--iterations 2000]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from eth_account import Account  # noqa: E402
+
+from pysdk.grvt_ccxt_env import GrvtEnv  # noqa: E402
+from pysdk.grvt_ccxt_utils import (  # noqa: E402
+    GrvtOrder,
+    GrvtOrderLeg,
+    GrvtSignature,
+    OrderMetadata,
+    OrderSigner,
+    TimeInForce,
+    get_order_payload,
+    rand_uint32,
+)
+
+INSTRUMENTS = {
+    "BTC_USDT_Perp": {
+        "instrument": "BTC_USDT_Perp",
+        "instrument_hash": "0x030501",
+        "base_decimals": 9,
+    }
+}
+
+
+def make_order(i: int) -> GrvtOrder:
+    return GrvtOrder(
+        sub_account_id="1234567890",
+        time_in_force=TimeInForce.GOOD_TILL_TIME,
+        legs=[
+            GrvtOrderLeg(
+                instrument="BTC_USDT_Perp",
+                size=Decimal("0.01"),
+                is_buying_asset=bool(i & 1),
+                limit_price=Decimal("65000.5") + i,
+            )
+        ],
+        signature=GrvtSignature(
+            signer="",
+            r="",
+            s="",
+            v=0,
+            expiration=str(time.time_ns() + 86_400_000_000_000),
+            nonce=rand_uint32(),
+        ),
+        metadata=OrderMetadata(client_order_id=str(2**63 + i)),
+        is_market=False,
+        post_only=True,
+    )
+
+
+def bench(label: str, sign, orders: list[GrvtOrder]) -> float:
+    start = time.perf_counter()
+    for order in orders:
+        sign(order)
+    per_order_us = (time.perf_counter() - start) / len(orders) * 1e6
+    print(f"{label:<12} {per_order_us:9.1f} us/order")
+    return per_order_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order signing microbenchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    # get_signable_message() logs every order at INFO, keep it out of the measurement
+    logging.disable(logging.INFO)
+
+    private_key = Account.create().key.hex()
+    env = GrvtEnv.TESTNET
+    signer = OrderSigner(private_key, env)
+
+    # Both paths must produce identical signatures
+    for i in range(16):
+        legacy = get_order_payload(make_order(i), private_key, env, INSTRUMENTS)
+        order = make_order(i)
+        order.signature.nonce = legacy["order"]["signature"]["nonce"]
+        order.signature.expiration = legacy["order"]["signature"]["expiration"]
+        cached = signer.get_order_payload(order, INSTRUMENTS)
+        assert cached == legacy, f"signature mismatch:\n{cached}\n{legacy}"
+
+    orders = [make_order(i) for i in range(args.iterations)]
+    before = bench("legacy", lambda o: get_order_payload(o, private_key, env, INSTRUMENTS), orders)
+    orders = [make_order(i) for i in range(args.iterations)]
+    after = bench("OrderSigner", lambda o: signer.get_order_payload(o, INSTRUMENTS), orders)
+    print(f"speedup      {before / after:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+WebSocket read-loop benchmark: feeds recorded frames through GrvtCcxtWS._read_messages
+and reports messages/second and, per message, the blocks and bytes held by the decoded message
+and the peak bytes while decoding. orjson's peak includes a scratch buffer sized from the frame
+length that is freed before it returns, so its peak is higher than json's for the same held bytes;
+throughput varies widely between machines, compare modes within one run.
+
+Frames come from a .gpmd recording (book messages of --instrument), a JSONL file with one raw
+frame per line, or a synthetic random-walk book when neither is given.
+
+Usage:
+    python benchmarks/bench_ws_decode.py [--gpmd data/marketdata/md_20250101.gpmd] [--messages 20000]
+    python benchmarks/bench_ws_decode.py --frames frames.jsonl
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import websockets.exceptions  # noqa: E402,F401  (the read loop references it lazily)
+
+import pysdk.grvt_ccxt_ws as grvt_ccxt_ws  # noqa: E402
+from pysdk.grvt_ccxt_env import GrvtEnv, GrvtWSEndpointType  # noqa: E402
+from pysdk.grvt_ccxt_json import DECODER, decode_frame, peek_route  # noqa: E402
+
+ENDPOINT = GrvtWSEndpointType.MARKET_DATA_RPC_FULL
+
+
+def load_frames(args) -> list[str]:
+    if args.frames:
+        with open(args.frames) as f:
+            return [line.rstrip("\n") for line in itertools.islice(f, args.messages) if line.strip()]
+    if args.gpmd:
+        from marketdata import MarketDataReader
+        messages = MarketDataReader(args.gpmd).book_messages(f"grvt:{args.instrument}")
+    else:
+        from simulator.feeds import RandomWalkBookFeed
+        messages = RandomWalkBookFeed(args.instrument, Decimal("60000"), Decimal("0.1"),
+                                      steps=args.messages, levels=args.levels, seed=1)
+    frames = []
+    for message in itertools.islice(messages, args.messages):
+        frame = {"stream": message["stream"], "selector": selector_for(message["stream"], args.instrument)}
+        frame.update(message)
+        frames.append(json.dumps(frame, separators=(",", ":")))
+    return frames
+
+
+def selector_for(stream: str, instrument: str) -> str:
+    return f"{instrument}@500-10" if stream.endswith("book.s") else f"{instrument}@500"
+
+
+class ReplaySocket:
+    """Stands in for the websocket connection: recv() returns the recorded frames in order."""
+
+    def __init__(self, frames: list[str], done: asyncio.Event):
+        self.open = True
+        self._frames = iter(frames)
+        self._done = done
+
+    async def recv(self) -> str:
+        frame = next(self._frames, None)
+        if frame is None:
+            self._done.set()
+            await asyncio.Event().wait()
+        return frame
+
+
+async def run_once(frames: list[str], instrument: str) -> tuple[float, int]:
+    client = grvt_ccxt_ws.GrvtCcxtWS(env=GrvtEnv.PROD, loop=asyncio.get_running_loop(),
+                                     logger=logging.getLogger("bench"), parameters={})
+    received = 0
+
+    async def on_book(message):
+        nonlocal received
+        received += 1
+
+    for stream in ("book.s", "book.d"):
+        versioned = client.get_versioned_stream(stream)
+        # block: deliver every frame so msgs/s counts callbacks, not conflated snapshots
+        client._register_callback(ENDPOINT, versioned, selector_for(stream, instrument), on_book, "block")
+
+    done = asyncio.Event()
+    client.ws[ENDPOINT] = ReplaySocket(frames, done)
+    start = time.perf_counter()
+    reader = asyncio.create_task(client._read_messages(ENDPOINT))
+    await done.wait()
+    while received < len(frames):
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    reader.cancel()
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+    await client.close()
+    return elapsed, received
+
+
+def per_message_allocations(frames: list[str], instrument: str, decoder, router) -> tuple[float, float, float]:
+    """
+    (blocks, bytes held, peak bytes) per frame for routing + decoding, from tracemalloc:
+    blocks and bytes still referenced by the decoded message, and the per-frame peak.
+    """
+    routes = {(f"v1.{s}", selector_for(s, instrument)) for s in ("book.s", "book.d")}
+    tracemalloc.start()
+    blocks = held_bytes = peak_bytes = 0
+    for frame in frames:
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot() if len(frames) <= 200 else None
+        base, _ = tracemalloc.get_traced_memory()
+        route = router(frame)
+        message = decoder(frame) if route is None or route in routes else None
+        current, peak = tracemalloc.get_traced_memory()
+        held_bytes += current - base
+        peak_bytes += peak - base
+        if before is not None:
+            after = tracemalloc.take_snapshot()
+            blocks += sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+        del message
+    tracemalloc.stop()
+    n = len(frames)
+    return blocks / n, held_bytes / n, peak_bytes / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GrvtCcxtWS read-loop benchmark")
+    parser.add_argument("--gpmd", type=str, default=None, help="Recorded .gpmd file")
+    parser.add_argument("--frames", type=str, default=None, help="JSONL file with one raw frame per line")
+    parser.add_argument("--instrument", type=str, default="BTC_USDT_Perp")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--levels", type=int, default=10, help="Synthetic book depth")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    frames = load_frames(args)
+    size = sum(len(f) for f in frames) / len(frames)
+    print(f"{len(frames)} frames, {size:.0f} bytes avg, decoder={DECODER}")
+
+    modes = {
+        "json.loads, no routing": (lambda raw: json.loads(raw), lambda raw: None),
+        f"{DECODER} + peek_route": (decode_frame, peek_route),
+    }
+    print(f"  {'mode':<28} {'msgs/s':>10} {'allocs/msg':>11} {'held/msg':>9} {'peak/msg':>9}")
+    for name, (decoder, router) in modes.items():
+        grvt_ccxt_ws.decode_frame, grvt_ccxt_ws.peek_route = decoder, router
+        elapsed, received = asyncio.run(run_once(frames, args.instrument))
+        blocks, held, peak = per_message_allocations(frames[:200], args.instrument, decoder, router)
+        print(f"  {name:<28} {received / elapsed:>10.0f} {blocks:>11.1f} {held:>9.0f} {peak:>9.0f}")
+    grvt_ccxt_ws.decode_frame, grvt_ccxt_ws.peek_route = decode_frame, peek_route
+
+
+if __name__ == "__main__":
+    main()
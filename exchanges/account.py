@@ -2,11 +2,16 @@
 Paradex 帳戶類別 - 強化導入相容性版本 (適配 SDK 0.5.4+)
 """
 
+import asyncio
+import base64
+import json
 import time
 from decimal import Decimal
 from typing import Optional, List
 from functools import wraps
 
+import aiohttp
+
 
 # 1. 基礎導入
 from paradex_py import ParadexSubkey
@@ -27,7 +32,41 @@ except ImportError:
         print("DEBUG: Order classes imported from 'paradex_py.common.order'")
 
 # 3. 內部工具導入
+from exchanges.interceptor import ParadexProxyClient
 from exchanges.time_utils import now_timestamp, now_utc8
+from pysdk.grvt_ccxt_pro import new_keepalive_session
+from helpers.latency import recorder as latency_recorder
+
+# 非同步下單路徑：JWT 到期前提早刷新的秒數，以及無 exp 欄位時假設的有效期
+JWT_REFRESH_BUFFER_SECS = 30
+JWT_DEFAULT_LIFETIME_SECS = 4 * 60
+HTTP_TIMEOUT_SECS = 5
+# 市價單重送：最多嘗試次數、首次退避秒數；送出後結果不明時，先等待多久再以 client_id 查單
+MARKET_ORDER_MAX_ATTEMPTS = 5
+MARKET_ORDER_RETRY_DELAY = 0.1
+ORDER_LOOKUP_DELAY = 0.5
+
+RETRYABLE_ERRORS = [
+    'temporary failure', 'name resolution', 'connection',
+    'timeout', 'reset by peer', 'broken pipe', 'network', 'ssl', 'eof',
+]
+
+
+def _is_retryable(e: Exception) -> bool:
+    if isinstance(e, (asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+        return True
+    if isinstance(e, ParadexHTTPError):
+        return e.status >= 500 or e.status == 429
+    error_msg = str(e).lower()
+    return any(x in error_msg for x in RETRYABLE_ERRORS)
+
+
+def _unsent(e: Exception) -> bool:
+    """請求確定沒有送達交易所：連線未建立，或被限流 (429) 未受理"""
+    if isinstance(e, aiohttp.ClientConnectorError):
+        return True
+    return isinstance(e, ParadexHTTPError) and e.status == 429
+
 
 def retry_on_error(max_retries: int = 3, delay: float = 2.0, backoff: float = 2.0):
     """重試裝飾器"""
@@ -41,12 +80,7 @@ def retry_on_error(max_retries: int = 3, delay: float = 2.0, backoff: float = 2.
                     return func(*args, **kwargs)
                 except Exception as e:
                     last_error = e
-                    error_msg = str(e).lower()
-                    retryable = any(x in error_msg for x in [
-                        'temporary failure', 'name resolution', 'connection',
-                        'timeout', 'reset by peer', 'broken pipe', 'network', 'ssl', 'eof',
-                    ])
-                    if not retryable:
+                    if not _is_retryable(e):
                         raise
                     if attempt < max_retries - 1:
                         print(f"[重試] {func.__name__} 失敗({attempt+1}/{max_retries}): {e}, {current_delay}s後重試...")
@@ -56,6 +90,47 @@ def retry_on_error(max_retries: int = 3, delay: float = 2.0, backoff: float = 2.
         return wrapper
     return decorator
 
+
+def async_retry_on_error(max_retries: int = 3, delay: float = 0.1, backoff: float = 2.0):
+    """非同步重試裝飾器：以 asyncio.sleep 退避，不阻塞事件迴圈"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            last_error = None
+            current_delay = delay
+            for attempt in range(max_retries):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    last_error = e
+                    if not _is_retryable(e):
+                        raise
+                    if attempt < max_retries - 1:
+                        print(f"[重試] {func.__name__} 失敗({attempt+1}/{max_retries}): {e}, {current_delay}s後重試...")
+                        await asyncio.sleep(current_delay)
+                        current_delay *= backoff
+            raise last_error
+        return wrapper
+    return decorator
+
+
+class ParadexHTTPError(Exception):
+    """Paradex REST 回應非 2xx；5xx / 429 視為可重試"""
+
+    def __init__(self, status: int, body: str):
+        self.status = status
+        super().__init__(f"HTTP {status}: {body}")
+
+
+def _jwt_exp(token: str) -> float:
+    """解析 JWT 的 exp 欄位；無法解析時以預設有效期估算"""
+    try:
+        payload_b64 = token.split(".")[1]
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload_b64))["exp"])
+    except Exception:
+        return time.time() + JWT_DEFAULT_LIFETIME_SECS
+
 class ParadexAccount:
     def __init__(self, name: str, l2_private_key: str, l2_address: str, env: str = "prod", cache_ttl: float = 1.0):
         self.name = name
@@ -66,6 +141,13 @@ class ParadexAccount:
         self._position_cache_time = 0
         self._position_cache_ttl = cache_ttl
 
+        # 非同步下單路徑：共用 keep-alive 連線池與快取的 JWT
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._jwt: Optional[str] = None
+        self._jwt_exp = 0.0
+        self._auth_lock: Optional[asyncio.Lock] = None
+        self.latency = latency_recorder
+
     @retry_on_error(max_retries=3, delay=2.0)
     def get_account_summary(self):
         return self.client.api_client.fetch_account_summary()
@@ -103,6 +185,28 @@ class ParadexAccount:
                 return abs(Decimal(str(sz)))
         return Decimal("0")
 
+    @retry_on_error(max_retries=3, delay=1.0)
+    def fetch_position(self, market: str) -> Decimal:
+        """
+        直接查詢帶正負號的持倉 (多單為正、空單為負)，不使用快取；查詢失敗時拋出例外，
+        不會像 get_position_size 一樣回傳 0 (用於倉位對帳，見 hedge/reconcile.py)。
+        """
+        r = self.client.api_client.fetch_positions()
+        positions = getattr(r, 'results', []) if hasattr(r, 'results') else (r.get("results", []) if isinstance(r, dict) else r)
+        for p in positions:
+            m = getattr(p, 'market', None) or (p.get('market') if isinstance(p, dict) else None)
+            if m != market:
+                continue
+            sz = getattr(p, 'size', None) or (p.get('size') if isinstance(p, dict) else None)
+            side = getattr(p, 'side', None) or (p.get('side') if isinstance(p, dict) else None)
+            size = Decimal(str(sz or 0))
+            return -abs(size) if str(side).upper() == 'SHORT' else size
+        return Decimal("0")
+
+    async def fetch_position_async(self, market: str) -> Decimal:
+        """fetch_position 的非同步版本 (在執行緒中執行 SDK 的同步請求)"""
+        return await asyncio.to_thread(self.fetch_position, market)
+
     @retry_on_error(max_retries=5, delay=2.0, backoff=1.5)
     def place_market_order(self, market: str, side: str, size: Decimal, reduce_only: bool = False) -> Optional[dict]:
         """執行市價單"""
@@ -126,4 +230,144 @@ class ParadexAccount:
         """撤銷所有訂單"""
         params = {"market": market} if market else {}
         self.client.api_client.cancel_all_orders(params=params)
-        return True
\ No newline at end of file
+        return True
+
+    # ==================== 非同步下單路徑 ====================
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = new_keepalive_session()
+        return self._session
+
+    async def _get_jwt(self) -> str:
+        """回傳快取的 JWT，到期前 JWT_REFRESH_BUFFER_SECS 秒重新認證 (同時只發一個認證請求)"""
+        if self._jwt and time.time() < self._jwt_exp - JWT_REFRESH_BUFFER_SECS:
+            return self._jwt
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self._jwt and time.time() < self._jwt_exp - JWT_REFRESH_BUFFER_SECS:
+                return self._jwt
+            account = self.client.account
+            params = {}
+            # 與同步 HttpClient 一致：AuthInterceptor 安裝後才附加 token_usage
+            if ParadexProxyClient._patched and ParadexProxyClient.is_enabled():
+                params["token_usage"] = ParadexProxyClient._token_usage
+            url = f"{self.client.api_client.api_url}/auth/{hex(account.l2_public_key)}"
+            async with self._get_session().post(
+                url, headers=account.auth_headers(), params=params,
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECS)
+            ) as resp:
+                body = await resp.text()
+                if resp.status != 200:
+                    raise ParadexHTTPError(resp.status, body)
+            self._jwt = json.loads(body)["jwt_token"]
+            self._jwt_exp = _jwt_exp(self._jwt)
+            return self._jwt
+
+    async def _post_authorized_async(self, path: str, payload: dict) -> dict:
+        return await self._request_authorized_async("POST", path, json=payload)
+
+    async def _get_authorized_async(self, path: str, params: dict) -> dict:
+        return await self._request_authorized_async("GET", path, params=params)
+
+    async def _request_authorized_async(self, method: str, path: str, **kwargs) -> dict:
+        url = f"{self.client.api_client.api_url}/{path}"
+        for attempt in range(2):
+            headers = {"Authorization": f"Bearer {await self._get_jwt()}"}
+            async with self._get_session().request(
+                method, url, headers=headers,
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECS), **kwargs
+            ) as resp:
+                body = await resp.text()
+                if resp.status == 401 and attempt == 0:
+                    # JWT 被伺服器提前作廢：丟棄快取後重新認證一次
+                    self._jwt = None
+                    continue
+                if resp.status >= 300:
+                    raise ParadexHTTPError(resp.status, body)
+                return json.loads(body) if body else {}
+
+    async def place_market_order_async(self, market: str, side: str, size: Decimal,
+                                       reduce_only: bool = False) -> Optional[dict]:
+        """
+        執行市價單 (原生 asyncio)：不經過執行緒池，重試期間也不阻塞事件迴圈。
+        訂單與 client_id 只建立一次；確定未送達的失敗 (連線未建立、429) 直接重送，
+        送出後結果不明 (逾時、連線中斷、5xx) 則先以 client_id 查單，查到即視為成功，
+        查不到才重送；查單本身失敗時拋出，寧可由倉位對帳補對沖也不冒重複下單的風險。
+        """
+        start_ns = self.latency.now()
+        client_id = f"{self.name}_{int(time.time()*1000)}"
+        order = Order(
+            market=market,
+            order_type=OrderType.Market,
+            order_side=OrderSide.Buy if side.upper() == "BUY" else OrderSide.Sell,
+            size=size,
+            client_id=client_id,
+            reduce_only=reduce_only,
+        )
+        order.signature = self.client.account.sign_order(order)
+        payload = order.dump_to_dict()
+        # submit: 建單 + 簽名；ack: POST 往返 (JWT 到期時含重新認證)
+        self.latency.record("submit", "paradex", self.latency.now() - start_ns)
+
+        delay = MARKET_ORDER_RETRY_DELAY
+        for attempt in range(MARKET_ORDER_MAX_ATTEMPTS):
+            try:
+                # 認證失敗一定發生在送單之前
+                await self._get_jwt()
+                sent_ns = self.latency.now()
+                r = await self._post_authorized_async("orders", payload)
+                self.latency.record_since("ack", "paradex", sent_ns)
+                return {"id": r.get('id')} if r else {"ok": True}
+            except Exception as e:
+                if not _is_retryable(e):
+                    print(f"[{self.name}] 市價單發送失敗: {e}")
+                    raise
+                if attempt == MARKET_ORDER_MAX_ATTEMPTS - 1:
+                    print(f"[{self.name}] 市價單發送失敗: {e}")
+                    raise
+                if not _unsent(e):
+                    await asyncio.sleep(ORDER_LOOKUP_DELAY)
+                    existing = await self.fetch_order_by_client_id_async(market, client_id)
+                    if existing is not None:
+                        print(f"[{self.name}] 市價單回應遺失，已由 client_id 查到訂單 {existing.get('id')}")
+                        return {"id": existing.get('id')}
+                print(f"[重試] place_market_order_async 失敗({attempt+1}/{MARKET_ORDER_MAX_ATTEMPTS}): {e}, "
+                      f"{delay}s後重送 (client_id={client_id})...")
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    @async_retry_on_error(max_retries=3, delay=0.2, backoff=2.0)
+    async def fetch_order_by_client_id_async(self, market: str, client_id: str) -> Optional[dict]:
+        """以 client_id 查詢訂單 (含已成交關閉的訂單)；確定不存在時回傳 None"""
+        try:
+            return await self._get_authorized_async(f"orders/by_client_id/{client_id}", {})
+        except ParadexHTTPError as e:
+            if e.status != 404:
+                raise
+        # 已關閉的訂單可能只在歷史紀錄中
+        r = await self._get_authorized_async("orders-history", {"market": market, "client_id": client_id})
+        results = r.get("results") or []
+        return results[0] if results else None
+
+    @async_retry_on_error(max_retries=3, delay=0.2, backoff=2.0)
+    async def fetch_fills_async(self, market: str, start_at: int, page_size: int = 100) -> List[dict]:
+        """
+        查詢 start_at (毫秒) 之後的成交紀錄 (含 price、size、fee、realized_funding)，
+        依 next 游標取完所有分頁；用於以實際成交價計算盈虧 (見 hedge/pnl.py)。
+        """
+        params = {"market": market, "start_at": start_at, "page_size": page_size}
+        fills = []
+        while True:
+            r = await self._get_authorized_async("fills", params)
+            fills.extend(r.get("results") or [])
+            cursor = r.get("next")
+            if not cursor:
+                return fills
+            params = {"market": market, "start_at": start_at, "page_size": page_size, "cursor": cursor}
+
+    async def close(self) -> None:
+        """關閉非同步下單路徑的連線池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
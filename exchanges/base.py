@@ -32,7 +32,7 @@ def query_retry(
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderResult:
     """Standardized order result structure."""
     success: bool
@@ -45,7 +45,7 @@ class OrderResult:
     filled_size: Optional[Decimal] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderInfo:
     """Standardized order information structure."""
     order_id: str
@@ -7,19 +7,30 @@ import asyncio
 import time
 from decimal import Decimal
 from typing import Dict, Any, List, Optional, Tuple
-from pysdk.grvt_ccxt import GrvtCcxt
+
+import aiohttp
+from pysdk.grvt_ccxt_pro import GrvtCcxtPro, new_keepalive_session
 from pysdk.grvt_ccxt_ws import GrvtCcxtWS
 from pysdk.grvt_ccxt_env import GrvtEnv, GrvtWSEndpointType
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo, query_retry
+from .records import DEFAULT_SCALE, ORDER_UPDATE_STATUSES, FixedScale, OrderRecord, grvt_order_record
 from helpers.logger import TradingLogger
+from helpers.latency import recorder as latency_recorder
 
 
 class GrvtClient(BaseExchangeClient):
     """GRVT exchange client implementation."""
 
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize GRVT client."""
+    def __init__(self, config: Dict[str, Any], session: Optional[aiohttp.ClientSession] = None,
+                 rest_client: Optional[GrvtCcxtPro] = None, ws_client: Optional[GrvtCcxtWS] = None):
+        """
+        Initialize GRVT client.
+
+        session / rest_client / ws_client may be passed in to share one connection pool,
+        REST client (and its market cache) and WebSocket client between several clients
+        in the same process. Shared objects are not closed by disconnect().
+        """
         super().__init__(config)
 
         # GRVT credentials from environment
@@ -45,27 +56,40 @@ class GrvtClient(BaseExchangeClient):
         # Initialize logger
         self.logger = TradingLogger(exchange="grvt", ticker=self.config.ticker, log_to_console=False)
 
-        # Initialize GRVT clients
-        self._initialize_grvt_clients()
+        # Initialize GRVT clients (requires a running event loop for the aiohttp session)
+        self._owns_connections = session is None and rest_client is None and ws_client is None
+        if self._owns_connections:
+            self._initialize_grvt_clients()
+        else:
+            self._session = session
+            self.rest_client = rest_client
 
+        self.latency = latency_recorder
+        # Fixed-point scale of the contract's prices / sizes (set by get_contract_attributes)
+        self.scale = DEFAULT_SCALE
         self._order_update_handler = None
-        self._ws_client = None
+        self._ws_client = ws_client
         self._order_update_callback = None
 
     def _initialize_grvt_clients(self) -> None:
-        """Initialize the GRVT REST and WebSocket clients."""
+        """Initialize the GRVT REST client on a shared keep-alive aiohttp session."""
         try:
             # Parameters for GRVT SDK
             parameters = {
                 'trading_account_id': self.trading_account_id,
                 'private_key': self.private_key,
-                'api_key': self.api_key
+                'api_key': self.api_key,
+                'latency_recorder': latency_recorder
             }
 
-            # Initialize REST client
-            self.rest_client = GrvtCcxt(
+            # One connection pool shared by the REST client and the WebSocket client
+            self._session = new_keepalive_session()
+
+            # Initialize async REST client
+            self.rest_client = GrvtCcxtPro(
                 env=self.env,
-                parameters=parameters
+                parameters=parameters,
+                session=self._session
             )
 
         except Exception as e:
@@ -80,6 +104,11 @@ class GrvtClient(BaseExchangeClient):
 
     async def connect(self) -> None:
         """Connect to GRVT WebSocket."""
+        if self._ws_client is not None:
+            # Already connected, or sharing a WebSocket client initialized by its owner
+            if self._order_update_callback is not None:
+                asyncio.create_task(self._subscribe_to_orders(self._order_update_callback))
+            return
         try:
             # Initialize WebSocket client - match the working test implementation
             loop = asyncio.get_running_loop()
@@ -92,14 +121,16 @@ class GrvtClient(BaseExchangeClient):
                 'api_key': self.api_key,
                 'trading_account_id': self.trading_account_id,
                 'api_ws_version': 'v1',
-                'private_key': self.private_key
+                'private_key': self.private_key,
+                'latency_recorder': latency_recorder
             }
 
             self._ws_client = GrvtCcxtWS(
                 env=self.env,
                 loop=loop,
                 logger=logger,  # Add logger parameter like in test file
-                parameters=parameters
+                parameters=parameters,
+                session=self._session
             )
 
             # Initialize and connect
@@ -117,9 +148,16 @@ class GrvtClient(BaseExchangeClient):
 
     async def disconnect(self) -> None:
         """Disconnect from GRVT."""
+        if not self._owns_connections:
+            return
         try:
             if self._ws_client:
                 await self._ws_client.__aexit__()
+                self._ws_client = None
+            # Detaches from the shared cookie manager (stops its background refresh)
+            await self.rest_client.close()
+            if not self._session.closed:
+                await self._session.close()
         except Exception as e:
             self.logger.log(f"Error during GRVT disconnect: {e}", "ERROR")
 
@@ -128,7 +166,10 @@ class GrvtClient(BaseExchangeClient):
         return "grvt"
 
     def setup_order_update_handler(self, handler) -> None:
-        """Setup order update handler for WebSocket."""
+        """
+        Setup order update handler for WebSocket. The handler receives an OrderRecord
+        (exchanges/records.py) with price and size as ints on self.scale.
+        """
         self._order_update_handler = handler
 
         async def order_update_callback(message: Dict[str, Any]):
@@ -137,66 +178,22 @@ class GrvtClient(BaseExchangeClient):
             self.logger.log(f"Received WebSocket message: {message}", "DEBUG")
             self.logger.log("**************************************************", "DEBUG")
             try:
-                # Parse the message structure - match the working test implementation exactly
-                if 'feed' in message:
-                    data = message.get('feed', {})
-                    leg = data.get('legs', [])[0] if data.get('legs') else None
-
-                    if isinstance(data, dict) and leg:
-                        contract_id = leg.get('instrument', '')
-                        if contract_id != self.config.contract_id:
-                            return
-
-                        order_state = data.get('state', {})
-                        # Extract order data using the exact structure from test
-                        order_id = data.get('order_id', '')
-                        status = order_state.get('status', '')
-                        side = 'buy' if leg.get('is_buying_asset') else 'sell'
-                        size = leg.get('size', '0')
-                        price = leg.get('limit_price', '0')
-                        filled_size = order_state.get('traded_size')[0] if order_state.get('traded_size') else '0'
-
-                        if Decimal(price) == 0:
-                            price = data.get('state', {}).get('avg_fill_price', ['0'])[0]
-
-                        if order_id and status:
-                            # Determine order type based on side
-                            if side == self.config.close_order_side:
-                                order_type = "CLOSE"
-                            else:
-                                order_type = "OPEN"
-
-                            # Map GRVT status to our status
-                            status_map = {
-                                'OPEN': 'OPEN',
-                                'FILLED': 'FILLED',
-                                'CANCELLED': 'CANCELED',
-                                'REJECTED': 'CANCELED'
-                            }
-                            mapped_status = status_map.get(status, status)
-
-                            # Handle partially filled orders
-                            if status == 'OPEN' and Decimal(filled_size) > 0:
-                                mapped_status = "PARTIALLY_FILLED"
-
-                            if mapped_status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
-                                if self._order_update_handler:
-                                    self._order_update_handler({
-                                        'order_id': order_id,
-                                        'side': side,
-                                        'order_type': order_type,
-                                        'status': mapped_status,
-                                        'size': size,
-                                        'price': price,
-                                        'contract_id': contract_id,
-                                        'filled_size': filled_size
-                                    })
-                            else:
-                                self.logger.log(f"Ignoring order update with status: {mapped_status}", "DEBUG")
+                data = message.get('feed')
+                if isinstance(data, dict):
+                    # Parsed straight into a fixed-point record (no intermediate dict / Decimal)
+                    record = grvt_order_record(data, self.scale, self.config.close_order_side)
+                    if record is None:
+                        self.logger.log(f"Order update missing legs: {data}", "DEBUG")
+                    elif record.contract_id != self.config.contract_id:
+                        return
+                    elif record.order_id and record.status:
+                        if record.status in ORDER_UPDATE_STATUSES:
+                            if self._order_update_handler:
+                                self._order_update_handler(record)
                         else:
-                            self.logger.log(f"Order update missing order_id or status: {data}", "DEBUG")
+                            self.logger.log(f"Ignoring order update with status: {record.status}", "DEBUG")
                     else:
-                        self.logger.log(f"Order update data is not dict or missing legs: {data}", "DEBUG")
+                        self.logger.log(f"Order update missing order_id or status: {data}", "DEBUG")
                 else:
                     # Handle other message types (position, fill, etc.)
                     method = message.get('method', 'unknown')
@@ -238,7 +235,7 @@ class GrvtClient(BaseExchangeClient):
     async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
         """Fetch best bid and offer prices for a contract."""
         # Get order book from GRVT
-        order_book = self.rest_client.fetch_order_book(contract_id, limit=10)
+        order_book = await self.rest_client.fetch_order_book(contract_id, limit=10)
 
         if not order_book or 'bids' not in order_book or 'asks' not in order_book:
             raise ValueError(f"Unable to get order book: {order_book}")
@@ -256,7 +253,7 @@ class GrvtClient(BaseExchangeClient):
         """Place a post only order with GRVT using official SDK."""
 
         # Place the order using GRVT SDK
-        order_result = self.rest_client.create_limit_order(
+        order_result = await self.rest_client.create_limit_order(
             symbol=contract_id,
             side=side,
             amount=quantity,
@@ -292,7 +289,7 @@ class GrvtClient(BaseExchangeClient):
         """Place a market order with GRVT using official SDK."""
 
         # Place the order using GRVT SDK
-        order_result = self.rest_client.create_order(
+        order_result = await self.rest_client.create_order(
             symbol=contract_id,
             order_type='market',
             side=side,
@@ -321,7 +318,7 @@ class GrvtClient(BaseExchangeClient):
             attempt += 1
             if attempt % 5 == 0:
                 self.logger.log(f"[OPEN] Attempt {attempt} to place order", "INFO")
-                active_orders = await self.get_active_orders(contract_id)
+                active_orders = await self.get_active_order_records(contract_id)
                 active_open_orders = 0
                 for order in active_orders:
                     if order.side == self.config.direction:
@@ -429,7 +426,7 @@ class GrvtClient(BaseExchangeClient):
         """Cancel an order with GRVT."""
         try:
             # Cancel the order using GRVT SDK
-            cancel_result = self.rest_client.cancel_order(id=order_id)
+            cancel_result = await self.rest_client.cancel_order(id=order_id)
 
             if cancel_result:
                 return OrderResult(success=True)
@@ -444,9 +441,9 @@ class GrvtClient(BaseExchangeClient):
         """Get order information from GRVT."""
         # Get order information using GRVT SDK
         if order_id is not None:
-            order_data = self.rest_client.fetch_order(id=order_id)
+            order_data = await self.rest_client.fetch_order(id=order_id)
         elif client_order_id is not None:
-            order_data = self.rest_client.fetch_order(params={'client_order_id': client_order_id})
+            order_data = await self.rest_client.fetch_order(params={'client_order_id': client_order_id})
         else:
             raise ValueError("Either order_id or client_order_id must be provided")
 
@@ -475,7 +472,7 @@ class GrvtClient(BaseExchangeClient):
 
     async def _get_active_close_orders(self, contract_id: str) -> int:
         """Get active close orders for a contract using official SDK."""
-        active_orders = await self.get_active_orders(contract_id)
+        active_orders = await self.get_active_order_records(contract_id)
         active_close_orders = 0
         for order in active_orders:
             if order.side == self.config.close_order_side:
@@ -483,48 +480,35 @@ class GrvtClient(BaseExchangeClient):
         return active_close_orders
 
     @query_retry(reraise=True)
-    async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
-        """Get active orders for a contract."""
-        # Get active orders using GRVT SDK
-        orders = self.rest_client.fetch_open_orders(symbol=contract_id)
-
+    async def get_active_order_records(self, contract_id: str) -> List[OrderRecord]:
+        """Get active orders for a contract as fixed-point records."""
+        orders = await self.rest_client.fetch_open_orders(symbol=contract_id)
         if not orders:
             return []
+        scale = self.scale
+        return [record for record in (grvt_order_record(order, scale) for order in orders) if record is not None]
 
-        order_list = []
-        for order in orders:
-            legs = order.get('legs', [])
-            if not legs:
-                continue
-
-            leg = legs[0]  # Get first leg
-            state = order.get('state', {})
-
-            order_list.append(OrderInfo(
-                order_id=order.get('order_id', ''),
-                side=leg.get('is_buying_asset', False) and 'buy' or 'sell',
-                size=Decimal(leg.get('size', 0)),
-                price=Decimal(leg.get('limit_price', 0)),
-                status=state.get('status', ''),
-                filled_size=(Decimal(state.get('traded_size', ['0'])[0])
-                             if isinstance(state.get('traded_size'), list) else Decimal(0)),
-                remaining_size=(Decimal(state.get('book_size', ['0'])[0])
-                                if isinstance(state.get('book_size'), list) else Decimal(0))
-            ))
-
-        return order_list
+    async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
+        """Get active orders for a contract."""
+        scale = self.scale
+        return [record.to_order_info(scale) for record in await self.get_active_order_records(contract_id)]
 
-    @query_retry(reraise=True)
     async def get_account_positions(self) -> Decimal:
         """Get account positions."""
+        size, _ = await self.get_position_snapshot()
+        return size
+
+    @query_retry(reraise=True)
+    async def get_position_snapshot(self) -> Tuple[Decimal, int]:
+        """(position size, exchange event_time in ns; 0 when flat or not reported) of the contract."""
         # Get positions using GRVT SDK
-        positions = self.rest_client.fetch_positions()
+        positions = await self.rest_client.fetch_positions()
 
         for position in positions:
             if position.get('instrument') == self.config.contract_id:
-                return Decimal(position.get('size', 0))
+                return Decimal(position.get('size', 0)), int(position.get('event_time') or 0)
 
-        return Decimal(0)
+        return Decimal(0), 0
 
     async def get_contract_attributes(self) -> Tuple[str, Decimal]:
         """Get contract ID and tick size for a ticker."""
@@ -532,24 +516,27 @@ class GrvtClient(BaseExchangeClient):
         if not ticker:
             raise ValueError("Ticker is empty")
 
-        # Get markets from GRVT
-        markets = self.rest_client.fetch_markets()
-
-        for market in markets:
-            if (market.get('base') == ticker and
-                    market.get('quote') == 'USDT' and
-                    market.get('kind') == 'PERPETUAL'):
-
-                self.config.contract_id = market.get('instrument', '')
-                self.config.tick_size = Decimal(market.get('tick_size', 0))
-
-                # Validate minimum quantity
-                min_size = Decimal(market.get('min_size', 0))
-                if self.config.quantity < min_size:
-                    raise ValueError(
-                        f"Order quantity is less than min quantity: {self.config.quantity} < {min_size}"
-                    )
-
-                return self.config.contract_id, self.config.tick_size
+        # Perpetual markets come from the per-env instrument cache (also required for order
+        # validation/signing): disk copy first, fetched at most once per process
+        if not self.rest_client.markets:
+            await self.rest_client.load_markets()
+
+        spec = self.rest_client.market_cache.find(base=ticker, quote='USDT', kind='PERPETUAL')
+        if spec is None:
+            # Listed after the cache was fetched: refetch once before giving up
+            await self.rest_client.load_markets(reload=True)
+            spec = self.rest_client.market_cache.find(base=ticker, quote='USDT', kind='PERPETUAL')
+        if spec is None:
+            raise ValueError(f"Contract not found for ticker: {ticker}")
+
+        self.config.contract_id = spec.instrument
+        self.config.tick_size = spec.tick_size
+        self.scale = FixedScale.from_tick(spec.tick_size, spec.base_decimals)
+
+        # Validate minimum quantity
+        if self.config.quantity < spec.min_size:
+            raise ValueError(
+                f"Order quantity is less than min quantity: {self.config.quantity} < {spec.min_size}"
+            )
 
-        raise ValueError(f"Contract not found for ticker: {ticker}")
+        return self.config.contract_id, self.config.tick_size
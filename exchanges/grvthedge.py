@@ -2,18 +2,107 @@
 專為對沖機器人優化的 GRVT 客戶端 (grvthedge.py)
 """
 import asyncio
+import random
 from decimal import Decimal
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pysdk.grvt_ccxt_env import GrvtWSEndpointType
+from .base import OrderResult
 from .grvt import GrvtClient, OrderInfo
+from .orderbook import LocalOrderBook
+from .presign import ORDER_DURATION_SECS, PresignedOrderPool
+
+# REST 對帳週期 (秒)：WS 事件為主，REST 只用來校正漂移
+RECONCILE_INTERVAL = 30.0
+# 保留最近成交的 trade_id 數量，用於去重
+FILL_DEDUP_SIZE = 1024
+# book.d 推送頻率 (ms)
+BOOK_RATE_MS = 50
+# WS 下單/撤單等待回應的逾時 (秒)
+ORDER_ACK_TIMEOUT = 5.0
+# 訂單終結狀態
+TERMINAL_ORDER_STATUSES = ('FILLED', 'CANCELLED', 'REJECTED')
+# WS 請求逾時、結果不明 (訂單可能已在簿上) 時 OrderResult 的狀態
+STATUS_UNKNOWN = 'UNKNOWN'
 
 
 class GrvtHedgeClient(GrvtClient):
     """繼承原始 GrvtClient 並優化對沖專用方法"""
 
+    # 交易所推送的訂單簿包含自己的掛單 (報價引擎估計排隊位置時需扣除)
+    book_includes_own_orders = True
+
+    def __init__(self, config: Dict[str, Any], reconcile_interval: float = RECONCILE_INTERVAL, **shared):
+        super().__init__(config, **shared)
+        self.reconcile_interval = reconcile_interval
+
+        # 記憶體內倉位：由 fill / position 串流驅動，REST 只做週期性對帳
+        self.position = Decimal("0")
+        # 最近一次權威倉位快照的時間 (ns)。一律使用交易所時鐘 (event_time)，與成交的 event_time 比較才不受本機時鐘偏差影響
+        self._position_time = 0
+        # 串流上最新的交易所 event_time，以及最近一次 REST 倉位查詢的交易所時間
+        self._exchange_time = 0
+        self._snapshot_time = 0
+        self._position_event = asyncio.Event()
+        # 訂單簿或倉位任一變化即喚醒報價引擎 (hedge/quoting.py)
+        self._update_event = asyncio.Event()
+        self._seen_fills: Dict[str, None] = {}
+        self._reconcile_task = None
+        self._position_listeners: List[Callable[[Decimal], None]] = []
+        # 成交明細 (價格 / 手續費) 與資金費的消費者，例如 hedge/pnl.py
+        self._fill_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._funding_listeners: List[Callable[[Decimal], None]] = []
+        self._cumulative_funding: Optional[Decimal] = None
+
+        # 追單模式下唯一的存活掛單 (以 client_order_id 追蹤，由 order 串流更新)
+        self._live_order: Optional[OrderInfo] = None
+        self._live_client_order_id: Optional[str] = None
+        # 已送出、尚未收到回應的追單 client_order_id；回應前到達的 order 串流更新先暫存，收到回應後套用
+        self._pending_client_order_id: Optional[str] = None
+        self._pending_order_update: Optional[Dict[str, Any]] = None
+        # 下單 / 撤單逾時而狀態不明的 client_order_id，持續以 id 撤銷直到確認不在簿上
+        self._unconfirmed_orders: Dict[str, None] = {}
+
+        # 本地訂單簿：由 book.d 串流維護，讀取 BBO 不需網路往返
+        self.order_book = None
+        self._book_resync_task = None
+
+        # 預簽名訂單池：追單價位附近的訂單事先簽好，送單時只需序列化
+        self.presigned_orders: Optional[PresignedOrderPool] = None
+
+    async def disconnect(self) -> None:
+        if self.presigned_orders is not None:
+            self.presigned_orders.clear()
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+        self.log_dispatch_stats()
+        await super().disconnect()
+
+    def log_dispatch_stats(self) -> None:
+        """記錄各訂閱分派佇列的積壓 / 丟棄 / 延遲統計"""
+        if self._ws_client is None:
+            return
+        for name, stats in self._ws_client.dispatch_stats().items():
+            if stats['enqueued']:
+                self.logger.log(
+                    f"📊 WS 分派 {name} [{stats['policy']}] 收到 {stats['enqueued']} 丟棄 {stats['dropped']} "
+                    f"阻塞 {stats['blocked']} 最大積壓 {stats['max_backlog']} 最大延遲 {stats['max_lag'] * 1000:.1f}ms",
+                    "INFO")
+
     async def cancel_all_orders(self, contract_id: str):
         """
-        修正原本不存在的方法：獲取所有掛單並逐一撤銷
+        撤銷本合約所有掛單：WS 可用時以單一 cancel_all_orders RPC 完成，
+        否則退回 REST：獲取所有掛單並逐一撤銷
         """
+        if self._ws_trading_ready():
+            result = await self._rpc_call(self._ws_client.rpc_cancel_all_orders(
+                params={"kind": "PERPETUAL", "base": self.config.ticker, "quote": "USDT"},
+                expect_response=True,
+            ))
+            if result.get("ack"):
+                return True
+            self.logger.log(f"WS 撤銷全部掛單失敗，改用 REST: {result}", "WARNING")
+
         active_orders = await self.get_active_orders(contract_id)
         if not active_orders:
             return True
@@ -36,11 +125,473 @@ class GrvtHedgeClient(GrvtClient):
 
     async def get_account_positions(self) -> Decimal:
         """
-        獲取當前合約的實體淨持倉 (Decimal)
+        以 REST 獲取當前合約的實體淨持倉 (Decimal)。查詢失敗時拋出例外，
+        不回傳 0 (0 代表確實無倉位，呼叫端需能區分「未知」與「空倉」)。
+        同時記下快照的交易所時間 (未附 event_time 時取串流上最新的交易所時間)，供 apply_position_snapshot 使用
+        """
+        size, event_time = await self.get_position_snapshot()
+        self._snapshot_time = event_time or self._exchange_time
+        return Decimal(str(size))
+
+    async def fetch_fill_history(self, since_ns: int) -> List[Dict[str, Any]]:
+        """
+        以 REST 查詢 since_ns 之後本合約的成交紀錄 (欄位同 fill 串流)，依 next 游標取完所有分頁；
+        重啟後補上停機期間的成交 (見 hedge/pnl.py)。查詢失敗時拋出例外
+        """
+        contract_id = self.config.contract_id
+        fills: List[Dict[str, Any]] = []
+        params: Dict[str, Any] = {}
+        while True:
+            response = await self.rest_client.fetch_my_trades(symbol=contract_id, since=since_ns, params=params)
+            fills.extend(response.get("result") or [])
+            cursor = response.get("next")
+            if not cursor:
+                return fills
+            params = {"cursor": cursor}
+
+    async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        """優先讀取本地訂單簿；訂單簿未同步時退回 REST"""
+        start_ns = self.latency.now()
+        book = self.order_book
+        if book is not None and book.instrument == contract_id and book.is_ready():
+            bbo = book.bbo()
+        else:
+            bbo = await super().fetch_bbo_prices(contract_id)
+        self.latency.record_since("bbo", "grvt", start_ns)
+        return bbo
+
+    # ==================== WS 下單 / 撤單 ====================
+
+    def _ws_trading_ready(self) -> bool:
+        return self._ws_client is not None and self._ws_client.is_connection_open(
+            GrvtWSEndpointType.TRADE_DATA_RPC_FULL)
+
+    async def _rpc_call(self, request, stage: Optional[str] = None) -> Dict[str, Any]:
+        """
+        發送 WS JSON-RPC 請求 (需以 expect_response=True 建立) 並等待同 id 的回應，回傳 result 內容；
+        錯誤或逾時時回傳 {"error": ...}。指定 stage 時記錄送出到回應的延遲。
+        """
+        try:
+            payload = await request
+            start_ns = self.latency.now()
+            response = await self._ws_client.wait_rpc_response(payload["id"], ORDER_ACK_TIMEOUT)
+            if stage:
+                self.latency.record_since(stage, "grvt", start_ns)
+        except asyncio.TimeoutError:
+            return {"error": f"rpc timeout ({ORDER_ACK_TIMEOUT}s)", "timeout": True}
+        except Exception as e:
+            return {"error": str(e)}
+
+        if response.get("error"):
+            return {"error": response["error"]}
+        result = response.get("result") or {}
+        # 回應格式為 {"result": {"result": {...}}} 或 {"result": {...}}
+        return result.get("result", result) if isinstance(result, dict) else {"error": response}
+
+    async def place_post_only_order_ws(self, contract_id: str, quantity: Decimal, price: Decimal, side: str,
+                                       client_order_id: Optional[str] = None) -> OrderResult:
+        """
+        透過已連線的 TRADE_DATA_RPC_FULL socket 下 post-only 限價單，直接以 RPC 回應作為 ack，
+        不建立新的 HTTP 連線也不輪詢訂單狀態。WS 不可用時退回 REST。
+        """
+        if not self._ws_trading_ready():
+            return await self.place_post_only_order(contract_id, quantity, price, side)
+
+        client_order_id = client_order_id or str(random.randint(2 ** 63, 2 ** 64 - 1))
+        presigned = self.presigned_orders.take(side, price, quantity) if self.presigned_orders else None
+        if presigned is not None:
+            # client_order_id 屬於未簽名的 metadata，可在送出前才填入
+            presigned.metadata.client_order_id = client_order_id
+            request = self._ws_client.rpc_create_signed_order(presigned, expect_response=True)
+        else:
+            request = self._ws_client.rpc_create_limit_order(
+                symbol=contract_id,
+                side=side,
+                amount=quantity,
+                price=price,
+                params={
+                    'post_only': True,
+                    'order_duration_secs': ORDER_DURATION_SECS,
+                    'client_order_id': client_order_id,
+                },
+                expect_response=True,
+            )
+        order = await self._rpc_call(request, stage="order_ack")
+        if order.get("error"):
+            self.logger.log(f"[WS] 下單失敗 {side} {quantity}@{price}: {order['error']}", "ERROR")
+            return OrderResult(success=False, order_id=client_order_id, side=side, size=quantity, price=price,
+                               status=STATUS_UNKNOWN if order.get("timeout") else None,
+                               error_message=str(order["error"]))
+
+        state = order.get("state", {})
+        status = state.get("status", "")
+        return OrderResult(
+            success=status not in ("REJECTED", "CANCELLED"),
+            order_id=order.get("order_id") or client_order_id,
+            side=side,
+            size=quantity,
+            price=price,
+            status=status,
+            error_message=state.get("reject_reason") if status == "REJECTED" else None
+        )
+
+    async def cancel_order_ws(self, order_id: Optional[str] = None,
+                              client_order_id: Optional[str] = None) -> OrderResult:
+        """透過 WS RPC 撤單 (order_id 或 client_order_id 擇一)，WS 不可用時退回 REST"""
+        if not self._ws_trading_ready():
+            if order_id:
+                return await self.cancel_order(order_id)
+            try:
+                ok = await self.rest_client.cancel_order(params={"client_order_id": client_order_id})
+                return OrderResult(success=ok)
+            except Exception as e:
+                return OrderResult(success=False, error_message=str(e))
+
+        params = {"client_order_id": client_order_id} if client_order_id else {}
+        result = await self._rpc_call(self._ws_client.rpc_cancel_order(id=order_id, params=params,
+                                                                       expect_response=True),
+                                      stage="cancel_ack")
+        if result.get("ack"):
+            return OrderResult(success=True, order_id=order_id)
+        return OrderResult(success=False, order_id=order_id, status=STATUS_UNKNOWN if result.get("timeout") else None,
+                           error_message=str(result.get("error", result)))
+
+    # ==================== 追單 cancel-replace ====================
+
+    async def replace_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
+        """
+        以新價格替換追單掛單：
+        - 存活掛單同方向同價格時直接保留 (維持排隊位置，不發任何請求)
+        - 否則先撤銷已知的 client_order_id，確認撤單成功後才在同一條 WS 上送出新單 (不查詢掛單列表)
+        撤單失敗代表舊單可能已成交，本次不掛新單，由呼叫端依更新後的倉位重新計算數量；
+        舊單部分成交時新單數量不超過 order 串流回報的剩餘量。
+        """
+        live = self._live_order
+        if live is not None and live.side == side and live.price == price:
+            return OrderResult(success=True, order_id=live.order_id, side=side, size=live.size,
+                               price=price, status=live.status)
+
+        if live is not None:
+            old_client_order_id = self._live_client_order_id
+            self._live_order = None
+            self._live_client_order_id = None
+            cancel_result = await self.cancel_order_ws(client_order_id=old_client_order_id)
+            if not cancel_result.success:
+                if cancel_result.status == STATUS_UNKNOWN:
+                    self._unconfirmed_orders[old_client_order_id] = None
+                self.logger.log(f"撤銷舊追單失敗 (可能已成交)，暫不掛新單: {cancel_result.error_message}", "WARNING")
+                return OrderResult(success=False, side=side, size=quantity, price=price,
+                                   error_message=f"cancel failed: {cancel_result.error_message}")
+            if live.side == side:
+                quantity = min(quantity, live.size)
+        await self._cancel_unconfirmed_orders()
+
+        client_order_id = str(random.randint(2 ** 63, 2 ** 64 - 1))
+        # 送出前先登記：成交 / 撤單的串流更新可能早於下單回應到達
+        self._pending_client_order_id = client_order_id
+        self._pending_order_update = None
+        try:
+            result = await self.place_post_only_order_ws(contract_id, quantity, price, side,
+                                                         client_order_id=client_order_id)
+        finally:
+            update, self._pending_order_update = self._pending_order_update, None
+            self._pending_client_order_id = None
+        terminal = update is not None and update.get("state", {}).get("status") in TERMINAL_ORDER_STATUSES
+
+        # 依本次掛單預先簽好下一次可能的價位 (目前價位與相鄰 tick)
+        if self.presigned_orders is not None:
+            self.presigned_orders.update(side, quantity, price)
+
+        if result.success:
+            self._live_client_order_id = client_order_id
+            self._live_order = OrderInfo(order_id=result.order_id, side=side, size=quantity,
+                                         price=price, status=result.status)
+            if update is not None:
+                # 回應前已收到的狀態 (例如已成交)：不讓回應把已終結的訂單重新設為存活
+                self._apply_order_update(update)
+        elif result.status == STATUS_UNKNOWN and not terminal:
+            # 下單回應逾時：訂單可能仍掛在簿上 (有效期長達 ORDER_DURATION_SECS)，以 client_order_id 撤銷
+            self._unconfirmed_orders[client_order_id] = None
+            await self._cancel_unconfirmed_orders()
+        return result
+
+    async def _cancel_unconfirmed_orders(self) -> None:
+        """撤銷狀態不明的訂單；撤單成功或交易所回報錯誤 (訂單不存在 / 已終結) 即不再追蹤，逾時則下次再試"""
+        for client_order_id in list(self._unconfirmed_orders):
+            result = await self.cancel_order_ws(client_order_id=client_order_id)
+            if result.status != STATUS_UNKNOWN:
+                self._unconfirmed_orders.pop(client_order_id, None)
+            else:
+                self.logger.log(f"狀態不明的訂單撤銷逾時，稍後重試: {client_order_id}", "WARNING")
+
+    async def cancel_live_order(self) -> None:
+        """撤銷目前追蹤中的追單掛單 (若有) 與狀態不明的訂單"""
+        if self._live_order is not None:
+            client_order_id = self._live_client_order_id
+            self._live_order = None
+            self._live_client_order_id = None
+            result = await self.cancel_order_ws(client_order_id=client_order_id)
+            if result.status == STATUS_UNKNOWN:
+                self._unconfirmed_orders[client_order_id] = None
+        await self._cancel_unconfirmed_orders()
+
+    async def _on_order(self, message: Dict[str, Any]) -> None:
+        """order 串流：更新追單掛單狀態，終結時清除"""
+        order = message.get("feed", {})
+        client_order_id = order.get("metadata", {}).get("client_order_id")
+        if client_order_id is not None and client_order_id == self._pending_client_order_id:
+            # 下單回應尚未到達：保留最新狀態 (已終結的不再被覆蓋)
+            pending = self._pending_order_update
+            if pending is None or pending.get("state", {}).get("status") not in TERMINAL_ORDER_STATUSES:
+                self._pending_order_update = order
+            return
+        if self._live_order is None or client_order_id != self._live_client_order_id:
+            return
+        self._apply_order_update(order)
+
+    def _apply_order_update(self, order: Dict[str, Any]) -> None:
+        """以 order 串流的一筆更新套用到追單掛單"""
+        state = order.get("state", {})
+        status = state.get("status", "")
+        if status in TERMINAL_ORDER_STATUSES:
+            self._live_order = None
+            self._live_client_order_id = None
+        else:
+            self._live_order.order_id = order.get("order_id") or self._live_order.order_id
+            self._live_order.status = status
+            # 部分成交後掛在簿上的剩餘量
+            if state.get("book_size"):
+                self._live_order.size = Decimal(state["book_size"][0])
+        self._update_event.set()
+
+    @property
+    def live_order(self) -> Optional[OrderInfo]:
+        """目前追蹤中的追單掛單 (無則為 None)"""
+        return self._live_order
+
+    async def place_taker_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str,
+                                reduce_only: bool = False) -> OrderResult:
+        """
+        以 IOC 限價單吃單 (price 為最差可接受價)，用於報價引擎超過期限後轉吃單。
+        平倉時以 reduce_only 下單，倉位讀數過時也不會反向開倉。
+        WS 可用時走 TRADE_DATA_RPC_FULL，否則退回 REST。
         """
+        client_order_id = str(random.randint(2 ** 63, 2 ** 64 - 1))
+        params = {
+            'post_only': False,
+            'reduce_only': reduce_only,
+            'time_in_force': 'IMMEDIATE_OR_CANCEL',
+            'order_duration_secs': ORDER_DURATION_SECS,
+            'client_order_id': client_order_id,
+        }
+        if self._ws_trading_ready():
+            order = await self._rpc_call(self._ws_client.rpc_create_limit_order(
+                symbol=contract_id, side=side, amount=quantity, price=price, params=params,
+                expect_response=True), stage="order_ack")
+        else:
+            try:
+                order = await self.rest_client.create_limit_order(
+                    symbol=contract_id, side=side, amount=quantity, price=price, params=params)
+            except Exception as e:
+                order = {"error": str(e)}
+        if not order or order.get("error"):
+            error = order.get("error") if order else "empty response"
+            self.logger.log(f"吃單失敗 {side} {quantity}@{price}: {error}", "ERROR")
+            return OrderResult(success=False, side=side, size=quantity, price=price, error_message=str(error))
+        status = order.get("state", {}).get("status", "")
+        return OrderResult(success=status != "REJECTED", order_id=order.get("order_id") or client_order_id,
+                           side=side, size=quantity, price=price, status=status)
+
+    # ==================== 預簽名訂單池 ====================
+
+    def start_presigned_orders(self, neighbour_ticks: int = 1) -> None:
+        """
+        啟用預簽名訂單池。需在 connect() 與 get_contract_attributes() 之後呼叫；
+        之後 replace_order 命中池中訂單時直接送出，BBO 變動時由訂單簿觸發重新簽名。
+        """
+        self.presigned_orders = PresignedOrderPool(
+            signer=self._ws_client.order_signer,
+            sub_account_id=self._ws_client.get_trading_account_id(),
+            instrument=self.config.contract_id,
+            instruments=self._ws_client.markets,
+            tick_size=self.config.tick_size,
+            neighbour_ticks=neighbour_ticks,
+            on_error=lambda e: self.logger.log(f"預簽名失敗: {e}", "WARNING"),
+        )
+        self.logger.log(f"預簽名訂單池啟用 {self.config.contract_id} (±{neighbour_ticks} tick)", "INFO")
+
+    # ==================== 本地訂單簿 ====================
+
+    async def start_order_book(self) -> None:
+        """訂閱 book.d 串流並建立本地訂單簿。需在 connect() 之後呼叫。"""
+        self.order_book = LocalOrderBook(self.config.contract_id, on_gap=self._on_book_gap)
+        await self._ws_client.subscribe(
+            stream="book.d",
+            callback=self._on_book_message,
+            ws_end_point_type=GrvtWSEndpointType.MARKET_DATA_RPC_FULL,
+            params={"instrument": self.config.contract_id, "rate": BOOK_RATE_MS}
+        )
+        self.logger.log(f"本地訂單簿訂閱 {self.config.contract_id}", "INFO")
+
+    async def _on_book_message(self, message: Dict[str, Any]) -> None:
+        book = self.order_book
+        book.on_message(message)
+        if self.presigned_orders is not None and book.is_ready():
+            self.presigned_orders.on_bbo(*book.bbo())
+        self._update_event.set()
+
+    def _on_book_gap(self) -> None:
+        """序號跳號：重新訂閱以取得新的快照 (re_subscribe_stream 會等待 5 秒，需放在背景任務)"""
+        self.logger.log(f"訂單簿序號跳號 (第 {self.order_book.gap_count} 次)，重新同步", "WARNING")
+        if self._book_resync_task is not None and not self._book_resync_task.done():
+            return
+        self._book_resync_task = asyncio.create_task(self._ws_client.re_subscribe_stream(
+            stream="book.d",
+            callback=self._on_book_message,
+            ws_end_point_type=GrvtWSEndpointType.MARKET_DATA_RPC_FULL,
+            params={"instrument": self.config.contract_id, "rate": BOOK_RATE_MS}
+        ))
+
+    # ==================== 事件驅動倉位追蹤 ====================
+
+    async def start_position_tracking(self, reconcile: bool = True) -> None:
+        """
+        以 REST 取得初始倉位，之後改由 WS fill / position 串流即時更新，
+        並啟動背景對帳任務 (reconcile=False 時由外部對帳，例如 hedge/reconcile.py)；
+        同時訂閱 order 串流以追蹤追單掛單。需在 connect() 之後呼叫。
+        """
+        self.position = await self.get_account_positions()
+        self._position_time = self._snapshot_time
+
+        for stream, callback in (("fill", self._on_fill), ("position", self._on_position), ("order", self._on_order)):
+            await self._ws_client.subscribe(
+                stream=stream,
+                callback=callback,
+                ws_end_point_type=GrvtWSEndpointType.TRADE_DATA_RPC_FULL,
+                params={"instrument": self.config.contract_id}
+            )
+        self.logger.log(f"倉位追蹤啟動 {self.config.contract_id} 初始倉位: {self.position}", "INFO")
+
+        if reconcile and self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def wait_for_position_change(self, timeout: float) -> Decimal:
+        """等待下一個倉位變化事件 (最多 timeout 秒)，回傳最新的記憶體倉位"""
         try:
-            # 確保使用 rest_client 進行 REST 輪詢
-            pos = await super().get_account_positions()
-            return Decimal(str(pos))
-        except Exception:
-            return Decimal("0")
\ No newline at end of file
+            await asyncio.wait_for(self._position_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._position_event.clear()
+        return self.position
+
+    async def wait_for_update(self, timeout: float) -> None:
+        """等待下一個訂單簿 / 倉位 / 追單狀態更新 (最多 timeout 秒)"""
+        try:
+            await asyncio.wait_for(self._update_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._update_event.clear()
+
+    def add_position_listener(self, callback: Callable[[Decimal], None]) -> None:
+        """註冊倉位變化回呼 (同步函式，收到新倉位)，供多個消費者各自等待而不互相清除事件"""
+        self._position_listeners.append(callback)
+
+    def add_fill_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """註冊成交回呼 (同步函式，收到去重後的 fill 串流原始內容)，在倉位回呼之前呼叫"""
+        self._fill_listeners.append(callback)
+
+    def add_funding_listener(self, callback: Callable[[Decimal], None]) -> None:
+        """註冊資金費回呼：收到 position 串流累計已實現資金費的增量 (正值為收入)"""
+        self._funding_listeners.append(callback)
+
+    def apply_position_snapshot(self, size: Decimal, source: str = "reconcile") -> None:
+        """
+        以外部確認的權威倉位 (最近一次 REST 查詢的結果) 覆蓋記憶體倉位，
+        交易所時間早於 (含) 該快照的成交事件不再累加
+        """
+        self._position_time = self._snapshot_time
+        self._set_position(size, source)
+
+    def _set_position(self, size: Decimal, source: str) -> None:
+        if size != self.position:
+            self.logger.log(f"[{source}] 倉位更新: {self.position} -> {size}", "INFO")
+            self.position = size
+            self._position_event.set()
+            self._update_event.set()
+            for callback in self._position_listeners:
+                callback(size)
+
+    async def _on_fill(self, message: Dict[str, Any]) -> None:
+        """fill 串流：以成交增量更新倉位 (比 position 串流更早到達)"""
+        fill = message.get("feed", {})
+        if fill.get("instrument") != self.config.contract_id:
+            return
+
+        fill_key = f"{fill.get('trade_id')}-{fill.get('order_id')}"
+        if fill_key in self._seen_fills:
+            return
+        self._seen_fills[fill_key] = None
+        if len(self._seen_fills) > FILL_DEDUP_SIZE:
+            self._seen_fills.pop(next(iter(self._seen_fills)))
+
+        for callback in self._fill_listeners:
+            callback(fill)
+
+        # 已包含在較新的權威倉位快照中的成交不再重複累加
+        event_time = int(fill.get("event_time", 0))
+        self._exchange_time = max(self._exchange_time, event_time)
+        if event_time <= self._position_time:
+            return
+
+        size = Decimal(fill.get("size", "0"))
+        delta = size if fill.get("is_buyer") else -size
+        self._set_position(self.position + delta, "fill")
+
+    async def _on_position(self, message: Dict[str, Any]) -> None:
+        """position 串流：交易所權威倉位快照，直接覆蓋記憶體倉位"""
+        position = message.get("feed", {})
+        if position.get("instrument") != self.config.contract_id:
+            return
+        self._on_funding(position)
+
+        event_time = int(position.get("event_time", 0))
+        self._exchange_time = max(self._exchange_time, event_time)
+        if event_time < self._position_time:
+            return
+        self._position_time = event_time
+        self._set_position(Decimal(position.get("size", "0")), "position")
+
+    def _on_funding(self, position: Dict[str, Any]) -> None:
+        """以累計已實現資金費的變化通知資金費回呼；第一次收到時只記錄基準"""
+        cumulative = position.get("cumulative_realized_funding_payment")
+        if cumulative is None:
+            return
+        cumulative = Decimal(cumulative)
+        previous, self._cumulative_funding = self._cumulative_funding, cumulative
+        if previous is None or cumulative == previous:
+            return
+        for callback in self._funding_listeners:
+            callback(cumulative - previous)
+
+    async def _reconcile_loop(self) -> None:
+        """
+        週期性以 REST 校正記憶體倉位。差異需連續兩次出現才覆蓋，
+        避免 REST 落後於 WS 時把正確的倉位改錯。
+        """
+        pending_mismatch = None
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                rest_pos = await self.get_account_positions()
+            except Exception as e:
+                self.logger.log(f"倉位對帳失敗: {e}", "WARNING")
+                continue
+
+            if rest_pos == self.position:
+                pending_mismatch = None
+            elif pending_mismatch == rest_pos:
+                self.logger.log(f"倉位漂移: 記憶體 {self.position} / REST {rest_pos}，以 REST 為準", "WARNING")
+                self.apply_position_snapshot(rest_pos)
+                pending_mismatch = None
+            else:
+                pending_mismatch = rest_pos
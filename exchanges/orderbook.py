@@ -0,0 +1,143 @@
+"""
+In-memory order book maintained from GRVT book.s / book.d WebSocket streams.
+"""
+
+import time
+from bisect import bisect_left, insort
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A book with no update for this long is not served (the feed may be frozen)
+MAX_BOOK_AGE = 5.0
+
+
+class LocalOrderBook:
+    """
+    Per-instrument order book fed by WebSocket snapshots and deltas.
+
+    Deltas are applied only when their prev_sequence_number matches the last
+    applied sequence_number; on a gap the book is marked unsynced and the
+    optional resync callback is invoked so the owner can re-subscribe for a
+    fresh snapshot. All reads are served from memory.
+
+    Snapshots are book.s messages, or messages with sequence_number 0 (GRVT sends the
+    initial snapshot of a book.d subscription that way; deltas are numbered from 1).
+    """
+
+    def __init__(self, instrument: str, on_gap: Optional[Callable[[], None]] = None,
+                 max_age: Optional[float] = MAX_BOOK_AGE):
+        self.instrument = instrument
+        self.on_gap = on_gap
+        self.max_age_ns = int(max_age * 1e9) if max_age is not None else None
+
+        self._bids: Dict[Decimal, Decimal] = {}
+        self._asks: Dict[Decimal, Decimal] = {}
+        # Both price lists are ascending: best bid is the last element, best ask the first
+        self._bid_prices: List[Decimal] = []
+        self._ask_prices: List[Decimal] = []
+
+        self._best_bid = Decimal(0)
+        self._best_ask = Decimal(0)
+        self._sequence: Optional[int] = None
+
+        self.synced = False
+        self.last_update_ns = 0
+        self.gap_count = 0
+
+    # ==================== Feed handling ====================
+
+    def on_message(self, message: Dict[str, Any]) -> None:
+        """Apply a book.s or book.d WebSocket message."""
+        feed = message.get('feed', {})
+        if feed.get('instrument') != self.instrument:
+            return
+
+        sequence = int(message.get('sequence_number') or 0)
+        prev_sequence = int(message.get('prev_sequence_number') or 0)
+        is_snapshot = message.get('stream', '').endswith('book.s') or sequence == 0
+
+        if is_snapshot:
+            self._apply_snapshot(feed)
+            self._sequence = sequence
+            self.synced = True
+        elif not self.synced:
+            # Waiting for a fresh snapshot after a gap
+            return
+        elif self._sequence is not None and prev_sequence != self._sequence:
+            self._mark_gap()
+            return
+        else:
+            self._apply_levels(feed.get('bids', []), self._bids, self._bid_prices)
+            self._apply_levels(feed.get('asks', []), self._asks, self._ask_prices)
+            self._sequence = sequence
+
+        self._update_top()
+        self.last_update_ns = time.monotonic_ns()
+
+    def _mark_gap(self) -> None:
+        self.synced = False
+        self.gap_count += 1
+        if self.on_gap:
+            self.on_gap()
+
+    def _apply_snapshot(self, feed: Dict[str, Any]) -> None:
+        self._bids.clear()
+        self._asks.clear()
+        self._bid_prices.clear()
+        self._ask_prices.clear()
+        self._apply_levels(feed.get('bids', []), self._bids, self._bid_prices)
+        self._apply_levels(feed.get('asks', []), self._asks, self._ask_prices)
+
+    @staticmethod
+    def _apply_levels(levels: List[Dict[str, Any]], book: Dict[Decimal, Decimal], prices: List[Decimal]) -> None:
+        for level in levels:
+            price = Decimal(level['price'])
+            size = Decimal(level['size'])
+            if size == 0:
+                if book.pop(price, None) is not None:
+                    del prices[bisect_left(prices, price)]
+            else:
+                if price not in book:
+                    insort(prices, price)
+                book[price] = size
+
+    def _update_top(self) -> None:
+        self._best_bid = self._bid_prices[-1] if self._bid_prices else Decimal(0)
+        self._best_ask = self._ask_prices[0] if self._ask_prices else Decimal(0)
+
+    # ==================== Reads ====================
+
+    def is_ready(self) -> bool:
+        """True when the book is synced, has both sides and was updated within max_age."""
+        if not (self.synced and self._best_bid > 0 and self._best_ask > 0):
+            return False
+        return self.max_age_ns is None or time.monotonic_ns() - self.last_update_ns <= self.max_age_ns
+
+    def best_bid(self) -> Decimal:
+        return self._best_bid
+
+    def best_ask(self) -> Decimal:
+        return self._best_ask
+
+    def bbo(self) -> Tuple[Decimal, Decimal]:
+        return self._best_bid, self._best_ask
+
+    def depth(self, side: str, levels: int = 10) -> List[Tuple[Decimal, Decimal]]:
+        """Top `levels` (price, size) pairs for 'buy' (bids) or 'sell' (asks), best first."""
+        if side == 'buy':
+            prices = self._bid_prices[:-levels - 1:-1] if levels else []
+            return [(p, self._bids[p]) for p in prices]
+        prices = self._ask_prices[:levels]
+        return [(p, self._asks[p]) for p in prices]
+
+    def size_at(self, side: str, price: Decimal) -> Decimal:
+        book = self._bids if side == 'buy' else self._asks
+        return book.get(price, Decimal(0))
+
+    def microprice(self) -> Decimal:
+        """Size-weighted mid of the top of book."""
+        if not self._best_bid or not self._best_ask:
+            return Decimal(0)
+        bid_size = self._bids[self._best_bid]
+        ask_size = self._asks[self._best_ask]
+        return (self._best_bid * ask_size + self._best_ask * bid_size) / (bid_size + ask_size)
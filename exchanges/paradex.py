@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 
 from .base import BaseExchangeClient, OrderResult, OrderInfo
+from .records import DEFAULT_SCALE, ORDER_UPDATE_STATUSES, FixedScale, OrderRecord, paradex_order_record
 from helpers.logger import TradingLogger
 
 
@@ -117,6 +118,8 @@ class ParadexClient(BaseExchangeClient):
 
         self._order_update_handler = None
         self.order_size_increment = ''
+        # Fixed-point scale of the contract's prices / sizes (set by get_contract_attributes)
+        self.scale = DEFAULT_SCALE
 
     def _initialize_paradex_client(self) -> None:
         """Initialize the Paradex client with backward-compatible credential strategies."""
@@ -206,7 +209,10 @@ class ParadexClient(BaseExchangeClient):
         return "paradex"
 
     def setup_order_update_handler(self, handler) -> None:
-        """Setup order update handler for WebSocket."""
+        """
+        Setup order update handler for WebSocket. The handler receives an OrderRecord
+        (exchanges/records.py) with price and size as ints on self.scale.
+        """
         self._order_update_handler = handler
 
         async def order_update_handler(ws_channel, message):
@@ -217,49 +223,13 @@ class ParadexClient(BaseExchangeClient):
             data = params.get("data", {})
 
             if ws_channel == ParadexWebsocketChannel.ORDERS:
-                # Extract order data
-                order_id = data.get("id")
-                status = data.get("status")
-                side = data.get("side", "").lower()
-                remaining_size = data.get("remaining_size")
-                size = data.get("size")
-                price = data.get("price")
-                contract_id = data.get("market")
-                filled_size = str(Decimal(size) - Decimal(remaining_size))
-                if contract_id != self.config.contract_id:
+                if data.get("market") != self.config.contract_id:
                     return
-
-                if order_id and status:
-                    # Determine order type based on side
-                    if side == self.config.close_order_side:
-                        order_type = "CLOSE"
-                    else:
-                        order_type = "OPEN"
-
-                    # Map Paradex status to our status
-                    status_map = {
-                        'NEW': 'OPEN',
-                        'OPEN': 'OPEN',
-                        'CLOSED': 'CANCELED' if data.get("cancel_reason") else 'FILLED'
-                    }
-                    mapped_status = status_map.get(status, status)
-
-                    # Handle partially filled orders
-                    if status == 'OPEN' and Decimal(filled_size) > 0:
-                        mapped_status = "PARTIALLY_FILLED"
-
-                    if mapped_status in ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED']:
-                        if self._order_update_handler:
-                            self._order_update_handler({
-                                'order_id': order_id,
-                                'side': side,
-                                'order_type': order_type,
-                                'status': mapped_status,
-                                'size': size,
-                                'price': price,
-                                'contract_id': contract_id,
-                                'filled_size': filled_size
-                            })
+                # Parsed straight into a fixed-point record (no intermediate dict / Decimal)
+                record = paradex_order_record(data, self.scale, self.config.close_order_side)
+                if record.order_id and record.status in ORDER_UPDATE_STATUSES:
+                    if self._order_update_handler:
+                        self._order_update_handler(record)
 
         # Store the handler for later use
         self._ws_order_update_handler = order_update_handler
@@ -406,7 +376,7 @@ class ParadexClient(BaseExchangeClient):
             attempt += 1
             if attempt % 5 == 0:
                 self.logger.log(f"[OPEN] Attempt {attempt} to place order", "INFO")
-                active_orders = await self.get_active_orders(contract_id)
+                active_orders = await self.get_active_order_records(contract_id)
                 active_open_orders = 0
                 for order in active_orders:
                     if order.side == self.config.direction:
@@ -497,7 +467,7 @@ class ParadexClient(BaseExchangeClient):
 
     async def _get_active_close_orders(self, contract_id: str) -> int:
         """Get active close orders for a contract using official SDK."""
-        active_orders = await self.get_active_orders(contract_id)
+        active_orders = await self.get_active_order_records(contract_id)
         active_close_orders = 0
         for order in active_orders:
             if order.side == self.config.close_order_side:
@@ -623,24 +593,16 @@ class ParadexClient(BaseExchangeClient):
 
         return orders_response['results']
 
-    async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
-        """Get active orders for a contract using official SDK."""
+    async def get_active_order_records(self, contract_id: str) -> List[OrderRecord]:
+        """Get active orders for a contract as fixed-point records."""
         order_list = await self._fetch_orders_with_retry(contract_id)
+        scale = self.scale
+        return [paradex_order_record(order, scale) for order in order_list]
 
-        # Filter orders for the specific market
-        contract_orders = []
-        for order in order_list:
-            contract_orders.append(OrderInfo(
-                order_id=order.get('id', ''),
-                side=order.get('side', '').lower(),
-                size=Decimal(order.get('remaining_size', 0)),  # FIXME: This is wrong. Should be size
-                price=Decimal(order.get('price', 0)),
-                status=order.get('status', ''),
-                filled_size=Decimal(order.get('size', 0)) - Decimal(order.get('remaining_size', 0)),
-                remaining_size=Decimal(order.get('remaining_size', 0))
-            ))
-
-        return contract_orders
+    async def get_active_orders(self, contract_id: str) -> List[OrderInfo]:
+        """Get active orders for a contract using official SDK."""
+        scale = self.scale
+        return [record.to_order_info(scale) for record in await self.get_active_order_records(contract_id)]
 
     @retry(
         stop=stop_after_attempt(5),
@@ -748,5 +710,6 @@ class ParadexClient(BaseExchangeClient):
         except Exception:
             self.logger.log("Failed to get tick size", "ERROR")
             raise ValueError("Failed to get tick size")
+        self.scale = FixedScale.from_increments(self.config.tick_size, self.order_size_increment)
 
         return self.config.contract_id, self.config.tick_size
@@ -0,0 +1,177 @@
+"""
+Pool of GRVT orders signed ahead of submission for the chase loop.
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pysdk.grvt_ccxt_utils import GrvtOrder, OrderSigner, get_grvt_order
+
+# Signed orders live in GRVT for up to 30 days; chase orders use the same duration
+ORDER_DURATION_SECS = 30 * 86400 - 1
+# Signatures older than this are discarded and re-signed with a fresh nonce/expiration
+MAX_SIGNATURE_AGE_SECS = 300.0
+MAX_POOL_SIZE = 16
+
+PoolKey = Tuple[str, Decimal, Decimal]
+
+
+class PresignedOrderPool:
+    """
+    Keeps post-only limit orders signed in advance, keyed by (side, price, size).
+
+    The owner tells the pool where it expects to quote next via update() (side, size and the
+    anchor price, normally the best bid for buys and best ask for sells). A background task then
+    signs candidates at the anchor and `neighbour_ticks` ticks on either side, each with a fresh
+    nonce and expiration. take() hands out a matching order, so submission only serialises and sends.
+
+    Orders for another side/size and signatures older than `max_age_secs` are evicted on every
+    refresh. Prices that left the window are kept while there is room (the BBO often comes back),
+    but the pool never holds more than `max_size` orders: the ones furthest from the anchor go first.
+    """
+
+    def __init__(
+        self,
+        signer: OrderSigner,
+        sub_account_id: str,
+        instrument: str,
+        instruments: Dict[str, dict],
+        tick_size: Decimal,
+        neighbour_ticks: int = 1,
+        max_size: int = MAX_POOL_SIZE,
+        max_age_secs: float = MAX_SIGNATURE_AGE_SECS,
+        order_duration_secs: int = ORDER_DURATION_SECS,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.signer = signer
+        self.sub_account_id = sub_account_id
+        self.instrument = instrument
+        self.instruments = instruments
+        self.tick_size = tick_size
+        self.neighbour_ticks = neighbour_ticks
+        self.max_size = max_size
+        self.max_age_secs = max_age_secs
+        self.order_duration_secs = order_duration_secs
+        self.on_error = on_error
+
+        # key -> (signed order, monotonic time it was signed)
+        self._orders: Dict[PoolKey, Tuple[GrvtOrder, float]] = {}
+        self._target: Optional[Tuple[str, Decimal, Decimal]] = None
+        # Set when an order was handed out and the window has a hole to refill
+        self._dirty = False
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # ==================== Owner interface ====================
+
+    def update(self, side: str, size: Decimal, anchor_price: Decimal) -> None:
+        """Set where the next quote is expected; schedules a refresh if anything changed."""
+        if size <= 0 or anchor_price <= 0:
+            return
+        target = (side, size, anchor_price)
+        if target == self._target and not self._dirty and not self._has_stale():
+            return
+        self._target = target
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    def on_bbo(self, best_bid: Decimal, best_ask: Decimal) -> None:
+        """Move the anchor with the book for the current target side/size."""
+        if self._target is None:
+            return
+        side, size, _ = self._target
+        self.update(side, size, best_bid if side == 'buy' else best_ask)
+
+    def take(self, side: str, price: Decimal, size: Decimal) -> Optional[GrvtOrder]:
+        """Remove and return a fresh pre-signed order for (side, price, size), or None."""
+        entry = self._orders.pop((side, price, size), None)
+        if entry is None or time.monotonic() - entry[1] > self.max_age_secs:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._dirty = True
+        return entry[0]
+
+    def clear(self) -> None:
+        """Drop all signed orders and stop refreshing."""
+        self._target = None
+        self._orders.clear()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    # ==================== Signing ====================
+
+    def _candidate_prices(self, anchor_price: Decimal) -> List[Decimal]:
+        # Anchor first so it is signed first and survives the size limit
+        prices = [anchor_price]
+        for k in range(1, self.neighbour_ticks + 1):
+            prices.append(anchor_price + self.tick_size * k)
+            prices.append(anchor_price - self.tick_size * k)
+        return [p for p in prices if p > 0]
+
+    def _has_stale(self) -> bool:
+        now = time.monotonic()
+        return any(now - signed_at > self.max_age_secs for _, signed_at in self._orders.values())
+
+    def _evict(self, side: str, size: Decimal) -> None:
+        """Drop orders for another side/size and stale signatures."""
+        now = time.monotonic()
+        for key, (_, signed_at) in list(self._orders.items()):
+            if key[0] != side or key[2] != size or now - signed_at > self.max_age_secs:
+                del self._orders[key]
+                self.evictions += 1
+
+    def _make_room(self, anchor_price: Decimal, room: int) -> None:
+        """Drop the orders furthest from the anchor until `room` slots are free."""
+        excess = len(self._orders) + room - self.max_size
+        if excess > 0:
+            furthest = sorted(self._orders, key=lambda key: abs(key[1] - anchor_price), reverse=True)
+            for key in furthest[:excess]:
+                del self._orders[key]
+                self.evictions += 1
+
+    def _sign(self, side: str, price: Decimal, size: Decimal) -> GrvtOrder:
+        order = get_grvt_order(
+            sub_account_id=self.sub_account_id,
+            symbol=self.instrument,
+            order_type="limit",
+            side=side,
+            amount=size,
+            limit_price=price,
+            order_duration_secs=self.order_duration_secs,
+            params={"post_only": True},
+        )
+        return self.signer.sign(order, self.instruments)
+
+    async def _refresh_loop(self) -> None:
+        """Sign missing candidates until the pool matches the latest target."""
+        while self._target is not None:
+            side, size, anchor_price = target = self._target
+            self._dirty = False
+            prices = self._candidate_prices(anchor_price)[:self.max_size]
+            self._evict(side, size)
+            missing = [p for p in prices if (side, p, size) not in self._orders]
+            self._make_room(anchor_price, len(missing))
+            for price in missing:
+                try:
+                    # ECDSA is CPU bound, keep it off the event loop
+                    order = await asyncio.to_thread(self._sign, side, price, size)
+                except Exception as e:
+                    if self.on_error:
+                        self.on_error(e)
+                    return
+                if self._target is None or self._target[:2] != (side, size):
+                    break
+                self._orders[(side, price, size)] = (order, time.monotonic())
+
+            if self._target == target and not self._dirty:
+                return
@@ -0,0 +1,217 @@
+"""
+Compact order records with fixed-point integer price and size.
+
+Order payloads (GRVT order stream / open orders, Paradex orders channel / open orders) are parsed
+straight into OrderRecord: one __slots__ object per order, prices and sizes as plain ints, no
+intermediate dict and no Decimal. The scale comes from the instrument: prices are integers in units
+of the tick's last decimal (tick 0.1 -> price * 10), sizes in units of 10 ** -base_decimals (the
+same integer GRVT signs orders with). Comparisons and arithmetic stay in ints; FixedScale converts
+back to Decimal at the edges. Values finer than the scale (e.g. an avg fill price) are rounded.
+
+Status is normalized to the vocabulary the order-update handlers use:
+OPEN / PARTIALLY_FILLED / FILLED / CANCELED (anything else, e.g. PENDING, passes through).
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from .base import OrderInfo
+
+# Parsed price / size strings kept per scale (cleared when full)
+PARSE_CACHE_SIZE = 4096
+
+
+def parse_fixed(text: Any, decimals: int) -> int:
+    """'60123.45' -> 6012345 for decimals=2, rounding half away from zero beyond `decimals`."""
+    if text.__class__ is not str:
+        if text.__class__ is int:
+            return text * 10 ** decimals
+        text = str(text)
+    if 'e' in text or 'E' in text:
+        return int((Decimal(text) * 10 ** decimals).to_integral_value())
+    whole, _, frac = text.partition('.')
+    if whole in ('', '-', '+'):
+        # '.5' / '-.5': no digits before the point
+        whole += '0'
+    extra = len(frac) - decimals
+    if extra <= 0:
+        return int(whole + frac + '0' * -extra)
+    value = int(whole + frac[:decimals])
+    if frac[decimals] >= '5':
+        value += -1 if whole.startswith('-') else 1
+    return value
+
+
+class FixedScale:
+    """
+    Decimal <-> int conversion for one instrument's prices and sizes. Parsed strings are cached:
+    order sizes repeat and prices stay within a few hundred ticks, so most updates are dict hits.
+    """
+
+    __slots__ = ('price_decimals', 'size_decimals', '_prices', '_sizes')
+
+    def __init__(self, price_decimals: int, size_decimals: int):
+        self.price_decimals = price_decimals
+        self.size_decimals = size_decimals
+        self._prices: Dict[Any, int] = {}
+        self._sizes: Dict[Any, int] = {}
+
+    @classmethod
+    def from_increments(cls, tick_size: Decimal, size_increment: Decimal) -> 'FixedScale':
+        """Scale from the price tick and order size increment (e.g. Paradex market info)."""
+        return cls(_decimals(tick_size), _decimals(size_increment))
+
+    @classmethod
+    def from_tick(cls, tick_size: Decimal, base_decimals: int) -> 'FixedScale':
+        """Scale from the price tick and GRVT base_decimals."""
+        return cls(_decimals(tick_size), base_decimals)
+
+    def price(self, text: Any) -> int:
+        value = self._prices.get(text)
+        if value is None:
+            value = parse_fixed(text, self.price_decimals)
+            if len(self._prices) >= PARSE_CACHE_SIZE:
+                self._prices.clear()
+            self._prices[text] = value
+        return value
+
+    def size(self, text: Any) -> int:
+        value = self._sizes.get(text)
+        if value is None:
+            value = parse_fixed(text, self.size_decimals)
+            if len(self._sizes) >= PARSE_CACHE_SIZE:
+                self._sizes.clear()
+            self._sizes[text] = value
+        return value
+
+    def to_price(self, value: int) -> Decimal:
+        return Decimal(value).scaleb(-self.price_decimals)
+
+    def to_size(self, value: int) -> Decimal:
+        return Decimal(value).scaleb(-self.size_decimals)
+
+    def __repr__(self) -> str:
+        return f"FixedScale(price_decimals={self.price_decimals}, size_decimals={self.size_decimals})"
+
+
+def _decimals(step: Decimal) -> int:
+    exponent = Decimal(str(step)).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+
+# Until the instrument is known: 9 decimals for both, as in the .gpmd format
+DEFAULT_SCALE = FixedScale(9, 9)
+
+
+class OrderRecord:
+    """
+    One order as seen in an exchange payload. Treated as immutable: parsers build a new record
+    per update. price / size / filled_size / remaining_size are ints on the instrument's scale.
+    """
+
+    __slots__ = ('order_id', 'side', 'status', 'price', 'size', 'filled_size', 'remaining_size',
+                 'contract_id', 'order_type', 'client_order_id', 'cancel_reason')
+
+    def __init__(self, order_id: str, side: str, status: str, price: int, size: int, filled_size: int,
+                 remaining_size: int, contract_id: str = '', order_type: str = '', client_order_id: str = '',
+                 cancel_reason: str = ''):
+        self.order_id = order_id
+        self.side = side
+        self.status = status
+        self.price = price
+        self.size = size
+        self.filled_size = filled_size
+        self.remaining_size = remaining_size
+        self.contract_id = contract_id
+        # OPEN / CLOSE relative to the client's close_order_side ('' if not classified)
+        self.order_type = order_type
+        self.client_order_id = client_order_id
+        self.cancel_reason = cancel_reason
+
+    def to_order_info(self, scale: FixedScale) -> OrderInfo:
+        return OrderInfo(
+            order_id=self.order_id,
+            side=self.side,
+            size=scale.to_size(self.size),
+            price=scale.to_price(self.price),
+            status=self.status,
+            filled_size=scale.to_size(self.filled_size),
+            remaining_size=scale.to_size(self.remaining_size),
+            cancel_reason=self.cancel_reason,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not OrderRecord:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"OrderRecord({fields})"
+
+
+# Statuses forwarded to order-update handlers
+ORDER_UPDATE_STATUSES = ('OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELED')
+
+_GRVT_STATUS = {'CANCELLED': 'CANCELED', 'REJECTED': 'CANCELED'}
+_PARADEX_STATUS = {'NEW': 'OPEN'}
+
+
+def grvt_order_record(order: Dict[str, Any], scale: FixedScale,
+                      close_side: Optional[str] = None) -> Optional[OrderRecord]:
+    """
+    GRVT order (order stream feed, fetch_open_orders / fetch_order result) -> OrderRecord.
+    Orders without legs return None. A zero limit price (market order) falls back to avg_fill_price.
+    """
+    legs = order.get('legs')
+    if not legs:
+        return None
+    leg = legs[0]
+    state = order.get('state') or {}
+    side = 'buy' if leg.get('is_buying_asset') else 'sell'
+    price = scale.price(leg.get('limit_price') or '0')
+    if not price:
+        avg = state.get('avg_fill_price')
+        if avg:
+            price = scale.price(avg[0])
+    traded = state.get('traded_size')
+    filled_size = scale.size(traded[0]) if traded else 0
+    book = state.get('book_size')
+    status = state.get('status', '')
+    if status == 'OPEN' and filled_size:
+        status = 'PARTIALLY_FILLED'
+    else:
+        status = _GRVT_STATUS.get(status, status)
+    metadata = order.get('metadata')
+    return OrderRecord(
+        str(order.get('order_id', '')), side, status, price, scale.size(leg.get('size') or '0'),
+        filled_size, scale.size(book[0]) if book else 0,
+        leg.get('instrument', ''),
+        ('CLOSE' if side == close_side else 'OPEN') if close_side else '',
+        metadata.get('client_order_id', '') if metadata else '',
+    )
+
+
+def paradex_order_record(order: Dict[str, Any], scale: FixedScale,
+                         close_side: Optional[str] = None) -> OrderRecord:
+    """Paradex order (orders WS channel data, GET /orders result) -> OrderRecord."""
+    side = order.get('side', '').lower()
+    size = scale.size(order.get('size') or '0')
+    remaining_size = scale.size(order.get('remaining_size') or '0')
+    filled_size = size - remaining_size
+    cancel_reason = order.get('cancel_reason') or ''
+    status = order.get('status', '')
+    if status == 'CLOSED':
+        status = 'CANCELED' if cancel_reason else 'FILLED'
+    elif status == 'OPEN' and filled_size > 0:
+        status = 'PARTIALLY_FILLED'
+    else:
+        status = _PARADEX_STATUS.get(status, status)
+    return OrderRecord(
+        str(order.get('id', '')), side, status, scale.price(order.get('price') or '0'), size,
+        filled_size, remaining_size,
+        order.get('market', ''),
+        ('CLOSE' if side == close_side else 'OPEN') if close_side else '',
+        order.get('client_id') or '',
+        cancel_reason,
+    )
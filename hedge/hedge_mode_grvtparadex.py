@@ -16,15 +16,33 @@ from exchanges.grvthedge import GrvtHedgeClient as GrvtClient
 from exchanges.interceptor import AuthInterceptor
 from exchanges.account import ParadexAccount
 from reporter import TelegramReporter
+from helpers.notifier import Notifier
+from helpers.latency import recorder as default_latency_recorder
+from helpers.logger import attach_queue_handlers
+from hedge.quoting import KEEP, TAKE, AdaptiveQuoter, FixedIntervalQuoter
+from hedge.journal import PHASE_CLOSE, PHASE_DONE, PHASE_HOLD, PHASE_OPEN, HedgeJournal, JournalState
+from hedge.reconcile import GRVT, PARADEX, RECONCILE_INTERVAL, ExposureDriftError, PositionReconciler
+from hedge.pnl import FILL_POLL_OVERLAP_MS, ParadexFillPoller, PnLEngine, fill_from_grvt
 
 # --- 策略常數 ---
 POLLING_INTERVAL = 1.0
 CHASE_INTERVAL = 2.0
+# 增量對沖：收到成交後等待這段時間合併後續成交再下 Paradex 單 (秒)
+HEDGE_WINDOW = 0.2
+HEDGE_RETRY_INTERVAL = 1.0
+# 啟動時查詢兩邊倉位的次數與間隔 (秒)，全部失敗才中止
+RESTORE_POLL_ATTEMPTS = 3
+RESTORE_POLL_DELAY = 2.0
 
 
 class HedgeBot:
     def __init__(self, ticker: str, order_quantity: Decimal, fill_timeout: int = 10, iterations: int = 20,
-                 start_side: str = 'buy', holding_time: int = 60):
+                 start_side: str = 'buy', holding_time: int = 60, hedge_mode: str = 'full',
+                 hedge_window: float = HEDGE_WINDOW, min_hedge_size: Decimal = Decimal('0'), shared=None,
+                 chase_interval: float = CHASE_INTERVAL, latency=None, quoting: str = 'adaptive',
+                 taker_deadline: float = None, quoter=None, journal: bool = True, journal_path: str = None,
+                 resume: bool = True, reconcile_interval: float = RECONCILE_INTERVAL, drift_action: str = 'correct',
+                 drift_tolerance: Decimal = Decimal('0')):
         self.ticker = ticker.upper()
         self.paradex_ticker = f"{self.ticker}-USD-PERP" if "-" not in self.ticker else self.ticker
         self.grvt_ticker = self.ticker.split("-")[0]
@@ -34,28 +52,70 @@ class HedgeBot:
         self.start_side = start_side
         self.current_side = start_side
         self.holding_time = holding_time
+        self.chase_interval = chase_interval
 
-        # 盈虧統計與交易量變數
-        self.round_grvt_cash_flow = Decimal('0')
-        self.round_pdex_cash_flow = Decimal('0')
-        self.total_volume_u = Decimal('0')  # 新增：累計總交易量
-
-        # Telegram 配置
-        self.tg_enabled = os.getenv("TG_ENABLED", "False").lower() == "true"
-        self.tg_reporter = TelegramReporter(
-            token=os.getenv("TG_BOT_TOKEN"),
-            chat_id=os.getenv("TG_CHAT_ID"),
-            enabled=self.tg_enabled
-        )
+        # 追單報價引擎 (hedge/quoting.py)：adaptive = 訂單簿驅動；fixed = 每 chase_interval 秒重新掛單
+        if quoting not in ('adaptive', 'fixed'):
+            raise ValueError(f"quoting 必須是 adaptive 或 fixed: {quoting}")
+        self.quoting = quoting
+        self.taker_deadline = taker_deadline
+        self.quoter = quoter
+
+        # 對沖模式：full = GRVT 全部成交後一次對沖；incremental = 每筆成交增量即時對沖
+        if hedge_mode not in ('full', 'incremental'):
+            raise ValueError(f"hedge_mode 必須是 full 或 incremental: {hedge_mode}")
+        self.hedge_mode = hedge_mode
+        self.hedge_window = hedge_window
+        self.min_hedge_size = min_hedge_size
+        self._hedge_event = asyncio.Event()
+        self._hedge_lock = asyncio.Lock()
+        self._hedge_task = None
+
+        # 曝險缺口 (GRVT 倉位 + Paradex 倉位) 統計：當前、本輪峰值、時間加權平均
+        self._gap_value = Decimal('0')
+        self._gap_time = 0.0
+        self._gap_round_start = 0.0
+        self._gap_area = Decimal('0')
+        self.round_peak_gap = Decimal('0')
+
+        # 延遲統計 (helpers/latency.py)：fill_detect 與 time_to_hedge 由本類別記錄
+        self.latency = latency or default_latency_recorder
+        self._position_changed_ns = 0
+
+        # 通知 (Telegram / Lark，依 .env 設定)：背景佇列批次發送，多幣種模式共用同一個 Notifier
+        notifier = shared.notifier if shared is not None else Notifier.from_env()
+        self.tg_reporter = TelegramReporter(notifier=notifier)
+
+        # 倉位對帳 (hedge/reconcile.py)：drift_action = correct 自動補對沖 / raise 停止並拋出 / alert 只警示
+        if drift_action not in ('correct', 'raise', 'alert'):
+            raise ValueError(f"drift_action 必須是 correct、raise 或 alert: {drift_action}")
+        self.reconcile_interval = reconcile_interval
+        self.drift_action = drift_action
+        self.drift_tolerance = drift_tolerance
+        self.reconciler = None
+        self.phase = None
+        self.error = None
+        self._drift_task = None
 
         self.grvt_position = Decimal('0')
-        self.paradex_position = Decimal('0')
+        self._paradex_position = Decimal('0')
         self.stop_flag = False
         self._setup_logger()
 
+        # 盈虧統計 (hedge/pnl.py)：以兩邊交易所的實際成交價、手續費與資金費計算，累計總交易量同樣來自成交
+        self.pnl = PnLEngine(logger=self.logger)
+        self.fill_poller = None
+
         self.grvt_client = None
         self.paradex_account = None
         self.grvt_contract_id = None
+        # 多幣種模式下由 PortfolioRunner 提供共用連線 (hedge/portfolio_runner.py)
+        self.shared = shared
+
+        # 狀態日誌 (hedge/journal.py)：崩潰 / 中斷後重啟時由日誌與兩邊倉位接續
+        self.resume = resume
+        self.journal = HedgeJournal(journal_path or self._default_journal_path(), logger=self.logger) \
+            if journal else None
 
     def _setup_logger(self):
         self.logger = logging.getLogger(f"HedgeBot_{self.ticker}")
@@ -63,7 +123,177 @@ class HedgeBot:
         if not self.logger.handlers:
             handler = logging.StreamHandler(sys.stdout)
             handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            self.logger.addHandler(handler)
+            # 輸出交給背景寫入執行緒，交易迴圈只負責入列
+            attach_queue_handlers(self.logger, [handler])
+
+    def _default_journal_path(self) -> str:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        account_name = os.getenv('ACCOUNT_NAME')
+        name = f"hedge_{self.ticker}_{account_name}" if account_name else f"hedge_{self.ticker}"
+        return os.path.join(project_root, 'logs', f"{name}_journal.jsonl")
+
+    def _journal(self, event: str, **fields) -> None:
+        if self.journal is not None:
+            self.journal.append(event, **fields)
+
+    def _set_phase(self, round_num: int, phase: str) -> None:
+        self.phase = phase
+        self._journal('phase', round=round_num, phase=phase)
+
+    # ==================== 倉位對帳 ====================
+
+    @property
+    def paradex_position(self) -> Decimal:
+        """Paradex 倉位快照 (下單結果即時更新，對帳任務以 REST 讀回校正)"""
+        return self._paradex_position
+
+    @paradex_position.setter
+    def paradex_position(self, size: Decimal) -> None:
+        self._paradex_position = size
+        if self.reconciler is not None:
+            self.reconciler.apply_local(PARADEX, size)
+
+    def _make_reconciler(self) -> PositionReconciler:
+        reconciler = PositionReconciler({
+            GRVT: self.grvt_client.get_account_positions,
+            PARADEX: lambda: self.paradex_account.fetch_position_async(self.paradex_ticker),
+        }, interval=self.reconcile_interval, tolerance=self.drift_tolerance, logger=self.logger)
+        reconciler.on_correct = self._on_position_corrected
+        reconciler.on_drift = self._on_drift
+        reconciler.on_unknown = self._on_position_unknown
+        # 持倉等待與輪次之間應完全對沖 (開倉 / 平倉階段的缺口是預期中的)
+        reconciler.expect_flat = lambda: self.phase in (PHASE_HOLD, PHASE_DONE) and not self._hedge_lock.locked() \
+            and (self._drift_task is None or self._drift_task.done())
+        return reconciler
+
+    def _on_position_corrected(self, venue: str, old: Decimal, new: Decimal) -> None:
+        if venue == GRVT:
+            self.grvt_client.apply_position_snapshot(new)
+        else:
+            self._paradex_position = new
+            self._record_exposure()
+        self._journal('reconcile', grvt_position=self.grvt_client.position, paradex_position=self._paradex_position)
+        self.tg_reporter.send_text(f"⚠️ {self.ticker} {venue} 倉位對帳修正: {old} -> {new}")
+
+    def _on_drift(self, net: Decimal) -> None:
+        if self.drift_action == 'correct':
+            if self._drift_task is None or self._drift_task.done():
+                self.logger.warning(f"🩹 自動補對沖殘留曝險 {net}")
+                self._drift_task = asyncio.create_task(self.flush_hedge())
+            return
+        self.tg_reporter.send_text(f"🚨 {self.ticker} 殘留曝險 {net}", key=f"drift:{self.ticker}")
+        if self.drift_action == 'raise':
+            self.error = ExposureDriftError(f"{self.ticker} 殘留曝險 {net}")
+            self.stop_flag = True
+
+    async def _await_drift_correction(self) -> None:
+        """
+        等待進行中的自動補對沖完成。持倉 / 輪次之間發現的漂移由背景 flush_hedge 處理，
+        下一階段開始前必須等它結束，否則兩邊會對同一個缺口各下一次對沖單。
+        """
+        task = self._drift_task
+        if task is not None and not task.done():
+            self.logger.info("⏳ 等待自動補對沖完成...")
+            await task
+
+    def _on_position_unknown(self, venue: str) -> None:
+        self.tg_reporter.send_text(f"🚨 {self.ticker} {venue} 倉位無法取得", key=f"unknown:{self.ticker}")
+        if self.drift_action == 'raise':
+            self.error = ExposureDriftError(f"{self.ticker} {venue} 倉位未知")
+            self.stop_flag = True
+
+    async def _load_journal(self) -> bool:
+        """
+        讀入狀態日誌 (不接續時清空)，有進行中的輪次則接續盈虧統計；於成交回報開始之前呼叫，
+        之後收到的成交才不會被覆蓋。回傳是否接續了輪次
+        """
+        journal = self.journal
+        if journal is None:
+            return False
+        if not self.resume:
+            journal.state = JournalState()
+            await journal.compact()
+            return False
+        state = journal.state
+        if state.round == 0:
+            return False
+        self.pnl.restore(state.round, state.round_pnl, state.total_wear, state.total_volume, state.fill_keys,
+                         {GRVT: state.grvt_fills_since, PARADEX: state.paradex_fills_since})
+        return True
+
+    async def _backfill_fills(self) -> None:
+        """
+        補上停機期間的成交：兩邊都由日誌中的查詢起點往前重疊查詢，已計入的以去重鍵排除。
+        在 fill 串流訂閱之後呼叫，與串流重疊的成交同樣去重
+        """
+        since_ms = self.pnl.since_ms[GRVT] - FILL_POLL_OVERLAP_MS
+        try:
+            fills = await self.grvt_client.fetch_fill_history(since_ms * 1_000_000)
+        except Exception as e:
+            self.logger.error(f"❌ GRVT 成交補查失敗，停機期間的成交未計入盈虧: {e}")
+        else:
+            applied = sum(self.pnl.on_fill(fill_from_grvt(feed))
+                          for feed in sorted(fills, key=lambda f: int(f.get('event_time') or 0)))
+            if applied:
+                self.logger.info(f"♻️ 補上 GRVT 停機期間成交 {applied} 筆")
+        try:
+            await self.fill_poller.poll()
+        except Exception as e:
+            self.logger.error(f"❌ Paradex 成交補查失敗 (之後的定期查詢會再補): {e}")
+        self._journal_pnl()
+
+    async def _restore(self):
+        """
+        以對帳器的第一次查詢 (兩邊交易所各一次) 取得實際倉位，重播日誌並以交易所為準校正，
+        先對沖殘留缺口，回傳接續點 (輪次, 方向, 階段)；無需接續時回傳 None。
+        """
+        for attempt in range(RESTORE_POLL_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(RESTORE_POLL_DELAY)
+            await self.reconciler.poll()
+            grvt_snapshot, pdex_snapshot = self.reconciler.get(GRVT), self.reconciler.get(PARADEX)
+            if grvt_snapshot.known and pdex_snapshot.known:
+                break
+            self.logger.warning(f"⚠️ 啟動時倉位查詢失敗 ({attempt + 1}/{RESTORE_POLL_ATTEMPTS})")
+        else:
+            raise ExposureDriftError("啟動時無法取得兩邊倉位，無法確認是否有未對沖部位")
+        grvt_pos, pdex_pos = grvt_snapshot.size, pdex_snapshot.size
+        self.paradex_position = pdex_pos
+
+        journal = self.journal
+        state = journal.state if journal is not None else None
+        if state is None or state.round == 0:
+            if grvt_pos + pdex_pos != 0:
+                self.logger.warning(f"⚠️ 啟動時兩邊倉位未對沖: GRVT {grvt_pos} / Paradex {pdex_pos}")
+                self._on_drift(grvt_pos + pdex_pos)
+                if self._drift_task is not None:
+                    await self._drift_task
+            return None
+
+        if grvt_pos != state.grvt_position or pdex_pos != state.paradex_position or state.pending_hedge:
+            self.logger.warning(f"⚠️ 日誌與交易所倉位不一致 (日誌 GRVT {state.grvt_position} / "
+                                f"Paradex {state.paradex_position}，未完成對沖 {state.pending_hedge}；"
+                                f"交易所 GRVT {grvt_pos} / Paradex {pdex_pos})，以交易所為準")
+        self.tg_reporter.total_wear_and_tear = state.total_wear
+        self.current_side = state.side
+        journal.append('reconcile', grvt_position=grvt_pos, paradex_position=pdex_pos)
+        await journal.compact()
+
+        self.logger.info(f"♻️ 由日誌接續: 第 {state.round} 輪 ({state.side.upper()}) 階段 {state.phase}，"
+                         f"GRVT {grvt_pos} / Paradex {pdex_pos}")
+        if self.exposure_gap != 0:
+            self.logger.warning(f"⚠️ 殘留未對沖缺口 {self.exposure_gap}，先行對沖")
+            await self.flush_hedge()
+
+        if grvt_pos != 0:
+            # 開倉已成交 (或部分成交)：直接進入平倉
+            return state.round, state.side, PHASE_CLOSE
+        if state.phase == PHASE_OPEN:
+            # 開倉尚未成交：重做本輪
+            return state.round, state.side, PHASE_OPEN
+        # 本輪已完成 (或平倉完成但尚未記錄結束)：從下一輪開始
+        next_side = 'buy' if state.side == 'sell' else 'sell'
+        return state.round + 1, next_side, PHASE_OPEN
 
     def initialize_clients(self):
         AuthInterceptor.install(enabled=True, token_usage="interactive")
@@ -71,6 +301,10 @@ class HedgeBot:
             'ticker': self.grvt_ticker, 'quantity': self.order_quantity, 'tick_size': Decimal('0.01'),
             'contract_id': None
         })
+        if self.shared is not None:
+            self.grvt_client = self.shared.new_grvt_client(grvt_config)
+            self.paradex_account = self.shared.paradex_account
+            return
         self.grvt_client = GrvtClient(grvt_config)
         self.paradex_account = ParadexAccount(
             name="SingleHedgeAcc",
@@ -78,109 +312,322 @@ class HedgeBot:
             l2_address=os.getenv("PARADEX_L2_ADDRESS")
         )
 
-    async def paradex_hedge_action(self, side: str, qty: Decimal, is_close: bool = False):
-        try:
-            bid, ask = await self.grvt_client.fetch_bbo_prices(self.grvt_contract_id)
-            fill_price = ask if side.upper() == "BUY" else bid
+    # ==================== 曝險缺口 ====================
+
+    @property
+    def exposure_gap(self) -> Decimal:
+        """未對沖的淨曝險：GRVT 倉位 + Paradex 倉位 (完全對沖時為 0)"""
+        grvt_pos = self.grvt_client.position if self.grvt_client else Decimal('0')
+        return grvt_pos + self.paradex_position
+
+    def _record_exposure(self) -> None:
+        """任一邊倉位變化時呼叫：累計時間加權缺口並更新峰值"""
+        # 使用事件迴圈時鐘，模擬器的虛擬時鐘下統計同樣正確
+        now = asyncio.get_running_loop().time()
+        self._gap_area += abs(self._gap_value) * Decimal(str(now - self._gap_time))
+        prev_gap, self._gap_value = self._gap_value, self.exposure_gap
+        self._gap_time = now
+        # time_to_hedge：缺口由 0 變為非 0 起算，回到 0 (Paradex 對沖完成) 時記錄
+        if prev_gap == 0 and self._gap_value != 0:
+            self.latency.start_span("time_to_hedge", "hedge", self.ticker)
+        elif self._gap_value == 0:
+            self.latency.end_span("time_to_hedge", "hedge", self.ticker)
+        self.round_peak_gap = max(self.round_peak_gap, abs(self._gap_value))
+
+    def _reset_exposure_stats(self) -> None:
+        self._gap_round_start = self._gap_time = asyncio.get_running_loop().time()
+        self._gap_value = self.exposure_gap
+        self._gap_area = Decimal('0')
+        self.round_peak_gap = abs(self._gap_value)
+
+    def round_avg_gap(self) -> Decimal:
+        """本輪時間加權平均缺口"""
+        self._record_exposure()
+        elapsed = self._gap_time - self._gap_round_start
+        return self._gap_area / Decimal(str(elapsed)) if elapsed > 0 else Decimal('0')
+
+    def _on_grvt_fill(self, feed: dict) -> None:
+        self.pnl.on_fill(fill_from_grvt(feed))
+
+    def _pnl_fields(self) -> dict:
+        """寫入日誌的盈虧統計：本輪統計、其後新計入成交的去重鍵與兩邊的成交查詢起點 (同一筆紀錄，重啟後一致)"""
+        return {'pnl': self.pnl.round.to_dict(), 'fills': self.pnl.take_fill_keys(),
+                'grvt_since': self.pnl.since_ms[GRVT], 'paradex_since': self.pnl.since_ms[PARADEX]}
+
+    def _journal_pnl(self) -> None:
+        self._journal('pnl', **self._pnl_fields())
+
+    def _make_fill_poller(self) -> ParadexFillPoller:
+        poller = ParadexFillPoller(lambda since: self.paradex_account.fetch_fills_async(self.paradex_ticker, since),
+                                   self.pnl, logger=self.logger)
+        poller.on_fills = self._journal_pnl
+        return poller
+
+    def _on_grvt_position(self, size: Decimal) -> None:
+        self._position_changed_ns = self.latency.now()
+        self.reconciler.apply_local(GRVT, size, 'stream')
+        self._record_exposure()
+        self._hedge_event.set()
+
+    def _record_fill_detect(self) -> None:
+        """倉位回呼到主迴圈察覺成交的延遲；倉位未經回呼改變 (時間戳仍為 0) 時不記錄，記錄後清除"""
+        if self._position_changed_ns:
+            self.latency.record_since("fill_detect", "grvt", self._position_changed_ns)
+            self._position_changed_ns = 0
+
+    # ==================== 增量對沖 ====================
 
-            self.logger.info(f"🚀 Paradex 發送: {side.upper()} {qty} (預估均價: {fill_price})")
-            result = await asyncio.to_thread(
-                self.paradex_account.place_market_order,
-                market=self.paradex_ticker, side=side.upper(), size=qty, reduce_only=is_close
+    async def _hedge_loop(self):
+        """
+        增量對沖背景任務：GRVT 倉位變化後等待 hedge_window 合併後續成交，
+        缺口達 min_hedge_size 時對 Paradex 下單，與追單迴圈並行執行。
+        """
+        while not self.stop_flag:
+            await self._hedge_event.wait()
+            await asyncio.sleep(self.hedge_window)
+            self._hedge_event.clear()
+            async with self._hedge_lock:
+                gap = self.exposure_gap
+                if gap == 0 or abs(gap) < self.min_hedge_size:
+                    continue
+                if not await self._hedge_gap(gap):
+                    # 失敗時稍後重試
+                    await asyncio.sleep(HEDGE_RETRY_INTERVAL)
+                    self._hedge_event.set()
+
+    async def _hedge_gap(self, gap: Decimal) -> bool:
+        side = 'sell' if gap > 0 else 'buy'
+        # 縮小 Paradex 倉位的對沖單標記 reduce_only
+        reduce_only = self.paradex_position != 0 and (self.paradex_position > 0) == (side == 'sell') \
+            and abs(gap) <= abs(self.paradex_position)
+        return await self.paradex_hedge_action(side, abs(gap), reduce_only=reduce_only)
+
+    async def flush_hedge(self):
+        """等待進行中的增量對沖完成，並對剩餘缺口 (含低於 min_hedge_size 的零頭) 全數對沖"""
+        while not self.stop_flag:
+            async with self._hedge_lock:
+                gap = self.exposure_gap
+                if gap == 0 or await self._hedge_gap(gap):
+                    return
+            await asyncio.sleep(HEDGE_RETRY_INTERVAL)
+
+    async def paradex_hedge_action(self, side: str, qty: Decimal, is_close: bool = False,
+                                   reduce_only: bool = False):
+        try:
+            self.logger.info(f"🚀 Paradex 發送: {side.upper()} {qty}")
+            self._journal('hedge_submit', side=side.upper(), qty=qty)
+            result = await self.paradex_account.place_market_order_async(
+                market=self.paradex_ticker, side=side.upper(), size=qty, reduce_only=is_close or reduce_only
             )
             if result:
-                val = qty * fill_price
-                if side.upper() == "BUY":
-                    self.round_pdex_cash_flow -= val
-                else:
-                    self.round_pdex_cash_flow += val
-
+                # 成交價、手續費與資金費以 Paradex 成交紀錄為準 (ParadexFillPoller)
+                self.fill_poller.expect(result.get('id'))
                 self.paradex_position += qty if side.upper() == "BUY" else -qty
                 if is_close: self.paradex_position = Decimal('0')
+                self._record_exposure()
+                # 盡快以 REST 讀回實際倉位 (不一致需連續兩次才覆蓋)
+                self.reconciler.request_poll()
+                self._journal('hedge_done', position=self.paradex_position,
+                              cash_flow=self.pnl.round.venues[PARADEX].pnl, **self._pnl_fields())
                 return True
+            self._journal('hedge_done', position=self.paradex_position,
+                          cash_flow=self.pnl.round.venues[PARADEX].pnl, **self._pnl_fields())
             return False
         except Exception as e:
             self.logger.error(f"❌ Paradex 動作失敗: {e}")
+            # 結果不明 (可能已成交)：日誌保留 hedge_submit，重啟時以倉位查詢為準
             return False
 
+    def _make_quoter(self, tick_size: Decimal):
+        if self.quoting == 'fixed':
+            return FixedIntervalQuoter(self.chase_interval)
+        return AdaptiveQuoter(tick_size, max_wait=self.chase_interval, taker_deadline=self.taker_deadline)
+
+    async def _quote(self, side: str, remaining: Decimal, target_qty: Decimal) -> None:
+        """
+        依報價引擎決策掛單 / 保留 / 吃單，再等待下一次喚醒。
+        target_qty 為本階段完成時的目標持倉絕對值。
+        """
+        bid, ask = await self.grvt_client.fetch_bbo_prices(self.grvt_contract_id)
+        now = asyncio.get_running_loop().time()
+        decision = self.quoter.decide(self.grvt_client, side, remaining, bid, ask, now)
+        if decision.action == TAKE:
+            # 先撤掉掛單，撤單期間若有成交則只吃剩下的量
+            await self.grvt_client.cancel_live_order()
+            remaining = target_qty - abs(self.grvt_client.position) if target_qty else abs(self.grvt_client.position)
+            if remaining > 0:
+                self.logger.info(f"⏰ 超過 {self.taker_deadline}s 未成交，吃單 {side.upper()} {remaining} @ {decision.price}")
+                # 平倉階段 (目標為 0) 以 reduce_only 吃單，倉位讀數過時也不會反向開倉
+                await self.grvt_client.place_taker_order(self.grvt_contract_id, remaining, decision.price, side,
+                                                         reduce_only=not target_qty)
+        elif decision.action != KEEP:
+            await self.grvt_client.replace_order(self.grvt_contract_id, remaining, decision.price, side)
+        await self.quoter.wait(self.grvt_client)
+
     async def trading_loop(self):
-        self.grvt_contract_id, _ = await self.grvt_client.get_contract_attributes()
+        self.grvt_contract_id, tick_size = await self.grvt_client.get_contract_attributes()
+        if self.quoter is None:
+            self.quoter = self._make_quoter(tick_size)
+        # 接續的盈虧統計須在成交回報開始前載入，之後的成交才不會被覆蓋
+        resumed_pnl = await self._load_journal()
         await self.grvt_client.connect()
+        # 成交明細與資金費在訂閱串流前註冊，不漏接第一筆成交
+        self.grvt_client.add_fill_listener(self._on_grvt_fill)
+        self.grvt_client.add_funding_listener(lambda amount: self.pnl.on_funding(GRVT, amount))
+        # GRVT 倉位的 REST 對帳交給 PositionReconciler，與 Paradex 並行查詢
+        await self.grvt_client.start_position_tracking(reconcile=False)
+        await self.grvt_client.start_order_book()
+        self.grvt_client.start_presigned_orders()
+        # 啟動時清掉殘留掛單，之後追單只撤銷自己追蹤的那一張
+        await self.grvt_client.cancel_all_orders(self.grvt_contract_id)
+        self.reconciler = self._make_reconciler()
+        self.fill_poller = self._make_fill_poller()
+        if resumed_pnl:
+            await self._backfill_fills()
+        self.fill_poller.start()
+        resume = await self._restore()
+        start_round = resume[0] if resume else 1
+        self.reconciler.start()
 
-        for i in range(1, self.iterations + 1):
+        self.grvt_client.add_position_listener(self._on_grvt_position)
+        if self.hedge_mode == 'incremental':
+            self._hedge_task = asyncio.create_task(self._hedge_loop())
+            self.logger.info(f"⚡ 增量對沖模式 (合併窗口 {self.hedge_window}s, 最小量 {self.min_hedge_size})")
+
+        for i in range(start_round, self.iterations + 1):
+            await self._await_drift_correction()
             if self.stop_flag: break
 
-            self.round_grvt_cash_flow = Decimal('0')
-            self.round_pdex_cash_flow = Decimal('0')
-            prev_grvt_pos = await self.grvt_client.get_account_positions()
+            resumed_phase = resume[2] if resume and i == start_round else None
+            if resumed_phase != PHASE_CLOSE:
+                self.pnl.begin_round(i)
+            self._reset_exposure_stats()
+            prev_grvt_pos = self.grvt_client.position
 
-            side = self.start_side if i == 1 else ('buy' if self.current_side == 'sell' else 'sell')
+            if resumed_phase:
+                side = resume[1]
+            else:
+                side = self.start_side if i == 1 else ('buy' if self.current_side == 'sell' else 'sell')
             self.current_side = side
             self.logger.info(f"\n🔄 --- 第 {i} / {self.iterations} 輪開始 ({side.upper()}) ---")
+            if resumed_phase != PHASE_CLOSE:
+                self.phase = PHASE_OPEN
+                self._journal('round_start', round=i, side=side)
 
-            # 1. GRVT 開倉階段
-            last_target_price = Decimal('0')
-            while not self.stop_flag:
-                current_pos = await self.grvt_client.get_account_positions()
+            # 1. GRVT 開倉階段 (接續平倉時略過)
+            if resumed_phase != PHASE_CLOSE:
+                self.quoter.start(side, self.order_quantity, asyncio.get_running_loop().time())
+                self.latency.start_span("time_to_fill", "grvt", self.ticker)
+            while not self.stop_flag and resumed_phase != PHASE_CLOSE:
+                current_pos = self.grvt_client.position
                 filled_qty = current_pos - prev_grvt_pos
                 if filled_qty != 0:
-                    trade_val = abs(filled_qty) * last_target_price
-                    self.round_grvt_cash_flow -= (filled_qty * last_target_price)
-                    self.total_volume_u += trade_val # 累加開倉交易量
+                    self._record_fill_detect()
                     prev_grvt_pos = current_pos
+                    # 成交價與手續費已由 fill 串流記入 PnLEngine (早於倉位回呼)
+                    self._journal('grvt_fill', position=current_pos, cash_flow=self.pnl.round.venues[GRVT].pnl,
+                                  total_volume=self.pnl.total_volume, **self._pnl_fields())
 
                 if abs(current_pos) >= self.order_quantity:
                     self.logger.info(f"🎯 [開倉成功] GRVT 持倉: {current_pos}")
-                    pdex_side = 'sell' if current_pos > 0 else 'buy'
-                    if await self.paradex_hedge_action(pdex_side, abs(current_pos)):
+                    self.latency.end_span("time_to_fill", "grvt", self.ticker)
+                    await self.grvt_client.cancel_live_order()
+                    if self.hedge_mode == 'incremental':
+                        await self.flush_hedge()
+                        break
+                    # 以淨缺口 (GRVT + Paradex) 對沖，Paradex 不一定是空倉 (例如接續或補對沖後)
+                    gap = self.exposure_gap
+                    if gap == 0 or await self.paradex_hedge_action('sell' if gap > 0 else 'buy', abs(gap)):
                         break
 
-                bid, ask = await self.grvt_client.fetch_bbo_prices(self.grvt_contract_id)
-                last_target_price = bid if side == 'buy' else ask
-                await self.grvt_client.cancel_all_orders(self.grvt_contract_id)
-                await self.grvt_client.place_post_only_order(self.grvt_contract_id,
-                                                             (self.order_quantity - abs(current_pos)),
-                                                             last_target_price, side)
-                await asyncio.sleep(CHASE_INTERVAL)
+                # 由報價引擎決定是否重新掛單；成交 / 訂單簿事件到達即喚醒
+                await self._quote(side, self.order_quantity - abs(current_pos), self.order_quantity)
 
             # 2. 持倉等待
-            self.logger.info(f"⏳ 持倉中 ({self.holding_time}s)...")
-            await asyncio.sleep(self.holding_time)
+            if resumed_phase != PHASE_CLOSE:
+                self._set_phase(i, PHASE_HOLD)
+                self.logger.info(f"⏳ 持倉中 ({self.holding_time}s)...")
+                await asyncio.sleep(self.holding_time)
 
             # 3. GRVT 平倉階段 (處理 0.8+0.2 分批成交)
+            await self._await_drift_correction()
+            self._set_phase(i, PHASE_CLOSE)
+            close_side = 'sell' if self.grvt_client.position > 0 else 'buy'
+            self.quoter.start(close_side, abs(self.grvt_client.position), asyncio.get_running_loop().time())
+            self.latency.start_span("time_to_fill", "grvt", self.ticker)
             while not self.stop_flag:
-                current_pos = await self.grvt_client.get_account_positions()
+                current_pos = self.grvt_client.position
                 filled_qty = current_pos - prev_grvt_pos
                 if filled_qty != 0:
-                    trade_val = abs(filled_qty) * last_target_price
-                    self.round_grvt_cash_flow -= (filled_qty * last_target_price)
-                    self.total_volume_u += trade_val # 累加平倉交易量
+                    self._record_fill_detect()
                     prev_grvt_pos = current_pos
+                    # 成交價與手續費已由 fill 串流記入 PnLEngine (早於倉位回呼)
+                    self._journal('grvt_fill', position=current_pos, cash_flow=self.pnl.round.venues[GRVT].pnl,
+                                  total_volume=self.pnl.total_volume, **self._pnl_fields())
 
                 if abs(current_pos) < Decimal('0.00000001'):
                     self.logger.info("✅ GRVT 倉位已清空")
+                    self.latency.end_span("time_to_fill", "grvt", self.ticker)
+                    await self.grvt_client.cancel_live_order()
+                    if self.hedge_mode == 'incremental':
+                        await self.flush_hedge()
+                        break
                     pdex_close_side = 'buy' if self.paradex_position < 0 else 'sell'
                     await self.paradex_hedge_action(pdex_close_side, abs(self.paradex_position), is_close=True)
                     break
 
-                bid, ask = await self.grvt_client.fetch_bbo_prices(self.grvt_contract_id)
                 close_side = 'sell' if current_pos > 0 else 'buy'
-                last_target_price = ask if close_side == 'sell' else bid
-                await self.grvt_client.cancel_all_orders(self.grvt_contract_id)
-                await self.grvt_client.place_post_only_order(self.grvt_contract_id, abs(current_pos), last_target_price,
-                                                             close_side)
-                await asyncio.sleep(CHASE_INTERVAL)
+                await self._quote(close_side, abs(current_pos), Decimal('0'))
+
+            self.logger.info(f"📐 本輪曝險缺口: 峰值 {self.round_peak_gap} / 時間加權平均 {self.round_avg_gap():.6f}")
+            hedge_latency = self.latency.get("time_to_hedge", "hedge")
+            if hedge_latency is not None and hedge_latency.count:
+                self.logger.info(f"⏱️ 對沖延遲 (累計 {hedge_latency.count} 次): "
+                                 f"p50 {hedge_latency.percentile(0.5) / 1e6:.1f}ms / "
+                                 f"p99 {hedge_latency.percentile(0.99) / 1e6:.1f}ms")
+
+            # 等待對沖單的 Paradex 成交回報，讓本輪盈虧包含實際成交價與手續費
+            await self.fill_poller.settle()
+            round_pnl = self.pnl.end_round()
+            grvt_pnl, pdex_pnl = round_pnl.venues[GRVT].pnl, round_pnl.venues[PARADEX].pnl
+            self.logger.info(f"💰 本輪盈虧: GRVT {grvt_pnl:+.4f} / Paradex {pdex_pnl:+.4f} "
+                             f"(手續費 {round_pnl.fees:.4f}，資金費 {round_pnl.funding:+.4f})，"
+                             f"累計磨損 {self.pnl.total_wear:+.4f}")
 
             # 🏁 發送 Telegram 報告 (包含 Ticker 與 總交易量)
             self.tg_reporter.send_round_report(
                 ticker=self.ticker,
                 round_num=i,
-                grvt_pnl=self.round_grvt_cash_flow,
-                pdex_pnl=self.round_pdex_cash_flow,
-                total_volume=self.total_volume_u
+                grvt_pnl=grvt_pnl,
+                pdex_pnl=pdex_pnl,
+                total_volume=self.pnl.total_volume,
+                fees=round_pnl.fees,
+                funding=round_pnl.funding
             )
+            if not self.stop_flag:
+                self.phase = PHASE_DONE
+                self._journal('round_end', round=i, total_wear=self.pnl.total_wear)
             await asyncio.sleep(5)
 
     async def run(self):
         self.initialize_clients()
-        await self.trading_loop()
\ No newline at end of file
+        try:
+            await self.trading_loop()
+        finally:
+            if self._hedge_task:
+                self._hedge_task.cancel()
+            if self._drift_task is not None:
+                self._drift_task.cancel()
+            if self.reconciler is not None:
+                self.reconciler.stop()
+            if self.fill_poller is not None:
+                self.fill_poller.stop()
+            if self.journal is not None:
+                await self.journal.close()
+            await self.grvt_client.disconnect()
+            if self.shared is None:
+                await self.paradex_account.close()
+                # 送出尚未發送的通知 (有上限的等待) 後關閉 HTTP session
+                await self.tg_reporter.close()
+        if self.error is not None:
+            raise self.error
\ No newline at end of file
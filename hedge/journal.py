@@ -0,0 +1,265 @@
+"""
+HedgeBot 狀態日誌 (write-ahead journal)
+
+每個輪次狀態轉換、GRVT 成交與 Paradex 對沖都追加一行 JSON 到日誌檔。append() 只更新記憶體狀態並入列，
+背景任務每 fsync_interval 秒把累積的紀錄一次寫入並 fsync (在執行緒中，不阻塞事件迴圈)。
+
+每筆紀錄都帶有該時刻的絕對狀態 (倉位、本輪盈虧統計、累計交易量)，重播時依序套用即可，重複套用也不會出錯。
+啟動時重播日誌得到崩潰前的狀態，再由 HedgeBot 以兩邊交易所各一次倉位查詢校正；
+日誌以一筆 snapshot 重寫 (原子替換)，之後紀錄數超過 COMPACT_EVERY 時同樣壓縮，重播時間維持在毫秒級。
+所有檔案寫入 (含壓縮) 都由同一個背景任務依序執行，不會同時寫入。
+
+最後一批紀錄可能在 fsync 前遺失 (最多 fsync_interval 秒)，以啟動時的倉位查詢為準補齊。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+FSYNC_INTERVAL = 0.05
+COMPACT_EVERY = 5000
+FORMAT_VERSION = 1
+# 隨狀態日誌保存的已計入成交去重鍵數量 (hedge/pnl.py 重啟後補查成交時排除已計入的；
+# 需涵蓋重疊查詢範圍內的成交)
+FILL_KEYS_KEPT = 256
+
+# 輪次階段
+PHASE_OPEN = 'open'
+PHASE_HOLD = 'hold'
+PHASE_CLOSE = 'close'
+PHASE_DONE = 'done'
+
+_DECIMAL_FIELDS = ('grvt_position', 'paradex_position', 'round_grvt_cash_flow', 'round_pdex_cash_flow',
+                   'total_volume', 'total_wear')
+
+
+@dataclass
+class JournalState:
+    """日誌重播後的 HedgeBot 狀態"""
+    round: int = 0
+    side: str = ''
+    phase: str = PHASE_DONE
+    grvt_position: Decimal = Decimal('0')
+    paradex_position: Decimal = Decimal('0')
+    round_grvt_cash_flow: Decimal = Decimal('0')
+    round_pdex_cash_flow: Decimal = Decimal('0')
+    total_volume: Decimal = Decimal('0')
+    total_wear: Decimal = Decimal('0')
+    # 已送出但尚未收到結果的 Paradex 對沖 (side, qty)
+    pending_hedge: Optional[List[str]] = None
+    # 本輪各交易所的成交統計 (PnLEngine RoundPnL.to_dict()，見 hedge/pnl.py)
+    round_pnl: Optional[Dict[str, List[str]]] = None
+    # 已計入的 GRVT / Paradex 成交的最新時間 (毫秒)，重啟後從這裡往前重疊補查
+    grvt_fills_since: int = 0
+    paradex_fills_since: int = 0
+    # 最近已計入成交的去重鍵 (PnLEngine)
+    fill_keys: List[str] = field(default_factory=list)
+    seq: int = 0
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        event = record.get('event')
+        if event == 'snapshot':
+            for key, value in record.get('state', {}).items():
+                if key in _DECIMAL_FIELDS:
+                    value = Decimal(value)
+                setattr(self, key, value)
+        elif event == 'round_start':
+            self.round = record['round']
+            self.side = record['side']
+            self.phase = PHASE_OPEN
+            self.round_grvt_cash_flow = Decimal('0')
+            self.round_pdex_cash_flow = Decimal('0')
+            self.round_pnl = None
+        elif event == 'phase':
+            self.phase = record['phase']
+        elif event == 'grvt_fill':
+            self.grvt_position = Decimal(record['position'])
+            self.round_grvt_cash_flow = Decimal(record['cash_flow'])
+            self.total_volume = Decimal(record['total_volume'])
+            self._apply_pnl(record)
+        elif event == 'hedge_submit':
+            self.pending_hedge = [record['side'], record['qty']]
+        elif event == 'hedge_done':
+            self.pending_hedge = None
+            self.paradex_position = Decimal(record['position'])
+            self.round_pdex_cash_flow = Decimal(record['cash_flow'])
+            self._apply_pnl(record)
+        elif event == 'pnl':
+            self._apply_pnl(record)
+        elif event == 'round_end':
+            self.phase = PHASE_DONE
+            self.total_wear = Decimal(record['total_wear'])
+        elif event == 'reconcile':
+            self.grvt_position = Decimal(record['grvt_position'])
+            self.paradex_position = Decimal(record['paradex_position'])
+            self.pending_hedge = None
+        self.seq = max(self.seq, int(record.get('seq', 0)))
+
+    def _apply_pnl(self, record: Dict[str, Any]) -> None:
+        """本輪盈虧統計，以及同時寫入的已計入成交去重鍵與查詢起點"""
+        self.round_pnl = record.get('pnl', self.round_pnl)
+        self.grvt_fills_since = int(record.get('grvt_since', self.grvt_fills_since))
+        self.paradex_fills_since = int(record.get('paradex_since', self.paradex_fills_since))
+        keys = record.get('fills')
+        if keys:
+            self.fill_keys = (self.fill_keys + keys)[-FILL_KEYS_KEPT:]
+
+    def to_record(self) -> Dict[str, Any]:
+        state = asdict(self)
+        for key in _DECIMAL_FIELDS:
+            state[key] = str(state[key])
+        state.pop('seq')
+        return {'event': 'snapshot', 'seq': self.seq, 'version': FORMAT_VERSION, 'state': state}
+
+    @classmethod
+    def replay(cls, path: str, logger: Optional[logging.Logger] = None) -> 'JournalState':
+        """讀取日誌並依序套用；崩潰時寫到一半的最後一行會被略過"""
+        state = cls()
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return state
+        with f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    state.apply(json.loads(line))
+                except (ValueError, KeyError, ArithmeticError) as e:
+                    if logger:
+                        logger.warning(f"⚠️ 日誌第 {line_no} 行無法解析，略過: {e}")
+        return state
+
+
+class HedgeJournal:
+    """單一幣種的追加式狀態日誌，於事件迴圈上使用"""
+
+    def __init__(self, path: str, fsync_interval: float = FSYNC_INTERVAL, compact_every: int = COMPACT_EVERY,
+                 logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self.logger = logger or logging.getLogger(__name__)
+        self.state = JournalState.replay(path, self.logger)
+
+        self._pending: List[str] = []
+        self._waiters: List[asyncio.Future] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Task] = None
+        self._file = None
+        self._records = 0
+        # 下一批改以 snapshot 重寫整個檔案
+        self._compact = False
+        self.batches = 0
+
+    def append(self, event: str, **fields: Any) -> None:
+        """記錄一筆狀態轉換：立即套用到 self.state 並入列，不等待寫入"""
+        self.state.seq += 1
+        record = {'event': event, 'seq': self.state.seq, 'ts': round(time.time(), 6)}
+        record.update({k: str(v) if isinstance(v, Decimal) else v for k, v in fields.items()})
+        self.state.apply(record)
+        self._pending.append(json.dumps(record, separators=(',', ':')))
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    async def sync(self) -> None:
+        """等待目前為止的紀錄全部寫入並 fsync"""
+        if not self._pending and not self._compact and (self._writing is None or self._writing.done()):
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        await waiter
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # 累積一小段時間的紀錄一起 fsync
+            await asyncio.sleep(self.fsync_interval)
+            self._wakeup.clear()
+            self._writing = asyncio.get_running_loop().create_task(self._flush())
+            # shield：close() 取消背景任務時不中斷寫到一半的批次
+            await asyncio.shield(self._writing)
+
+    async def _flush(self) -> None:
+        lines, self._pending = self._pending, []
+        waiters, self._waiters = self._waiters, []
+        snapshot = None
+        if lines or self._compact:
+            self._records += len(lines)
+            if self._compact or self._records >= self.compact_every:
+                snapshot = self.state.to_record()
+                self._records = 0
+                self._compact = False
+            try:
+                await asyncio.to_thread(self._write, lines, snapshot)
+                self.batches += 1
+            except Exception as e:
+                # 寫入失敗不可中止背景任務，否則之後的 sync() 永遠等不到結果
+                self.logger.error(f"❌ 日誌寫入失敗: {e}")
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _write(self, lines: List[str], snapshot: Optional[Dict[str, Any]] = None) -> None:
+        """(執行緒) 追加並 fsync；需要壓縮時改以 snapshot 重寫整個檔案"""
+        if snapshot is not None:
+            self._rewrite(snapshot)
+            return
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write('\n'.join(lines) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _rewrite(self, snapshot: Dict[str, Any]) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # 讓目錄項目 (rename) 也落盤
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    async def compact(self) -> None:
+        """以目前狀態的一筆 snapshot 重寫日誌 (啟動校正後呼叫)：交給背景任務作為下一批寫入，等待完成"""
+        self._compact = True
+        self._wake()
+        await self.sync()
+
+    async def close(self) -> None:
+        """寫入剩餘紀錄後關閉檔案"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._writing is not None:
+            await self._writing
+        await self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,311 @@
+"""
+實際成交盈虧統計 (hedge/pnl.py)
+
+PnLEngine 只吃交易所回報的實際成交 (Fill)，不再以追單掛價或對沖前的 GRVT BBO 估算：
+- GRVT：fill 串流 (價格、數量、手續費)，資金費取自 position 串流 cumulative_realized_funding_payment 的增量
+- Paradex：對沖下單後由 ParadexFillPoller 查詢 /fills，手續費與 realized_funding 都在成交紀錄上
+
+每筆成交以 O(1) 更新本輪與累計的各交易所統計 (現金流、手續費、資金費、交易量)，以 (交易所, trade_id, order_id)
+去重；輪次結束時把本輪盈虧加進累計磨損。已計入成交的去重鍵與各交易所的查詢起點隨盈虧統計寫入狀態日誌，
+重啟後兩邊都由起點往前重疊查詢補上停機期間的成交，已計入的以去重鍵排除。單輪盈虧 = 現金流 - 手續費 + 資金費，輪次開始與結束時兩邊皆無倉位，
+因此現金流即為已實現盈虧。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from hedge.journal import FILL_KEYS_KEPT
+from hedge.reconcile import GRVT, PARADEX
+
+VENUES = (GRVT, PARADEX)
+
+# 保留最近成交的去重鍵數量
+FILL_DEDUP_SIZE = 4096
+# Paradex 成交查詢：有待確認的對沖單時的查詢間隔、閒置時的間隔 (秒)
+FILL_POLL_INTERVAL = 0.5
+FILL_IDLE_INTERVAL = 30.0
+# 查詢起點往前重疊的毫秒數 (同一毫秒內的成交可能分頁到達，靠去重排除重複)
+FILL_POLL_OVERLAP_MS = 2000
+# 輪次結束前等待對沖成交回報的最長秒數
+FILL_SETTLE_TIMEOUT = 5.0
+
+ZERO = Decimal('0')
+
+
+@dataclass(frozen=True)
+class Fill:
+    venue: str
+    side: str  # 'buy' / 'sell'
+    size: Decimal
+    price: Decimal
+    # 正值為支付，負值為返佣 (計價幣)
+    fee: Decimal = ZERO
+    # 隨成交實現的資金費，正值為收入
+    funding: Decimal = ZERO
+    trade_id: str = ''
+    order_id: str = ''
+    ts: float = 0.0
+
+    @property
+    def cash_flow(self) -> Decimal:
+        notional = self.size * self.price
+        return -notional if self.side == 'buy' else notional
+
+
+def fill_from_grvt(feed: Dict[str, Any]) -> Fill:
+    """GRVT fill 串流 / fill_history 的一筆成交"""
+    return Fill(
+        venue=GRVT,
+        side='buy' if feed.get('is_buyer') else 'sell',
+        size=Decimal(feed.get('size', '0')),
+        price=Decimal(feed.get('price', '0')),
+        fee=Decimal(feed.get('fee') or '0'),
+        trade_id=str(feed.get('trade_id', '')),
+        order_id=str(feed.get('order_id', '')),
+        ts=int(feed.get('event_time') or 0) / 1e9,
+    )
+
+
+def fill_from_paradex(result: Dict[str, Any]) -> Fill:
+    """Paradex GET /fills 的一筆成交"""
+    return Fill(
+        venue=PARADEX,
+        side=str(result.get('side', '')).lower(),
+        size=Decimal(str(result.get('size', '0'))),
+        price=Decimal(str(result.get('price', '0'))),
+        fee=Decimal(str(result.get('fee') or '0')),
+        funding=Decimal(str(result.get('realized_funding') or '0')),
+        trade_id=str(result.get('id', '')),
+        order_id=str(result.get('order_id', '')),
+        ts=int(result.get('created_at') or 0) / 1000,
+    )
+
+
+@dataclass
+class VenuePnL:
+    """單一交易所的累加統計"""
+    cash_flow: Decimal = ZERO
+    fees: Decimal = ZERO
+    funding: Decimal = ZERO
+    volume: Decimal = ZERO
+    fills: int = 0
+
+    @property
+    def pnl(self) -> Decimal:
+        return self.cash_flow - self.fees + self.funding
+
+    def add_fill(self, fill: Fill) -> None:
+        self.cash_flow += fill.cash_flow
+        self.fees += fill.fee
+        self.funding += fill.funding
+        self.volume += fill.size * fill.price
+        self.fills += 1
+
+    def to_list(self) -> List[str]:
+        return [str(self.cash_flow), str(self.fees), str(self.funding), str(self.volume)]
+
+    @classmethod
+    def from_list(cls, values: List[str]) -> 'VenuePnL':
+        cash_flow, fees, funding, volume = (Decimal(v) for v in values)
+        return cls(cash_flow, fees, funding, volume)
+
+
+@dataclass
+class RoundPnL:
+    """單輪兩邊交易所的統計"""
+    round: int = 0
+    venues: Dict[str, VenuePnL] = field(default_factory=lambda: {venue: VenuePnL() for venue in VENUES})
+
+    @property
+    def wear(self) -> Decimal:
+        """本輪磨損 (兩邊盈虧加總，已扣手續費、含資金費)"""
+        return sum((v.pnl for v in self.venues.values()), ZERO)
+
+    @property
+    def fees(self) -> Decimal:
+        return sum((v.fees for v in self.venues.values()), ZERO)
+
+    @property
+    def funding(self) -> Decimal:
+        return sum((v.funding for v in self.venues.values()), ZERO)
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {venue: v.to_list() for venue, v in self.venues.items()}
+
+
+class PnLEngine:
+    """以實際成交累計每輪與全程的盈虧、手續費與資金費"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.round = RoundPnL()
+        # 全程累計 (含未結束的本輪)
+        self.totals: Dict[str, VenuePnL] = {venue: VenuePnL() for venue in VENUES}
+        # 已結束輪次的磨損加總
+        self.total_wear = ZERO
+        self.rounds = 0
+        self.duplicates = 0
+        self._seen: Dict[str, None] = {}
+        # 尚未寫入狀態日誌的去重鍵 (見 take_fill_keys)
+        self._unjournaled: List[str] = []
+        # 各交易所已計入成交的最新時間 (毫秒)，補查成交的起點；只統計啟動之後的成交
+        now_ms = int(time.time() * 1000)
+        self.since_ms: Dict[str, int] = {venue: now_ms for venue in VENUES}
+
+    def begin_round(self, round_num: int) -> None:
+        self.round = RoundPnL(round_num)
+
+    def end_round(self) -> RoundPnL:
+        """結束本輪：本輪磨損加進累計，回傳本輪統計"""
+        finished = self.round
+        self.total_wear += finished.wear
+        self.rounds += 1
+        self.round = RoundPnL(finished.round + 1)
+        return finished
+
+    def on_fill(self, fill: Fill) -> bool:
+        """套用一筆成交；重複的成交回傳 False"""
+        key = f"{fill.venue}:{fill.trade_id}:{fill.order_id}"
+        if key in self._seen:
+            self.duplicates += 1
+            return False
+        self._remember(key)
+        self._unjournaled.append(key)
+        if len(self._unjournaled) > FILL_KEYS_KEPT:
+            del self._unjournaled[0]
+        self.since_ms[fill.venue] = max(self.since_ms[fill.venue], int(round(fill.ts * 1000)))
+        self.round.venues[fill.venue].add_fill(fill)
+        self.totals[fill.venue].add_fill(fill)
+        return True
+
+    def _remember(self, key: str) -> None:
+        self._seen[key] = None
+        if len(self._seen) > FILL_DEDUP_SIZE:
+            self._seen.pop(next(iter(self._seen)))
+
+    def take_fill_keys(self) -> List[str]:
+        """取出上次呼叫之後計入的成交去重鍵，與當下的本輪統計一起寫入狀態日誌"""
+        keys, self._unjournaled = self._unjournaled, []
+        return keys
+
+    def on_funding(self, venue: str, amount: Decimal) -> None:
+        """未附在成交上的資金費 (正值為收入)"""
+        if amount:
+            self.round.venues[venue].funding += amount
+            self.totals[venue].funding += amount
+
+    def restore(self, round_num: int, round_pnl: Optional[Dict[str, List[str]]], total_wear: Decimal,
+                total_volume: Decimal, fill_keys: Optional[List[str]] = None,
+                since_ms: Optional[Dict[str, int]] = None) -> None:
+        """
+        由狀態日誌接續：本輪已累計的統計、已結束輪次的磨損、GRVT 累計成交額，以及已計入成交的去重鍵與
+        各交易所的查詢起點 (之後補查到的成交若已計入，以去重鍵排除)。需在成交回報開始之前呼叫。
+        """
+        self.round = RoundPnL(round_num)
+        for venue, values in (round_pnl or {}).items():
+            if venue in self.round.venues:
+                self.round.venues[venue] = VenuePnL.from_list(values)
+        self.total_wear = total_wear
+        self.totals[GRVT].volume = total_volume
+        for key in fill_keys or ():
+            self._remember(key)
+        for venue, ms in (since_ms or {}).items():
+            if venue in self.since_ms and ms:
+                self.since_ms[venue] = ms
+
+    @property
+    def total_volume(self) -> Decimal:
+        """GRVT 累計成交額 (與原本的總交易量口徑相同)"""
+        return self.totals[GRVT].volume
+
+
+class ParadexFillPoller:
+    """
+    Paradex 成交回報：以 REST 查詢 /fills 餵給 PnLEngine。
+    對沖下單後以 expect(order_id) 登記，之後每 FILL_POLL_INTERVAL 秒查詢直到收到該單成交；
+    沒有待確認的訂單時每 idle_interval 秒查詢一次，補上漏接的成交 (例如對帳補對沖)。
+    查詢起點為 engine.since_ms[PARADEX] 往前重疊 FILL_POLL_OVERLAP_MS，重複的成交由 engine 以成交 id 排除。
+    """
+
+    def __init__(self, fetch_fills: Callable[[int], Awaitable[List[Dict[str, Any]]]], engine: PnLEngine,
+                 interval: float = FILL_POLL_INTERVAL, idle_interval: float = FILL_IDLE_INTERVAL,
+                 logger: Optional[logging.Logger] = None):
+        self.fetch_fills = fetch_fills
+        self.engine = engine
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending: Set[str] = set()
+        self._settled: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # 有新成交套用後呼叫 (例如寫入狀態日誌)
+        self.on_fills: Optional[Callable[[], None]] = None
+        self.polls = 0
+
+    def expect(self, order_id: Optional[str]) -> None:
+        """登記一張已送出的對沖單，盡快查詢其成交"""
+        if order_id:
+            self._pending.add(str(order_id))
+            if self._settled is not None:
+                self._settled.clear()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def settle(self, timeout: float = FILL_SETTLE_TIMEOUT) -> bool:
+        """
+        等待已登記的對沖單成交都已收到 (最多 timeout 秒)；逾時回傳 False 並不再等待這些訂單，
+        之後才到的成交由閒置查詢補上，計入當時的輪次。
+        """
+        if not self._pending or self._settled is None:
+            return not self._pending
+        try:
+            await asyncio.wait_for(self._settled.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.logger.warning(f"⚠️ Paradex 成交回報逾時，未收到: {sorted(self._pending)}")
+            self._pending.clear()
+            self._settled.set()
+            return False
+
+    async def poll(self) -> None:
+        results = await self.fetch_fills(self.engine.since_ms[PARADEX] - FILL_POLL_OVERLAP_MS)
+        self.polls += 1
+        fills = sorted((fill_from_paradex(r) for r in results), key=lambda f: f.ts)
+        applied = 0
+        for fill in fills:
+            self._pending.discard(fill.order_id)
+            applied += self.engine.on_fill(fill)
+        if applied and self.on_fills:
+            self.on_fills()
+        if not self._pending and self._settled is not None:
+            self._settled.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._settled = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval if self._pending else self.idle_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ Paradex 成交查詢錯誤: {e}")
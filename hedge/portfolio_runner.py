@@ -0,0 +1,101 @@
+"""
+多幣種對沖執行器：同一行程內以 asyncio 任務並行執行多個 HedgeBot，
+共用一組 GRVT WS / REST 連線池 / 市場資料快取與一個 Paradex 帳戶。
+"""
+import asyncio
+import logging
+import os
+import sys
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exchanges.grvthedge import GrvtHedgeClient
+from exchanges.interceptor import AuthInterceptor
+from exchanges.account import ParadexAccount
+from hedge.hedge_mode_grvtparadex import HedgeBot
+from helpers.notifier import Notifier
+from helpers.logger import attach_queue_handlers
+
+
+class SharedConnections:
+    """
+    所有 HedgeBot 共用的連線：
+    - 一個 GRVT 連線擁有者 (keep-alive session + GrvtCcxtPro + GrvtCcxtWS，市場資料只載入一次)
+    - 一個 ParadexAccount (共用 keep-alive session 與 JWT)
+    各幣種的 GrvtHedgeClient 只保存自己的倉位 / 訂單簿 / 追單狀態，訂閱以 instrument 區分。
+    """
+
+    def __init__(self):
+        self.grvt_owner: Optional[GrvtHedgeClient] = None
+        self.paradex_account: Optional[ParadexAccount] = None
+        # 所有幣種的輪次報告共用一個通知佇列與 HTTP session
+        self.notifier = Notifier.from_env()
+
+    async def start(self) -> None:
+        AuthInterceptor.install(enabled=True, token_usage="interactive")
+        owner_config = type('Config', (), {
+            'ticker': 'PORTFOLIO', 'quantity': Decimal('0'), 'tick_size': Decimal('0.01'),
+            'contract_id': None
+        })
+        self.grvt_owner = GrvtHedgeClient(owner_config)
+        await self.grvt_owner.rest_client.load_markets()
+        await self.grvt_owner.connect()
+        self.paradex_account = ParadexAccount(
+            name="PortfolioHedgeAcc",
+            l2_private_key=os.getenv("PARADEX_L2_PRIVATE_KEY"),
+            l2_address=os.getenv("PARADEX_L2_ADDRESS")
+        )
+
+    def new_grvt_client(self, config) -> GrvtHedgeClient:
+        """建立共用連線的單幣種 GRVT 客戶端"""
+        return GrvtHedgeClient(
+            config,
+            session=self.grvt_owner._session,
+            rest_client=self.grvt_owner.rest_client,
+            ws_client=self.grvt_owner._ws_client,
+        )
+
+    async def close(self) -> None:
+        await self.notifier.close()
+        if self.paradex_account is not None:
+            await self.paradex_account.close()
+        if self.grvt_owner is not None:
+            await self.grvt_owner.disconnect()
+
+
+class PortfolioRunner:
+    """以共用連線並行執行多個幣種的 HedgeBot；單一幣種出錯不影響其他幣種"""
+
+    def __init__(self, tickers: Dict[str, Decimal], **bot_kwargs):
+        self.tickers = tickers
+        self.bot_kwargs = bot_kwargs
+        self.shared = SharedConnections()
+        self.bots: List[HedgeBot] = []
+        self.logger = logging.getLogger("PortfolioRunner")
+        self.logger.setLevel(logging.INFO)
+        if not self.logger.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            # 輸出交給背景寫入執行緒，交易迴圈只負責入列
+            attach_queue_handlers(self.logger, [handler])
+
+    async def run(self) -> None:
+        await self.shared.start()
+        self.logger.info(f"🌐 共用連線就緒，啟動 {len(self.tickers)} 個幣種: {', '.join(self.tickers)}")
+        try:
+            self.bots = [
+                HedgeBot(ticker=ticker, order_quantity=quantity, shared=self.shared, **self.bot_kwargs)
+                for ticker, quantity in self.tickers.items()
+            ]
+            results = await asyncio.gather(*(bot.run() for bot in self.bots), return_exceptions=True)
+            for bot, result in zip(self.bots, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"❌ {bot.ticker} 結束於錯誤: {result!r}")
+        finally:
+            await self.shared.close()
+
+    def stop(self) -> None:
+        for bot in self.bots:
+            bot.stop_flag = True
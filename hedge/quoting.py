@@ -0,0 +1,218 @@
+"""
+追單報價引擎 (hedge/quoting.py)
+
+HedgeBot 的開倉 / 平倉迴圈每次醒來時呼叫 quoter.decide() 取得決策 (保留 / 重新掛單 / 轉吃單)，
+執行後再呼叫 quoter.wait() 等待下一次喚醒。
+
+- FixedIntervalQuoter：原本的行為，每 chase_interval 秒 (或成交時) 以最佳價重新掛單
+- AdaptiveQuoter：由訂單簿更新驅動，只在掛單不再位於最佳價或 BBO 改變時才重新報價；
+  支援改善一個 tick、排隊位置估計，以及超過期限後轉為吃單 (IOC)
+
+客戶端需提供：order_book (LocalOrderBook)、live_order、book_includes_own_orders、
+wait_for_update(timeout)、wait_for_position_change(timeout)。
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+KEEP = 'keep'
+QUOTE = 'quote'
+TAKE = 'take'
+
+
+@dataclass
+class QuoteDecision:
+    action: str
+    price: Decimal = Decimal('0')
+
+
+class QueueEstimator:
+    """
+    估計掛單前方的排隊量 (只看得到價位總量，看不到個別訂單)。
+    掛單時前方 = 該價位其他人的量；之後價位減少的量按比例分攤到我們前後
+    (成交只吃前方、撤單前後都有，按比例是保守估計)，增加的量一律排在我們後面。
+    """
+
+    def __init__(self):
+        self.order_id: Optional[str] = None
+        self.ahead = Decimal('0')
+        self._others = Decimal('0')
+
+    def reset(self, order_id: str, others: Decimal) -> None:
+        self.order_id = order_id
+        self.ahead = self._others = max(Decimal('0'), others)
+
+    def update(self, others: Decimal) -> Decimal:
+        others = max(Decimal('0'), others)
+        if others < self._others and self._others > 0:
+            self.ahead -= (self._others - others) * self.ahead / self._others
+        self.ahead = min(self.ahead, others)
+        self._others = others
+        return self.ahead
+
+
+class Quoter(ABC):
+    """報價引擎介面"""
+
+    def start(self, side: str, quantity: Decimal, now: float) -> None:
+        """開倉 / 平倉階段開始"""
+
+    @abstractmethod
+    def decide(self, client, side: str, remaining: Decimal, bid: Decimal, ask: Decimal, now: float) -> QuoteDecision:
+        """決定保留 / 重新掛單 / 轉吃單"""
+        pass
+
+    @abstractmethod
+    async def wait(self, client) -> None:
+        """等待下一次喚醒"""
+        pass
+
+
+class FixedIntervalQuoter(Quoter):
+    """每次醒來都以最佳價掛單 (同價格時 replace_order 會保留原單)，最多等待 chase_interval 秒"""
+
+    def __init__(self, chase_interval: float = 2.0):
+        self.chase_interval = chase_interval
+
+    def decide(self, client, side: str, remaining: Decimal, bid: Decimal, ask: Decimal, now: float) -> QuoteDecision:
+        return QuoteDecision(QUOTE, bid if side == 'buy' else ask)
+
+    async def wait(self, client) -> None:
+        await client.wait_for_position_change(self.chase_interval)
+
+
+class AdaptiveQuoter(Quoter):
+    """
+    訂單簿驅動的追單：
+    - 掛單仍在最佳價 (或更好) 時保留，不發任何請求
+    - 被超越或 BBO 移開時才重新掛單，兩次掛單至少間隔 min_requote_interval 秒；
+      落後不到 chase_ticks 個 tick 時先等 stale_after 秒 (預設 max_wait) 再追
+    - 價差 >= 2 tick 且前方排隊量 >= improve_queue_ratio × 剩餘量時，掛在最佳價內一個 tick
+    - 設定 taker_deadline 時，階段開始超過該秒數仍未成交完畢，以 IOC 吃單 (對手價 + taker_slippage_ticks)
+    """
+
+    def __init__(self, tick_size: Decimal, max_wait: float = 2.0, min_requote_interval: float = 0.1,
+                 improve: bool = True, improve_queue_ratio: Decimal = Decimal('2'),
+                 taker_deadline: Optional[float] = None, taker_slippage_ticks: int = 2,
+                 taker_settle: float = 1.0, chase_ticks: int = 3, stale_after: Optional[float] = None):
+        self.tick_size = tick_size
+        self.max_wait = max_wait
+        self.min_requote_interval = min_requote_interval
+        self.improve = improve
+        self.improve_queue_ratio = improve_queue_ratio
+        self.taker_deadline = taker_deadline
+        self.taker_slippage_ticks = taker_slippage_ticks
+        self.taker_settle = taker_settle
+        self.chase_ticks = chase_ticks
+        self.stale_after = max_wait if stale_after is None else stale_after
+
+        self.queue = QueueEstimator()
+        self._started_at = 0.0
+        self._last_quote_at = float('-inf')
+        self._last_take_at = float('-inf')
+        self._behind_since: Optional[float] = None
+        self._last_action = KEEP
+        self._wait_timeout = max_wait
+
+    def start(self, side: str, quantity: Decimal, now: float) -> None:
+        self._started_at = now
+        self._last_take_at = float('-inf')
+        self._behind_since = None
+        self._last_action = KEEP
+        self.queue = QueueEstimator()
+
+    def _others_at(self, client, side: str, price: Decimal) -> Decimal:
+        """價位上其他人的量 (訂單簿包含自己的掛單時扣掉自己)"""
+        book = client.order_book
+        size = book.size_at(side, price) if book is not None else Decimal('0')
+        live = client.live_order
+        if client.book_includes_own_orders and live is not None and live.side == side and live.price == price:
+            size -= live.size
+        return max(Decimal('0'), size)
+
+    def _target(self, client, side: str, remaining: Decimal, best: Decimal, opposite: Decimal,
+                ahead: Optional[Decimal]) -> Decimal:
+        """最佳價，或在排隊太長且價差足夠時改善一個 tick (不跨越對手價)"""
+        if not self.improve or not opposite or not best:
+            return best
+        step = self.tick_size if side == 'buy' else -self.tick_size
+        improved = best + step
+        if abs(opposite - best) < 2 * self.tick_size:
+            return best
+        if ahead is None:
+            ahead = self._others_at(client, side, best)
+        return improved if ahead >= self.improve_queue_ratio * remaining else best
+
+    def decide(self, client, side: str, remaining: Decimal, bid: Decimal, ask: Decimal, now: float) -> QuoteDecision:
+        best, opposite = (bid, ask) if side == 'buy' else (ask, bid)
+        self._wait_timeout = self.max_wait
+
+        if self.taker_deadline is not None and now - self._started_at >= self.taker_deadline and opposite:
+            if now - self._last_take_at < self.taker_settle:
+                # 上一次吃單的成交回報可能尚未到齊，避免重複吃單
+                self._wait_timeout = self.taker_settle - (now - self._last_take_at)
+                return self._keep()
+            slippage = self.tick_size * self.taker_slippage_ticks
+            self._last_take_at = now
+            self._last_action = TAKE
+            self._wait_timeout = self.taker_settle
+            return QuoteDecision(TAKE, opposite + slippage if side == 'buy' else opposite - slippage)
+
+        live = client.live_order
+        target = None
+        if live is not None and live.side == side:
+            # 價格等於或優於最佳價 (含對手價已穿過、等待成交回報的情況)
+            at_top = live.price >= best if side == 'buy' else live.price <= best
+            if not at_top:
+                # 只落後少於 chase_ticks 時先等 stale_after 秒，價格常常很快回來
+                if self._behind_since is None:
+                    self._behind_since = now
+                behind_for = now - self._behind_since
+                if abs(best - live.price) < self.chase_ticks * self.tick_size and behind_for < self.stale_after:
+                    self._wait_timeout = self.stale_after - behind_for
+                    return self._keep()
+            else:
+                self._behind_since = None
+                others = self._others_at(client, side, live.price)
+                if self.queue.order_id != live.order_id:
+                    self.queue.reset(live.order_id, others)
+                ahead = self.queue.update(others)
+                if live.price != best:
+                    return self._keep()
+                # 排在最佳價但估計前方太長時，仍可改善一個 tick
+                target = self._target(client, side, remaining, best, opposite, ahead)
+                if target == best:
+                    return self._keep()
+
+        if target is None:
+            target = self._target(client, side, remaining, best, opposite, None)
+            if live is not None and live.side == side and live.price == target:
+                return self._keep()
+        wait = self.min_requote_interval - (now - self._last_quote_at)
+        if wait > 0:
+            # 節流：稍後醒來再決定
+            self._wait_timeout = wait
+            return self._keep()
+        self._last_quote_at = now
+        self._behind_since = None
+        self._last_action = QUOTE
+        return QuoteDecision(QUOTE, target)
+
+    def _keep(self) -> QuoteDecision:
+        self._last_action = KEEP
+        return QuoteDecision(KEEP)
+
+    async def wait(self, client) -> None:
+        timeout = self._wait_timeout
+        if self.taker_deadline is not None:
+            # 期限到時一定醒來
+            until_deadline = self.taker_deadline - (asyncio.get_running_loop().time() - self._started_at)
+            if 0 < until_deadline < timeout:
+                timeout = until_deadline
+        if self._last_action == TAKE:
+            await client.wait_for_position_change(timeout)
+        else:
+            await client.wait_for_update(timeout)
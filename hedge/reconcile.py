@@ -0,0 +1,194 @@
+"""
+跨交易所倉位對帳 (hedge/reconcile.py)
+
+PositionReconciler 為 HedgeBot 維護兩邊交易所的倉位快照 (PositionSnapshot，帶版本號)：
+- GRVT：WS fill / position 串流即時更新 (透過 GrvtHedgeClient 的倉位回呼)
+- Paradex：對沖下單成功時以本地結果更新 (apply_local)
+- 兩邊每 interval 秒以 REST 並行查詢一次；與快照不同的結果需連續 confirmations 次一致才覆蓋，
+  查詢期間快照若已被串流 / 下單更新則該次結果作廢 (REST 可能落後)
+
+查詢連續失敗 unknown_after 次後快照標記為未知 (size 為 None)，與 0 倉位區分；未知時不計算淨曝險。
+Bot 處於應完全對沖的狀態 (expect_flat) 而淨曝險超過 tolerance 時呼叫 on_drift，由 HedgeBot 依設定
+自動補對沖、停止並拋出 ExposureDriftError，或只發出警示。交易迴圈只讀快照，不自行發 REST 請求。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, Optional
+
+RECONCILE_INTERVAL = 5.0
+CONFIRMATIONS = 2
+UNKNOWN_AFTER = 3
+
+GRVT = 'grvt'
+PARADEX = 'paradex'
+
+
+class ExposureDriftError(RuntimeError):
+    """兩邊倉位的淨曝險在應完全對沖時不為 0"""
+
+
+@dataclass(frozen=True)
+class PositionSnapshot:
+    venue: str
+    # None = 未知 (從未成功查詢，或連續查詢失敗)
+    size: Optional[Decimal]
+    version: int = 0
+    updated_at: float = 0.0
+    source: str = ''
+    error: Optional[str] = None
+
+    @property
+    def known(self) -> bool:
+        return self.size is not None
+
+
+class PositionReconciler:
+    """兩邊交易所倉位的快取快照與週期性 REST 對帳"""
+
+    def __init__(self, fetchers: Dict[str, Callable[[], Awaitable[Decimal]]], interval: float = RECONCILE_INTERVAL,
+                 tolerance: Decimal = Decimal('0'), confirmations: int = CONFIRMATIONS,
+                 unknown_after: int = UNKNOWN_AFTER, logger: Optional[logging.Logger] = None):
+        self.fetchers = fetchers
+        self.interval = interval
+        self.tolerance = tolerance
+        self.confirmations = confirmations
+        self.unknown_after = unknown_after
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.snapshots: Dict[str, PositionSnapshot] = {venue: PositionSnapshot(venue, None) for venue in fetchers}
+        # REST 結果與快照不同時的暫存 (值, 連續次數)；連續失敗次數
+        self._mismatch: Dict[str, tuple] = {}
+        self._failures: Dict[str, int] = {venue: 0 for venue in fetchers}
+
+        # 由 HedgeBot 設定
+        self.on_correct: Optional[Callable[[str, Optional[Decimal], Decimal], None]] = None
+        self.on_drift: Optional[Callable[[Decimal], None]] = None
+        self.on_unknown: Optional[Callable[[str], None]] = None
+        self.expect_flat: Callable[[], bool] = lambda: False
+
+        self.polls = 0
+        self.corrections = 0
+        self.drifts = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ==================== 快照 ====================
+
+    def get(self, venue: str) -> PositionSnapshot:
+        return self.snapshots[venue]
+
+    def _update(self, venue: str, size: Optional[Decimal], source: str, error: Optional[str] = None) -> None:
+        prev = self.snapshots[venue]
+        version = prev.version + 1 if size != prev.size or prev.error != error else prev.version
+        self.snapshots[venue] = PositionSnapshot(venue, size, version, time.time(), source, error)
+
+    def apply_local(self, venue: str, size: Decimal, source: str = 'order') -> None:
+        """串流或下單結果帶來的新倉位 (比 REST 新，直接採用)"""
+        self._mismatch.pop(venue, None)
+        self._update(venue, size, source)
+
+    @property
+    def net_delta(self) -> Optional[Decimal]:
+        """兩邊倉位加總 (完全對沖時為 0)；任一邊未知時為 None"""
+        total = Decimal('0')
+        for snapshot in self.snapshots.values():
+            if snapshot.size is None:
+                return None
+            total += snapshot.size
+        return total
+
+    # ==================== 對帳 ====================
+
+    async def poll(self) -> None:
+        """並行查詢兩邊倉位並更新快照，之後檢查淨曝險"""
+        venues = list(self.fetchers)
+        versions = {venue: self.snapshots[venue].version for venue in venues}
+        results = await asyncio.gather(*(self.fetchers[venue]() for venue in venues), return_exceptions=True)
+        self.polls += 1
+        for venue, result in zip(venues, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                self._on_failure(venue, result)
+            elif self.snapshots[venue].version == versions[venue]:
+                self._on_result(venue, Decimal(str(result)))
+        self._check_drift()
+
+    def _on_failure(self, venue: str, error: Exception) -> None:
+        self._failures[venue] += 1
+        snapshot = self.snapshots[venue]
+        self.logger.warning(f"⚠️ {venue} 倉位查詢失敗 ({self._failures[venue]} 次): {error}")
+        if snapshot.known and self._failures[venue] >= self.unknown_after:
+            self.logger.error(f"❌ {venue} 倉位連續查詢失敗，標記為未知 (最後已知 {snapshot.size})")
+            self._update(venue, None, 'rest', str(error))
+            if self.on_unknown:
+                self.on_unknown(venue)
+
+    def _on_result(self, venue: str, size: Decimal) -> None:
+        self._failures[venue] = 0
+        snapshot = self.snapshots[venue]
+        if not snapshot.known:
+            # 首次查詢或由未知恢復：直接採用
+            self._mismatch.pop(venue, None)
+            self._update(venue, size, 'rest')
+            return
+        if size == snapshot.size:
+            self._mismatch.pop(venue, None)
+            self._update(venue, size, snapshot.source)
+            return
+        value, count = self._mismatch.get(venue, (None, 0))
+        count = count + 1 if value == size else 1
+        if count < self.confirmations:
+            self._mismatch[venue] = (size, count)
+            return
+        self._mismatch.pop(venue, None)
+        self.corrections += 1
+        self.logger.warning(f"⚠️ {venue} 倉位漂移: 快照 {snapshot.size} / REST {size}，以 REST 為準")
+        self._update(venue, size, 'rest')
+        if self.on_correct:
+            self.on_correct(venue, snapshot.size, size)
+
+    def _check_drift(self) -> None:
+        net = self.net_delta
+        if net is None or abs(net) <= self.tolerance or not self.expect_flat():
+            return
+        self.drifts += 1
+        sizes = ', '.join(f"{s.venue} {s.size}" for s in self.snapshots.values())
+        self.logger.error(f"🚨 殘留曝險 {net} ({sizes})")
+        if self.on_drift:
+            self.on_drift(net)
+
+    # ==================== 背景任務 ====================
+
+    def request_poll(self) -> None:
+        """提前觸發下一次對帳 (例如對沖下單後讀回 Paradex 倉位)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"❌ 倉位對帳錯誤: {e}")
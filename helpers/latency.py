@@ -0,0 +1,256 @@
+"""
+Latency instrumentation for the order lifecycle.
+
+Hot-path code records monotonic nanosecond durations per (stage, exchange) into HDR-style
+log-linear histograms (~1.6% relative error, constant memory, O(1) record). Results are
+exported as Prometheus text (serve_metrics) or as periodic JSON snapshots (write_snapshots).
+
+Stages recorded by this repo:
+    bbo            grvt     best bid/ask lookup (local book or REST)
+    sign           grvt     EIP-712 order signing
+    rest_post      grvt     REST request round trip (_auth_and_post)
+    order_ack      grvt     post-only order send -> exchange ack
+    fill_detect    grvt     fill event received -> seen by trading_loop
+    time_to_fill   grvt     open / close phase start -> GRVT position fully filled
+    submit         paradex  hedge decision -> Paradex order request sent
+    ack            paradex  Paradex order POST round trip
+    time_to_hedge  hedge    exposure opened by a GRVT fill -> closed by the Paradex ack
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# 2**7 sub-buckets per power of two: values are kept with 1/64 relative precision
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+# Values are clamped to 2**40 ns (~18 minutes)
+MAX_VALUE_BITS = 40
+BUCKET_SLOTS = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 2) * SUB_BUCKET_HALF
+MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+def _index(value: int) -> int:
+    bucket = value.bit_length() - SUB_BUCKET_BITS
+    if bucket <= 0:
+        return value
+    return bucket * SUB_BUCKET_HALF + (value >> bucket)
+
+
+def _value_at(index: int) -> int:
+    """Highest value that maps to the slot (so percentiles never under-report)."""
+    if index < SUB_BUCKET_COUNT:
+        return index
+    bucket = index // SUB_BUCKET_HALF - 1
+    sub = index - bucket * SUB_BUCKET_HALF
+    return ((sub + 1) << bucket) - 1
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations."""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_SLOTS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value_ns: int) -> None:
+        if value_ns < 0:
+            value_ns = 0
+        elif value_ns > MAX_VALUE:
+            value_ns = MAX_VALUE
+        self.counts[_index(value_ns)] += 1
+        if not self.count or value_ns < self.min:
+            self.min = value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+        self.count += 1
+        self.total += value_ns
+
+    def percentile(self, q: float) -> int:
+        """Value (ns) at quantile q in [0, 1]."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    return min(_value_at(index), self.max)
+        return self.max
+
+    def percentiles(self, qs=QUANTILES) -> Dict[float, int]:
+        """Several quantiles in one pass over the slots."""
+        result = {}
+        if not self.count:
+            return {q: 0 for q in qs}
+        targets = sorted((max(1, int(q * self.count + 0.5)), q) for q in qs)
+        seen = 0
+        i = 0
+        for index, n in enumerate(self.counts):
+            if not n:
+                continue
+            seen += n
+            while i < len(targets) and seen >= targets[i][0]:
+                result[targets[i][1]] = min(_value_at(index), self.max)
+                i += 1
+            if i == len(targets):
+                break
+        return result
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        if not other.count:
+            return
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.min = other.min if not self.count else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def reset(self) -> None:
+        self.counts = [0] * BUCKET_SLOTS
+        self.count = self.total = self.min = self.max = 0
+
+
+class LatencyRecorder:
+    """
+    Histograms keyed by (stage, exchange), plus open spans for durations that start and end
+    in different places (e.g. order sent in one method, ack handled in a callback).
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        self.clock = clock
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._spans: Dict[Tuple[str, str, object], int] = {}
+
+    def now(self) -> int:
+        return self.clock()
+
+    def record(self, stage: str, exchange: str, duration_ns: int) -> None:
+        histogram = self.histograms.get((stage, exchange))
+        if histogram is None:
+            histogram = self.histograms[(stage, exchange)] = LatencyHistogram()
+        histogram.record(duration_ns)
+
+    def record_since(self, stage: str, exchange: str, start_ns: int) -> int:
+        """Record clock() - start_ns and return it."""
+        duration = self.clock() - start_ns
+        self.record(stage, exchange, duration)
+        return duration
+
+    @contextmanager
+    def time(self, stage: str, exchange: str) -> Iterator[None]:
+        """with recorder.time('bbo', 'grvt'): ...  (also fine around awaits)"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(stage, exchange, self.clock() - start)
+
+    def start_span(self, stage: str, exchange: str, key: object = None, start_ns: Optional[int] = None) -> None:
+        """Open a span; a second start for the same key keeps the earlier timestamp."""
+        self._spans.setdefault((stage, exchange, key), self.clock() if start_ns is None else start_ns)
+
+    def end_span(self, stage: str, exchange: str, key: object = None) -> Optional[int]:
+        """Close a span and record its duration; returns None if it was never opened."""
+        start = self._spans.pop((stage, exchange, key), None)
+        if start is None:
+            return None
+        return self.record_since(stage, exchange, start)
+
+    def cancel_span(self, stage: str, exchange: str, key: object = None) -> None:
+        self._spans.pop((stage, exchange, key), None)
+
+    def get(self, stage: str, exchange: str) -> Optional[LatencyHistogram]:
+        return self.histograms.get((stage, exchange))
+
+    def reset(self) -> None:
+        self.histograms.clear()
+        self._spans.clear()
+
+    # ==================== Export ====================
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """{stage: {exchange: {count, mean_us, min_us, p50_us, ..., max_us}}}"""
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (stage, exchange), h in sorted(self.histograms.items()):
+            stats = {'count': h.count, 'mean_us': round(h.mean / 1e3, 1), 'min_us': round(h.min / 1e3, 1)}
+            for q, value in h.percentiles().items():
+                stats[f"p{q * 100:g}_us"] = round(value / 1e3, 1)
+            stats['max_us'] = round(h.max / 1e3, 1)
+            result.setdefault(stage, {})[exchange] = stats
+        return result
+
+    def prometheus_text(self, metric: str = 'hedge_latency_seconds') -> str:
+        """Prometheus text exposition (summary type, one series per stage/exchange)."""
+        lines = [f"# HELP {metric} Order lifecycle latency by stage and exchange.",
+                 f"# TYPE {metric} summary"]
+        for (stage, exchange), h in sorted(self.histograms.items()):
+            labels = f'stage="{stage}",exchange="{exchange}"'
+            for q, value in h.percentiles().items():
+                lines.append(f'{metric}{{{labels},quantile="{q:g}"}} {value / 1e9:.9f}')
+            lines.append(f"{metric}_sum{{{labels}}} {h.total / 1e9:.9f}")
+            lines.append(f"{metric}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide recorder shared by the exchange clients and the bots
+recorder = LatencyRecorder()
+
+
+async def serve_metrics(port: int, host: str = '0.0.0.0', latency: Optional[LatencyRecorder] = None):
+    """
+    Serve GET /metrics (Prometheus text) and GET /latency.json (snapshot) until cancelled.
+    Returns the aiohttp AppRunner; call `await runner.cleanup()` to stop.
+    """
+    from aiohttp import web
+
+    latency = latency or recorder
+
+    async def metrics(_request):
+        return web.Response(text=latency.prometheus_text(), content_type='text/plain', charset='utf-8')
+
+    async def snapshot(_request):
+        return web.json_response(latency.snapshot())
+
+    app = web.Application()
+    app.router.add_get('/metrics', metrics)
+    app.router.add_get('/latency.json', snapshot)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+async def write_snapshots(path: str, interval: float = 60.0, latency: Optional[LatencyRecorder] = None) -> None:
+    """Background task: atomically rewrite `path` with the JSON snapshot every `interval` seconds."""
+    latency = latency or recorder
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    while True:
+        await asyncio.sleep(interval)
+        data = {'time': time.time(), 'stages': latency.snapshot()}
+        await asyncio.to_thread(_write_json, path, data)
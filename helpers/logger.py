@@ -1,19 +1,229 @@
 """
 Trading logger with structured output and error handling.
+
+Callers on the event loop only enqueue: records go through a QueueHandler to one process-wide
+QueueListener thread that owns every file (activity logs, transaction CSVs, trade journals).
+Files stay open with buffered writes and are flushed every FLUSH_INTERVAL seconds, on
+ERROR records, and at shutdown (stop_logging(), also registered with atexit).
 """
 
 import os
 import csv
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from typing import Dict, List, Optional
 import pytz
 from decimal import Decimal
 
+FLUSH_INTERVAL = 1.0
+CSV_HEADER = ['Timestamp', 'OrderID', 'Side', 'Quantity', 'Price', 'Status']
+
+
+class TimeZoneFormatter(logging.Formatter):
+    def __init__(self, fmt=None, datefmt=None, tz=None):
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self.tz = tz
+
+    def formatTime(self, record, datefmt=None):
+        dt = datetime.fromtimestamp(record.created, tz=self.tz)
+        if datefmt:
+            return dt.strftime(datefmt)
+        return dt.isoformat()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing to the writer thread instead of flushing every record."""
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class TransactionWriter:
+    """Append-only CSV (and optional JSONL journal) kept open by the writer thread."""
+
+    def __init__(self, csv_path: str, journal_path: Optional[str], timezone):
+        self.csv_path = csv_path
+        self.journal_path = journal_path
+        self.timezone = timezone
+        self._csv_file = None
+        self._csv_writer = None
+        self._journal = None
+
+    def write(self, exchange: str, ticker: str, created: float, order_id: str, side: str,
+              quantity: Decimal, price: Decimal, status: str) -> None:
+        if self._csv_file is None:
+            new_file = not os.path.isfile(self.csv_path) or os.path.getsize(self.csv_path) == 0
+            self._csv_file = open(self.csv_path, 'a', newline='', encoding='utf-8', buffering=64 * 1024)
+            self._csv_writer = csv.writer(self._csv_file)
+            if new_file:
+                self._csv_writer.writerow(CSV_HEADER)
+        timestamp = datetime.fromtimestamp(created, tz=self.timezone).strftime("%Y-%m-%d %H:%M:%S")
+        self._csv_writer.writerow([timestamp, order_id, side, quantity, price, status])
+
+        if self.journal_path:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a', encoding='utf-8', buffering=64 * 1024)
+            self._journal.write(json.dumps({
+                'ts': round(created, 6), 'exchange': exchange, 'ticker': ticker, 'order_id': order_id,
+                'side': side, 'qty': str(quantity), 'price': str(price), 'status': status,
+            }, separators=(',', ':')) + '\n')
+
+    def flush(self) -> None:
+        for f in (self._csv_file, self._journal):
+            if f is not None:
+                f.flush()
+
+    def close(self) -> None:
+        self.flush()
+        for f in (self._csv_file, self._journal):
+            if f is not None:
+                f.close()
+        self._csv_file = self._csv_writer = self._journal = None
+
+
+class _LogListener(QueueListener):
+    """
+    Single writer thread. Log records are routed to the handlers registered for their logger
+    name; (TransactionWriter, args) tuples are transaction rows. Everything is flushed at least
+    every flush_interval seconds, including while the queue is idle.
+    """
+
+    def __init__(self, log_queue: queue.Queue, flush_interval: float = FLUSH_INTERVAL):
+        super().__init__(log_queue)
+        self.flush_interval = flush_interval
+        self.routes: Dict[str, List[logging.Handler]] = {}
+        self.writers: List[TransactionWriter] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.running = False
+
+    def start(self):
+        super().start()
+        self.running = True
+
+    def add_route(self, name: str, handlers: List[logging.Handler]) -> None:
+        with self._lock:
+            self.routes[name] = list(handlers)
+
+    def add_writer(self, writer: TransactionWriter) -> None:
+        with self._lock:
+            self.writers.append(writer)
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush()
+
+    def handle(self, item):
+        if isinstance(item, tuple):
+            writer, args = item
+            try:
+                writer.write(*args)
+            except Exception as e:
+                print(f"Failed to log transaction: {e}")
+        else:
+            for handler in self.routes.get(item.name, ()):
+                if item.levelno >= handler.level:
+                    handler.handle(item)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        with self._lock:
+            handlers = [h for hs in self.routes.values() for h in hs]
+            writers = list(self.writers)
+        for handler in handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        for writer in writers:
+            try:
+                writer.flush()
+            except Exception as e:
+                print(f"Failed to flush transaction log: {e}")
+
+    def stop(self):
+        super().stop()
+        self.running = False
+        self.flush()
+        with self._lock:
+            handlers = [h for hs in self.routes.values() for h in hs]
+            writers = list(self.writers)
+        for handler in handlers:
+            handler.close()
+        for writer in writers:
+            writer.close()
+
+
+class _QueueHandler(QueueHandler):
+    """
+    QueueHandler without the per-record copy and format: %-args are merged on the calling
+    thread (they may be mutated later), everything else is formatted by the writer thread.
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener = _LogListener(_queue)
+_listener_lock = threading.Lock()
+
+
+def _get_listener() -> _LogListener:
+    """The process-wide listener, (re)started on first use."""
+    if not _listener.running:
+        with _listener_lock:
+            if not _listener.running:
+                _listener.start()
+    return _listener
+
+
+def attach_queue_handlers(logger: logging.Logger, handlers: List[logging.Handler]) -> logging.Logger:
+    """
+    Route `logger` through the writer thread: `handlers` run there, the logger itself only gets
+    a QueueHandler. Use this for any logger written to from the event loop.
+    """
+    _get_listener().add_route(logger.name, handlers)
+    logger.addHandler(_QueueHandler(_queue))
+    return logger
+
+
+def stop_logging() -> None:
+    """Drain the queue, flush and close every file. Safe to call more than once."""
+    with _listener_lock:
+        if _listener.running:
+            _listener.stop()
+
+
+atexit.register(stop_logging)
+
 
 class TradingLogger:
     """Enhanced logging with structured output and error handling."""
 
-    def __init__(self, exchange: str, ticker: str, log_to_console: bool = False):
+    def __init__(self, exchange: str, ticker: str, log_to_console: bool = False,
+                 journal: Optional[bool] = None):
         self.exchange = exchange
         self.ticker = ticker
         # Ensure logs directory exists at the project root
@@ -23,17 +233,25 @@ class TradingLogger:
 
         order_file_name = f"{exchange}_{ticker}_orders.csv"
         debug_log_file_name = f"{exchange}_{ticker}_activity.log"
+        journal_file_name = f"{exchange}_{ticker}_trades.jsonl"
 
         account_name = os.getenv('ACCOUNT_NAME')
         if account_name:
             order_file_name = f"{exchange}_{ticker}_{account_name}_orders.csv"
             debug_log_file_name = f"{exchange}_{ticker}_{account_name}_activity.log"
+            journal_file_name = f"{exchange}_{ticker}_{account_name}_trades.jsonl"
+
+        # Optional JSONL trade journal next to the CSV (TRADE_JOURNAL=true)
+        if journal is None:
+            journal = os.getenv('TRADE_JOURNAL', 'false').strip().lower() == 'true'
 
         # Log file paths inside logs directory
         self.log_file = os.path.join(logs_dir, order_file_name)
         self.debug_log_file = os.path.join(logs_dir, debug_log_file_name)
+        self.journal_file = os.path.join(logs_dir, journal_file_name) if journal else None
         self.timezone = pytz.timezone(os.getenv('TIMEZONE', 'Asia/Shanghai'))
         self.logger = self._setup_logger(log_to_console)
+        self._transactions = self._setup_transactions()
 
     def _setup_logger(self, log_to_console: bool) -> logging.Logger:
         """Setup the logger with proper configuration."""
@@ -47,66 +265,53 @@ class TradingLogger:
         if logger.handlers:
             return logger
 
-        class TimeZoneFormatter(logging.Formatter):
-            def __init__(self, fmt=None, datefmt=None, tz=None):
-                super().__init__(fmt=fmt, datefmt=datefmt)
-                self.tz = tz
-
-            def formatTime(self, record, datefmt=None):
-                dt = datetime.fromtimestamp(record.created, tz=self.tz)
-                if datefmt:
-                    return dt.strftime(datefmt)
-                return dt.isoformat()
-
         formatter = TimeZoneFormatter(
             "%(asctime)s.%(msecs)03d - %(levelname)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
             tz=self.timezone
         )
 
-        # File handler
-        file_handler = logging.FileHandler(self.debug_log_file)
+        # File handler (runs on the writer thread)
+        file_handler = BufferedFileHandler(self.debug_log_file, delay=True)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers: List[logging.Handler] = [file_handler]
 
         # Console handler if requested
         if log_to_console:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
-        return logger
+        return attach_queue_handlers(logger, handlers)
+
+    def _setup_transactions(self) -> TransactionWriter:
+        # One writer per CSV path, shared by every TradingLogger for the same exchange/ticker
+        listener = _get_listener()
+        with listener._lock:
+            for writer in listener.writers:
+                if writer.csv_path == self.log_file:
+                    if writer.journal_path is None and self.journal_file:
+                        writer.journal_path = self.journal_file
+                    return writer
+        writer = TransactionWriter(self.log_file, self.journal_file, self.timezone)
+        listener.add_writer(writer)
+        return writer
 
     def log(self, message: str, level: str = "INFO"):
         """Log a message with the specified level."""
+        levelno = logging.getLevelName(level.upper())
+        if not isinstance(levelno, int):
+            levelno = logging.INFO
+        if not self.logger.isEnabledFor(levelno):
+            return
         formatted_message = f"[{self.exchange.upper()}_{self.ticker.upper()}] {message}"
-        if level.upper() == "DEBUG":
-            self.logger.debug(formatted_message)
-        elif level.upper() == "INFO":
-            self.logger.info(formatted_message)
-        elif level.upper() == "WARNING":
-            self.logger.warning(formatted_message)
-        elif level.upper() == "ERROR":
-            self.logger.error(formatted_message)
-        else:
-            self.logger.info(formatted_message)
+        self.logger.log(levelno, formatted_message)
 
     def log_transaction(self, order_id: str, side: str, quantity: Decimal, price: Decimal, status: str):
-        """Log a transaction to CSV file."""
-        try:
-            timestamp = datetime.now(self.timezone).strftime("%Y-%m-%d %H:%M:%S")
-            row = [timestamp, order_id, side, quantity, price, status]
-
-            # Check if file exists to write headers
-            file_exists = os.path.isfile(self.log_file)
-
-            with open(self.log_file, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                if not file_exists:
-                    writer.writerow(['Timestamp', 'OrderID', 'Side', 'Quantity', 'Price', 'Status'])
-                writer.writerow(row)
-
-        except Exception as e:
-            self.log(f"Failed to log transaction: {e}", "ERROR")
+        """Log a transaction to CSV file (and the trade journal, if enabled)."""
+        if not _listener.running:
+            _get_listener()
+        _queue.put_nowait((self._transactions, (self.exchange, self.ticker, time.time(),
+                                                order_id, side, quantity, price, status)))
@@ -0,0 +1,262 @@
+"""
+Async chat notification service (Telegram / Lark).
+
+notify() only appends to an in-memory queue and returns; a background task batches pending
+messages, coalesces the ones that share a key, and delivers them over one shared aiohttp
+session while respecting each channel's rate limit (including 429 retry-after).
+Trading code never waits on chat delivery.
+"""
+
+import asyncio
+import os
+import ssl
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import certifi
+
+TELEGRAM_BASE_URL = "https://api.telegram.org/bot"
+LARK_BASE_URL = "https://www.feishu.cn/flow/api/trigger-webhook/"
+
+BATCH_WINDOW = 2.0
+MAX_PENDING = 200
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 1.0
+CLOSE_TIMEOUT = 5.0
+REQUEST_TIMEOUT = 10
+
+
+class Notification(ABC):
+    """
+    A queued message. Messages with the same non-None key are coalesced while waiting:
+    merge() combines the pending one with a newer one (default: keep the newer).
+    """
+
+    key: Optional[str] = None
+
+    def merge(self, newer: 'Notification') -> 'Notification':
+        return newer
+
+    @abstractmethod
+    def format(self) -> str:
+        pass
+
+
+class TextNotification(Notification):
+    def __init__(self, text: str, key: Optional[str] = None):
+        self.text = text
+        self.key = key
+
+    def format(self) -> str:
+        return self.text
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"rate limited, retry after {retry_after}s")
+
+
+class Channel(ABC):
+    """A chat destination. send() raises RateLimited on 429 and any other exception on failure."""
+
+    name = "channel"
+    # Minimum seconds between two messages, and the longest message the API accepts
+    min_interval = 1.0
+    max_length = 4096
+
+    @abstractmethod
+    async def send(self, session: aiohttp.ClientSession, text: str) -> None:
+        pass
+
+
+class TelegramChannel(Channel):
+    name = "telegram"
+    min_interval = 1.0  # Telegram: about one message per second per chat
+    max_length = 4096
+
+    def __init__(self, token: str, chat_id: str, base_url: Optional[str] = None):
+        self.chat_id = chat_id
+        self.url = f"{(base_url or TELEGRAM_BASE_URL).rstrip('/')}{token}/sendMessage"
+
+    async def send(self, session: aiohttp.ClientSession, text: str) -> None:
+        async with session.post(self.url, json={"chat_id": self.chat_id, "text": text}) as response:
+            data = await response.json(content_type=None)
+            if response.status == 429:
+                retry_after = (data.get("parameters") or {}).get("retry_after") \
+                    or response.headers.get("Retry-After") or RETRY_DELAY
+                raise RateLimited(float(retry_after))
+            if response.status != 200 or not data.get("ok", False):
+                raise RuntimeError(f"Telegram send message failed: {data}")
+
+
+class LarkChannel(Channel):
+    name = "lark"
+    min_interval = 0.2
+    max_length = 15000
+
+    def __init__(self, token: str, base_url: Optional[str] = None):
+        self.url = f"{(base_url or LARK_BASE_URL).rstrip('/')}/{token}"
+
+    async def send(self, session: aiohttp.ClientSession, text: str) -> None:
+        payload = {"msg_type": "text", "content": {"text": text}}
+        async with session.post(self.url, json=payload) as response:
+            data = await response.json(content_type=None)
+            if response.status == 429:
+                raise RateLimited(float(response.headers.get("Retry-After") or RETRY_DELAY))
+            if response.status != 200 or data.get("code", 0) != 0:
+                raise RuntimeError(f"Lark send message failed: {data}")
+
+
+def channels_from_env() -> List[Channel]:
+    """Telegram when TG_ENABLED=true with TG_BOT_TOKEN / TG_CHAT_ID; Lark when LARK_TOKEN is set."""
+    channels: List[Channel] = []
+    token, chat_id = os.getenv("TG_BOT_TOKEN"), os.getenv("TG_CHAT_ID")
+    if os.getenv("TG_ENABLED", "False").strip().lower() == "true" and token and chat_id:
+        channels.append(TelegramChannel(token.strip(), chat_id.strip()))
+    lark_token = os.getenv("LARK_TOKEN")
+    if lark_token:
+        channels.append(LarkChannel(lark_token.strip()))
+    return channels
+
+
+class Notifier:
+    """Background notification queue shared by every reporter in the process."""
+
+    def __init__(self, channels: Optional[List[Channel]] = None, batch_window: float = BATCH_WINDOW,
+                 max_pending: int = MAX_PENDING, session: Optional[aiohttp.ClientSession] = None):
+        self.channels = list(channels or [])
+        self.batch_window = batch_window
+        self.max_pending = max_pending
+        self._session = session
+        self._owns_session = session is None
+        self._pending: List[Notification] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Task] = None
+        self._next_send: Dict[str, float] = {}
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'Notifier':
+        return cls(channels_from_env(), **kwargs)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.channels)
+
+    def notify(self, message: Any, key: Optional[str] = None) -> None:
+        """Queue a message (str or Notification). Never blocks; must be called on the event loop."""
+        if not self.channels:
+            return
+        if not isinstance(message, Notification):
+            message = TextNotification(str(message), key)
+        if message.key is not None:
+            for i, pending in enumerate(self._pending):
+                if pending.key == message.key:
+                    self._pending[i] = pending.merge(message)
+                    self.coalesced += 1
+                    break
+            else:
+                self._pending.append(message)
+        else:
+            self._pending.append(message)
+        if len(self._pending) > self.max_pending:
+            self._pending.pop(0)
+            self.dropped += 1
+
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            ssl_context = ssl.create_default_context(cafile=certifi.where())
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, ssl=ssl_context, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                trust_env=True,
+            )
+            self._owns_session = True
+        return self._session
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Let messages arriving close together go out as one batch
+            await asyncio.sleep(self.batch_window)
+            self._wakeup.clear()
+            # Shielded so close() can cancel the worker without losing a batch in flight
+            self._flushing = asyncio.get_running_loop().create_task(self._flush())
+            await asyncio.shield(self._flushing)
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        texts = [message.format() for message in batch]
+        for channel in self.channels:
+            for chunk in _pack(texts, channel.max_length):
+                await self._deliver(channel, chunk)
+
+    async def _deliver(self, channel: Channel, text: str) -> None:
+        loop = asyncio.get_running_loop()
+        for attempt in range(MAX_ATTEMPTS):
+            wait = self._next_send.get(channel.name, 0.0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_send[channel.name] = loop.time() + channel.min_interval
+            try:
+                await channel.send(self._get_session(), text)
+                self.sent += 1
+                return
+            except RateLimited as e:
+                self._next_send[channel.name] = loop.time() + e.retry_after
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    break
+                print(f"{channel.name} notify failed (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+        self.failed += 1
+        print(f"{channel.name} notify dropped after {MAX_ATTEMPTS} attempts")
+
+    async def close(self, timeout: float = CLOSE_TIMEOUT) -> None:
+        """Deliver what is still pending (bounded by timeout), then stop and close the session."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        async def drain():
+            if self._flushing is not None:
+                await self._flushing
+            await self._flush()
+
+        try:
+            await asyncio.wait_for(drain(), timeout)
+        except asyncio.TimeoutError:
+            print("notify: pending messages not delivered before shutdown")
+        if self._session is not None and self._owns_session and not self._session.closed:
+            await self._session.close()
+
+
+def _pack(texts: List[str], max_length: int, separator: str = "\n\n") -> List[str]:
+    """Join texts into as few messages as possible, each at most max_length characters."""
+    chunks: List[str] = []
+    current = ""
+    for text in texts:
+        text = text[:max_length]
+        if current and len(current) + len(separator) + len(text) > max_length:
+            chunks.append(current)
+            current = text
+        else:
+            current = f"{current}{separator}{text}" if current else text
+    if current:
+        chunks.append(current)
+    return chunks
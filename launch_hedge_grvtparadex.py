@@ -2,6 +2,7 @@ import argparse
 import asyncio
 from decimal import Decimal
 from hedge.hedge_mode_grvtparadex import HedgeBot
+from helpers.latency import serve_metrics, write_snapshots
 
 async def main():
     parser = argparse.ArgumentParser(description="Launch GRVT/Paradex Hedge Bot")
@@ -12,6 +13,32 @@ async def main():
     parser.add_argument("--start-side", type=str, default="buy", help="Initial side (buy/sell)")
     # 新增此參數以接收指令列的輸入，預設 60 秒
     parser.add_argument("--holding-time", type=int, default=60, help="Holding time in seconds")
+    parser.add_argument("--chase-interval", type=float, default=2.0,
+                        help="Max seconds between chase re-quotes when no fill arrives")
+    parser.add_argument("--quoting", type=str, default="adaptive", choices=["adaptive", "fixed"],
+                        help="adaptive: re-quote on book updates only when needed; fixed: re-quote every chase interval")
+    parser.add_argument("--taker-deadline", type=float, default=None,
+                        help="Adaptive quoting: seconds before crossing the spread with an IOC order (default: never)")
+    parser.add_argument("--hedge-mode", type=str, default="full", choices=["full", "incremental"],
+                        help="full: hedge after the GRVT order is fully filled; incremental: hedge every fill")
+    parser.add_argument("--hedge-window", type=float, default=0.2,
+                        help="Incremental mode: seconds to coalesce GRVT fills before hedging")
+    parser.add_argument("--min-hedge-size", type=str, default="0",
+                        help="Incremental mode: minimum coalesced size to send a Paradex order")
+    parser.add_argument("--journal", type=str, default=None,
+                        help="State journal path (default: logs/hedge_<TICKER>_journal.jsonl)")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Do not keep a crash-safe state journal (no warm restart)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore the existing journal and start again from round 1")
+    parser.add_argument("--reconcile-interval", type=float, default=5.0,
+                        help="Seconds between REST position reconciliations of both venues")
+    parser.add_argument("--drift-action", type=str, default="correct", choices=["correct", "raise", "alert"],
+                        help="Residual exposure found by reconciliation: hedge it, stop with an error, or only alert")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve latency histograms on http://0.0.0.0:PORT/metrics (Prometheus) and /latency.json")
+    parser.add_argument("--latency-snapshot", type=str, default=None,
+                        help="Write a latency JSON snapshot to this path every minute")
 
     args = parser.parse_args()
 
@@ -25,10 +52,29 @@ async def main():
         fill_timeout=args.fill_timeout,
         iterations=args.iter,
         start_side=args.start_side,
-        holding_time=args.holding_time  # 傳遞持倉時間
+        holding_time=args.holding_time,  # 傳遞持倉時間
+        hedge_mode=args.hedge_mode,
+        hedge_window=args.hedge_window,
+        min_hedge_size=Decimal(args.min_hedge_size),
+        chase_interval=args.chase_interval,
+        quoting=args.quoting,
+        taker_deadline=args.taker_deadline,
+        journal_path=args.journal,
+        journal=not args.no_journal,
+        resume=not args.no_resume,
+        reconcile_interval=args.reconcile_interval,
+        drift_action=args.drift_action
     )
 
-    await bot.run()
+    metrics = await serve_metrics(args.metrics_port) if args.metrics_port else None
+    snapshots = asyncio.create_task(write_snapshots(args.latency_snapshot)) if args.latency_snapshot else None
+    try:
+        await bot.run()
+    finally:
+        if snapshots:
+            snapshots.cancel()
+        if metrics:
+            await metrics.cleanup()
 
 if __name__ == "__main__":
     try:
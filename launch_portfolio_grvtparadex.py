@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+from decimal import Decimal
+from hedge.portfolio_runner import PortfolioRunner
+from helpers.latency import serve_metrics, write_snapshots
+
+async def main():
+    parser = argparse.ArgumentParser(description="Launch GRVT/Paradex Hedge Bots for several tickers in one process")
+    parser.add_argument("--tickers", type=str, required=True, help="Comma separated tickers (e.g., BTC,ETH,SOL)")
+    parser.add_argument("--size", type=str, required=True,
+                        help="Order quantity, one value for all tickers or comma separated per ticker")
+    parser.add_argument("--iter", type=int, default=10, help="Number of iterations")
+    parser.add_argument("--fill-timeout", type=int, default=10, help="Fill timeout")
+    parser.add_argument("--start-side", type=str, default="buy", help="Initial side (buy/sell)")
+    parser.add_argument("--holding-time", type=int, default=60, help="Holding time in seconds")
+    parser.add_argument("--chase-interval", type=float, default=2.0,
+                        help="Max seconds between chase re-quotes when no fill arrives")
+    parser.add_argument("--quoting", type=str, default="adaptive", choices=["adaptive", "fixed"],
+                        help="adaptive: re-quote on book updates only when needed; fixed: re-quote every chase interval")
+    parser.add_argument("--taker-deadline", type=float, default=None,
+                        help="Adaptive quoting: seconds before crossing the spread with an IOC order (default: never)")
+    parser.add_argument("--hedge-mode", type=str, default="full", choices=["full", "incremental"],
+                        help="full: hedge after the GRVT order is fully filled; incremental: hedge every fill")
+    parser.add_argument("--hedge-window", type=float, default=0.2,
+                        help="Incremental mode: seconds to coalesce GRVT fills before hedging")
+    parser.add_argument("--min-hedge-size", type=str, default="0",
+                        help="Incremental mode: minimum coalesced size to send a Paradex order")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Do not keep a crash-safe state journal (no warm restart)")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore the existing journal and start again from round 1")
+    parser.add_argument("--reconcile-interval", type=float, default=5.0,
+                        help="Seconds between REST position reconciliations of both venues")
+    parser.add_argument("--drift-action", type=str, default="correct", choices=["correct", "raise", "alert"],
+                        help="Residual exposure found by reconciliation: hedge it, stop with an error, or only alert")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve latency histograms on http://0.0.0.0:PORT/metrics (Prometheus) and /latency.json")
+    parser.add_argument("--latency-snapshot", type=str, default=None,
+                        help="Write a latency JSON snapshot to this path every minute")
+
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    sizes = [Decimal(s) for s in args.size.split(",")]
+    if len(sizes) == 1:
+        sizes = sizes * len(tickers)
+    if len(sizes) != len(tickers):
+        parser.error("--size must be one value or one value per ticker")
+
+    print(f"Starting GRVT/Paradex Portfolio Hedge Mode: {dict(zip(tickers, map(str, sizes)))}, "
+          f"Side: {args.start_side}, Holding: {args.holding_time}s")
+    print("-" * 50)
+
+    runner = PortfolioRunner(
+        tickers=dict(zip(tickers, sizes)),
+        fill_timeout=args.fill_timeout,
+        iterations=args.iter,
+        start_side=args.start_side,
+        holding_time=args.holding_time,
+        hedge_mode=args.hedge_mode,
+        hedge_window=args.hedge_window,
+        min_hedge_size=Decimal(args.min_hedge_size),
+        chase_interval=args.chase_interval,
+        quoting=args.quoting,
+        taker_deadline=args.taker_deadline,
+        journal=not args.no_journal,
+        resume=not args.no_resume,
+        reconcile_interval=args.reconcile_interval,
+        drift_action=args.drift_action
+    )
+
+    metrics = await serve_metrics(args.metrics_port) if args.metrics_port else None
+    snapshots = asyncio.create_task(write_snapshots(args.latency_snapshot)) if args.latency_snapshot else None
+    try:
+        await runner.run()
+    finally:
+        if snapshots:
+            snapshots.cancel()
+        if metrics:
+            await metrics.cleanup()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nStopping bots...")
@@ -0,0 +1,35 @@
+"""
+Market-data recording: chunked columnar .gpmd files, a memory-mapped reader and the WebSocket recorder.
+"""
+
+from .format import (
+    KIND_BBO,
+    KIND_BOOK_DELTA,
+    KIND_BOOK_SNAPSHOT,
+    KIND_TRADE,
+    PRICE_SCALE,
+    SIDE_ASK,
+    SIDE_BID,
+    ChunkBuffer,
+    MarketDataReader,
+    MarketDataWriter,
+    from_fixed,
+    to_fixed,
+)
+from .recorder import MarketDataRecorder
+
+__all__ = [
+    'KIND_BBO',
+    'KIND_BOOK_DELTA',
+    'KIND_BOOK_SNAPSHOT',
+    'KIND_TRADE',
+    'PRICE_SCALE',
+    'SIDE_ASK',
+    'SIDE_BID',
+    'ChunkBuffer',
+    'MarketDataReader',
+    'MarketDataWriter',
+    'from_fixed',
+    'to_fixed',
+    'MarketDataRecorder',
+]
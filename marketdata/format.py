@@ -0,0 +1,334 @@
+"""
+Append-only, chunked columnar market-data file (.gpmd).
+
+File layout:
+    FILE_MAGIC (8 bytes)
+    chunk*  where each chunk is
+        CHUNK_HEADER  magic, codec, symbol count, row count, first/last ts, payload length, crc32
+        symbol table  (u16 length + utf-8 name) per symbol, ids are local to the chunk
+        padding       to an 8-byte file offset, so raw columns can be cast in place from an mmap
+        payload       columns ts, seq, price, size (int64) and info (int32), each contiguous,
+                      zlib-compressed as a whole unless codec is raw
+
+Prices and sizes are fixed-point int64 with 9 decimals (PRICE_SCALE). The info column packs
+    instrument id << 16 | kind << 8 | side << 1 | first-row-of-message flag
+so one exchange message (a book snapshot or delta with many levels) spans several rows.
+A message without any level (e.g. an empty snapshot) is stored as one row with size -1.
+A GRVT book message's prev_sequence_number is kept as received in the seq column of an extra,
+non-first row with size -2 (older files lack it; readers then fall back to the previous seq).
+
+Chunks are only ever appended whole; a crash can leave at most a truncated last chunk,
+which readers detect (length / crc32) and ignore. The chunk headers double as the time
+index: readers hop header to header without touching payloads.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+FILE_MAGIC = b'GPMD\x00\x01\x00\x00'
+CHUNK_MAGIC = b'MDCK'
+CHUNK_HEADER = struct.Struct('<4sBxHIqqII')
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODECS = {'raw': CODEC_RAW, 'zlib': CODEC_ZLIB}
+
+PRICE_SCALE = 10 ** 9
+
+KIND_BOOK_SNAPSHOT = 1
+KIND_BOOK_DELTA = 2
+KIND_TRADE = 3
+KIND_BBO = 4
+
+SIDE_BID = 0  # also buy / taker buyer for trades
+SIDE_ASK = 1
+
+# size column markers: a message without levels, and the row carrying prev_sequence_number
+SIZE_NO_LEVELS = -1
+SIZE_PREV_SEQ = -2
+
+_COLUMNS = (('ts', 'q'), ('seq', 'q'), ('price', 'q'), ('size', 'q'), ('info', 'i'))
+
+if sys.byteorder != 'little':  # columns are stored little-endian and cast in place
+    raise ImportError("marketdata.format requires a little-endian platform")
+
+
+def to_fixed(value: Any) -> int:
+    """'60123.45' / Decimal / int -> fixed-point int64."""
+    return int(Decimal(str(value)) * PRICE_SCALE)
+
+
+def from_fixed(value: int) -> str:
+    """Fixed-point int64 -> plain decimal string ('60123.45')."""
+    whole, frac = divmod(value, PRICE_SCALE)
+    if not frac:
+        return str(whole)
+    return f"{whole}.{frac:09d}".rstrip('0')
+
+
+def pack_info(instrument_id: int, kind: int, side: int, first: bool) -> int:
+    return instrument_id << 16 | kind << 8 | side << 1 | int(first)
+
+
+def unpack_info(info: int) -> Tuple[int, int, int, bool]:
+    """-> (instrument_id, kind, side, first_row_of_message)"""
+    return info >> 16, (info >> 8) & 0xFF, (info >> 1) & 0x1, bool(info & 1)
+
+
+class ChunkBuffer:
+    """Rows accumulated in memory until they are written as one chunk."""
+
+    def __init__(self):
+        self.columns: Dict[str, array] = {name: array(code) for name, code in _COLUMNS}
+        self.symbols: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns['ts'])
+
+    def symbol_id(self, name: str) -> int:
+        symbol_id = self.symbols.get(name)
+        if symbol_id is None:
+            symbol_id = self.symbols[name] = len(self.symbols)
+        return symbol_id
+
+    def append(self, ts: int, seq: int, price: int, size: int, info: int) -> None:
+        c = self.columns
+        c['ts'].append(ts)
+        c['seq'].append(seq)
+        c['price'].append(price)
+        c['size'].append(size)
+        c['info'].append(info)
+
+
+def append_message(buffer: ChunkBuffer, instrument: str, kind: int, ts: int, seq: int,
+                   levels: Iterable[tuple], prev_seq: Optional[int] = None) -> None:
+    """Append one exchange message as rows. levels: (side, price, size) with price/size as exchange strings."""
+    symbol_id = buffer.symbol_id(instrument)
+    first = True
+    for side, price, size in levels:
+        buffer.append(ts, seq, to_fixed(price), to_fixed(size), pack_info(symbol_id, kind, side, first))
+        first = False
+    if first:
+        buffer.append(ts, seq, 0, SIZE_NO_LEVELS, pack_info(symbol_id, kind, SIDE_BID, True))
+    if prev_seq is not None:
+        buffer.append(ts, prev_seq, 0, SIZE_PREV_SEQ, pack_info(symbol_id, kind, SIDE_BID, False))
+
+
+def encode_chunk(buffer: ChunkBuffer, codec: int, offset: int, level: int = 6) -> bytes:
+    """Serialise a chunk that will start at file `offset`."""
+    ts = buffer.columns['ts']
+    symbols = b''.join(struct.pack('<H', len(name.encode())) + name.encode() for name in buffer.symbols)
+    raw = b''.join(buffer.columns[name].tobytes() for name, _ in _COLUMNS)
+    payload = zlib.compress(raw, level) if codec == CODEC_ZLIB else raw
+    header = CHUNK_HEADER.pack(CHUNK_MAGIC, codec, len(buffer.symbols), len(ts), min(ts), max(ts),
+                               len(payload), zlib.crc32(payload))
+    pad = -(offset + len(header) + len(symbols)) % 8
+    return header + symbols + b'\x00' * pad + payload
+
+
+class MarketDataWriter:
+    """Appends chunks to a .gpmd file (creating it with the file magic if needed)."""
+
+    def __init__(self, path: str, codec: str = 'zlib', level: int = 6, fsync: bool = False):
+        self.path = path
+        self.codec = CODECS[codec]
+        self.level = level
+        self.fsync = fsync
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(FILE_MAGIC)
+        self.bytes_written = 0
+
+    def write_chunk(self, buffer: ChunkBuffer) -> int:
+        """Write one chunk and return its size in bytes."""
+        if not len(buffer):
+            return 0
+        data = encode_chunk(buffer, self.codec, self._file.tell(), self.level)
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.bytes_written += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ChunkInfo(NamedTuple):
+    offset: int
+    codec: int
+    rows: int
+    first_ts: int
+    last_ts: int
+    symbols: Tuple[str, ...]
+    payload_offset: int
+    payload_len: int
+    crc32: int
+
+
+class Chunk:
+    """Decoded columns of one chunk (zero-copy memoryviews over the mmap for raw chunks)."""
+
+    def __init__(self, info: ChunkInfo, payload: memoryview):
+        self.info = info
+        self.symbols = info.symbols
+        if info.codec == CODEC_ZLIB:
+            payload = memoryview(zlib.decompress(payload))
+        n = info.rows
+        pos = 0
+        columns = {}
+        for name, code in _COLUMNS:
+            width = 8 if code == 'q' else 4
+            columns[name] = payload[pos:pos + n * width].cast(code)
+            pos += n * width
+        self.ts = columns['ts']
+        self.seq = columns['seq']
+        self.price = columns['price']
+        self.size = columns['size']
+        self.info_column = columns['info']
+
+    def __len__(self) -> int:
+        return self.info.rows
+
+    def rows(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        """(ts, seq, price, size, info) tuples."""
+        return zip(self.ts, self.seq, self.price, self.size, self.info_column)
+
+
+class MarketDataReader:
+    """
+    Memory-mapped reader. The chunk index is built from the chunk headers on open;
+    a truncated or corrupt trailing chunk (from a crash while writing) is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._mm) if self._mm is not None else memoryview(b'')
+        if size and bytes(self._view[:len(FILE_MAGIC)]) != FILE_MAGIC:
+            raise ValueError(f"{path} is not a market-data file")
+        self.chunks: List[ChunkInfo] = self._build_index()
+        # Running max of last_ts, so time lookups can bisect even if venues interleave slightly
+        self._max_last_ts: List[int] = []
+        running = -(2 ** 63)
+        for chunk in self.chunks:
+            running = max(running, chunk.last_ts)
+            self._max_last_ts.append(running)
+
+    def _build_index(self) -> List[ChunkInfo]:
+        view = self._view
+        chunks: List[ChunkInfo] = []
+        pos = len(FILE_MAGIC)
+        end = len(view)
+        while pos + CHUNK_HEADER.size <= end:
+            magic, codec, n_symbols, rows, first_ts, last_ts, payload_len, crc = \
+                CHUNK_HEADER.unpack_from(view, pos)
+            if magic != CHUNK_MAGIC:
+                break
+            cursor = pos + CHUNK_HEADER.size
+            symbols = []
+            for _ in range(n_symbols):
+                if cursor + 2 > end:
+                    return chunks
+                (length,) = struct.unpack_from('<H', view, cursor)
+                symbols.append(bytes(view[cursor + 2:cursor + 2 + length]).decode())
+                cursor += 2 + length
+            cursor += -cursor % 8
+            if cursor + payload_len > end:
+                break
+            chunks.append(ChunkInfo(pos, codec, rows, first_ts, last_ts, tuple(symbols),
+                                    cursor, payload_len, crc))
+            pos = cursor + payload_len
+        # Only the last chunk can be torn by a crash; verify it fully
+        if chunks:
+            last = chunks[-1]
+            if zlib.crc32(view[last.payload_offset:last.payload_offset + last.payload_len]) != last.crc32:
+                chunks.pop()
+        return chunks
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def rows(self) -> int:
+        return sum(chunk.rows for chunk in self.chunks)
+
+    def read_chunk(self, info: ChunkInfo, verify: bool = False) -> Chunk:
+        payload = self._view[info.payload_offset:info.payload_offset + info.payload_len]
+        if verify and zlib.crc32(payload) != info.crc32:
+            raise ValueError(f"crc mismatch in chunk at offset {info.offset}")
+        return Chunk(info, payload)
+
+    def iter_chunks(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> Iterator[Chunk]:
+        """Chunks that may contain rows in [start_ns, end_ns]."""
+        first = bisect_left(self._max_last_ts, start_ns) if start_ns is not None else 0
+        for info in self.chunks[first:]:
+            if end_ns is not None and info.first_ts > end_ns:
+                break
+            yield self.read_chunk(info)
+
+    def iter_rows(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+                  ) -> Iterator[Tuple[str, int, int, int, int, int, int, bool]]:
+        """(instrument, ts, seq, kind, side, price, size, first_row_of_message) in file order."""
+        for chunk in self.iter_chunks(start_ns, end_ns):
+            symbols = chunk.symbols
+            for ts, seq, price, size, info in chunk.rows():
+                if (start_ns is not None and ts < start_ns) or (end_ns is not None and ts > end_ns):
+                    continue
+                instrument_id, kind, side, first = unpack_info(info)
+                yield symbols[instrument_id], ts, seq, kind, side, price, size, first
+
+    def book_messages(self, instrument: str, start_ns: Optional[int] = None,
+                      end_ns: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Rebuild GRVT-style book.s / book.d WebSocket messages for `instrument`
+        (e.g. 'grvt:BTC_USDT_Perp'), so LocalOrderBook and the simulator can replay them.
+        prev_sequence_number is the recorded one, so gaps in the recording show up on replay.
+        """
+        name = instrument.split(':', 1)[-1]
+        message = None
+        prev_seq = 0
+        for symbol, ts, seq, kind, side, price, size, first in self.iter_rows(start_ns, end_ns):
+            if symbol != instrument or kind not in (KIND_BOOK_SNAPSHOT, KIND_BOOK_DELTA):
+                continue
+            if first:
+                if message is not None:
+                    yield message
+                is_snapshot = kind == KIND_BOOK_SNAPSHOT
+                message = {
+                    'stream': 'v1.book.s' if is_snapshot else 'v1.book.d',
+                    'sequence_number': str(seq),
+                    # Replaced by the recorded value; older files only have the previous seq
+                    'prev_sequence_number': '0' if is_snapshot else str(prev_seq),
+                    'feed': {'instrument': name, 'event_time': str(ts), 'bids': [], 'asks': []},
+                }
+                prev_seq = seq
+            if message is None:
+                continue
+            if size == SIZE_PREV_SEQ:
+                message['prev_sequence_number'] = str(seq)
+            elif size >= 0:
+                level = {'price': from_fixed(price), 'size': from_fixed(size), 'num_orders': 0}
+                message['feed']['asks' if side == SIDE_ASK else 'bids'].append(level)
+        if message is not None:
+            yield message
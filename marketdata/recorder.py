@@ -0,0 +1,286 @@
+"""
+Market-data recorder: GRVT (book.d, trade, mini.s) and Paradex (order book, trades, BBO)
+WebSocket events written to daily .gpmd files.
+
+    python -m marketdata.recorder --tickers BTC,ETH --out data/marketdata
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from .format import (
+    KIND_BBO,
+    KIND_BOOK_DELTA,
+    KIND_BOOK_SNAPSHOT,
+    KIND_TRADE,
+    SIDE_ASK,
+    SIDE_BID,
+    ChunkBuffer,
+    MarketDataWriter,
+    append_message,
+)
+
+CHUNK_ROWS = 65536
+FLUSH_INTERVAL = 5.0
+GRVT_BOOK_RATE_MS = 50
+
+
+def grvt_book_kind(message: Dict[str, Any]) -> int:
+    """
+    book.s, or a book.d message with sequence_number 0 (the snapshot that opens a book.d
+    subscription; deltas are numbered from 1) -> KIND_BOOK_SNAPSHOT, else KIND_BOOK_DELTA.
+    """
+    if message.get('stream', '').endswith('book.s') or not int(message.get('sequence_number') or 0):
+        return KIND_BOOK_SNAPSHOT
+    return KIND_BOOK_DELTA
+
+
+def append_grvt_book(buffer: ChunkBuffer, instrument: str, message: Dict[str, Any], ts: int) -> None:
+    """Append one GRVT book.s / book.d message, with its prev_sequence_number as received."""
+    feed = message.get('feed', {})
+    levels = [(SIDE_BID, lv['price'], lv['size']) for lv in feed.get('bids', [])]
+    levels += [(SIDE_ASK, lv['price'], lv['size']) for lv in feed.get('asks', [])]
+    append_message(buffer, instrument, grvt_book_kind(message), ts, int(message.get('sequence_number') or 0),
+                   levels, int(message.get('prev_sequence_number') or 0))
+
+
+class MarketDataRecorder:
+    """
+    Buffers rows per chunk and appends them to {out_dir}/md_{YYYYMMDD}.gpmd (UTC day of the event).
+    A chunk is written when it reaches chunk_rows or every flush_interval seconds; compression
+    and the write run in a worker thread so the WebSocket readers are never blocked.
+
+    Instruments are recorded as 'grvt:BTC_USDT_Perp' / 'paradex:BTC-USD-PERP'.
+    """
+
+    def __init__(self, out_dir: str, chunk_rows: int = CHUNK_ROWS, flush_interval: float = FLUSH_INTERVAL,
+                 codec: str = 'zlib', logger: Optional[logging.Logger] = None):
+        self.out_dir = out_dir
+        self.chunk_rows = chunk_rows
+        self.flush_interval = flush_interval
+        self.codec = codec
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._buffer = ChunkBuffer()
+        self._day: Optional[str] = None
+        self._writer: Optional[MarketDataWriter] = None
+        self._write_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._pending: List[asyncio.Task] = []
+
+        self.messages = 0
+        self.rows = 0
+
+    # ==================== Lifecycle ====================
+
+    async def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write the current buffer as one chunk."""
+        buffer, self._buffer = self._buffer, ChunkBuffer()
+        if not len(buffer):
+            return
+        # Shielded: cancelling the flush loop must not drop a buffer already taken off the recorder
+        await asyncio.shield(self._schedule_write(self._day, buffer))
+
+    def _writer_for(self, day: str) -> MarketDataWriter:
+        if self._writer is None or not self._writer.path.endswith(f"md_{day}.gpmd"):
+            if self._writer is not None:
+                self._writer.close()
+            path = os.path.join(self.out_dir, f"md_{day}.gpmd")
+            self._writer = MarketDataWriter(path, codec=self.codec)
+            self.logger.info(f"market data -> {path}")
+        return self._writer
+
+    # ==================== Row buffering ====================
+
+    def _begin(self, ts: int) -> None:
+        """Switch files at UTC midnight: the previous day's rows are flushed to their own file."""
+        day = datetime.fromtimestamp(ts / 1e9, tz=timezone.utc).strftime('%Y%m%d')
+        if self._day is None:
+            self._day = day
+        elif day != self._day:
+            buffer, self._buffer = self._buffer, ChunkBuffer()
+            previous_day, self._day = self._day, day
+            if len(buffer):
+                self._schedule_write(previous_day, buffer)
+
+    def _schedule_write(self, day: str, buffer: ChunkBuffer) -> asyncio.Task:
+        async def write():
+            async with self._write_lock:
+                try:
+                    await asyncio.to_thread(self._writer_for(day).write_chunk, buffer)
+                except Exception as e:
+                    self.logger.error(f"failed to write {len(buffer)} market-data rows: {e}")
+        task = asyncio.create_task(write())
+        self._pending.append(task)
+        task.add_done_callback(self._pending.remove)
+        return task
+
+    def _add_levels(self, instrument: str, kind: int, ts: int, seq: int,
+                    levels: Iterable[tuple]) -> None:
+        """levels: (side, price, size) with price/size as exchange strings."""
+        self._begin(ts)
+        start = len(self._buffer)
+        append_message(self._buffer, instrument, kind, ts, seq, levels)
+        self._added(start)
+
+    def _added(self, start: int) -> None:
+        """Count the message appended after row `start`; hand the buffer off once it is full."""
+        buffer = self._buffer
+        self.messages += 1
+        self.rows += len(buffer) - start
+        if len(buffer) >= self.chunk_rows:
+            self._buffer = ChunkBuffer()
+            self._schedule_write(self._day, buffer)
+
+    # ==================== GRVT ====================
+
+    async def on_grvt_message(self, message: Dict[str, Any]) -> None:
+        """GrvtCcxtWS callback for book.s / book.d / trade / mini.s."""
+        stream = message.get('stream', '')
+        feed = message.get('feed', {})
+        instrument = f"grvt:{feed.get('instrument', '')}"
+        ts = int(feed.get('event_time') or time.time_ns())
+        seq = int(message.get('sequence_number') or 0)
+
+        if 'book' in stream:
+            self._begin(ts)
+            start = len(self._buffer)
+            append_grvt_book(self._buffer, instrument, message, ts)
+            self._added(start)
+        elif stream.endswith('trade'):
+            side = SIDE_BID if feed.get('is_taker_buyer') else SIDE_ASK
+            self._add_levels(instrument, KIND_TRADE, ts, seq, [(side, feed['price'], feed['size'])])
+        elif 'mini' in stream:
+            self._add_levels(instrument, KIND_BBO, ts, seq, [
+                (SIDE_BID, feed.get('best_bid_price') or 0, feed.get('best_bid_size') or 0),
+                (SIDE_ASK, feed.get('best_ask_price') or 0, feed.get('best_ask_size') or 0),
+            ])
+
+    async def subscribe_grvt(self, ws_client, instruments: Iterable[str],
+                             book_rate_ms: int = GRVT_BOOK_RATE_MS) -> None:
+        """Subscribe an initialized GrvtCcxtWS to book.d, trade and mini.s for each instrument."""
+        from pysdk.grvt_ccxt_env import GrvtWSEndpointType
+
+        for instrument in instruments:
+            for stream, params in (
+                ("book.d", {"instrument": instrument, "rate": book_rate_ms}),
+                ("trade", {"instrument": instrument}),
+                ("mini.s", {"instrument": instrument}),
+            ):
+                await ws_client.subscribe(stream=stream, callback=self.on_grvt_message,
+                                          ws_end_point_type=GrvtWSEndpointType.MARKET_DATA_RPC_FULL,
+                                          params=params)
+
+    # ==================== Paradex ====================
+
+    async def on_paradex_message(self, ws_channel, message: Dict[str, Any]) -> None:
+        """paradex_py ws_client callback for order_book / trades / bbo channels."""
+        params = message.get('params', {})
+        channel = params.get('channel', '')
+        data = params.get('data', {})
+        instrument = f"paradex:{data.get('market', '')}"
+
+        if channel.startswith('order_book'):
+            ts = int(data.get('last_updated_at') or 0) * 1_000_000 or time.time_ns()
+            kind = KIND_BOOK_SNAPSHOT if data.get('update_type', 's') == 's' else KIND_BOOK_DELTA
+            levels = []
+            for key in ('inserts', 'updates'):
+                levels += [(SIDE_BID if lv['side'] == 'BUY' else SIDE_ASK, lv['price'], lv['size'])
+                           for lv in data.get(key, [])]
+            levels += [(SIDE_BID if lv['side'] == 'BUY' else SIDE_ASK, lv['price'], 0)
+                       for lv in data.get('deletes', [])]
+            self._add_levels(instrument, kind, ts, int(data.get('seq_no') or 0), levels)
+        elif channel.startswith('trades'):
+            ts = int(data.get('created_at') or 0) * 1_000_000 or time.time_ns()
+            side = SIDE_BID if data.get('side') == 'BUY' else SIDE_ASK
+            self._add_levels(instrument, KIND_TRADE, ts, 0, [(side, data['price'], data['size'])])
+        elif channel.startswith('bbo'):
+            ts = int(data.get('last_updated_at') or 0) * 1_000_000 or time.time_ns()
+            self._add_levels(instrument, KIND_BBO, ts, int(data.get('seq_no') or 0), [
+                (SIDE_BID, data.get('bid') or 0, data.get('bid_size') or 0),
+                (SIDE_ASK, data.get('ask') or 0, data.get('ask_size') or 0),
+            ])
+
+    async def subscribe_paradex(self, ws_client, markets: Iterable[str]) -> None:
+        """Subscribe a connected paradex_py ws_client to order book, trades and BBO."""
+        from paradex_py.api.ws_client import ParadexWebsocketChannel
+
+        for market in markets:
+            await ws_client.subscribe(ParadexWebsocketChannel.ORDER_BOOK, callback=self.on_paradex_message,
+                                      params={"market": market, "feed_type": "snapshot", "refresh_rate": "50ms"})
+            await ws_client.subscribe(ParadexWebsocketChannel.TRADES, callback=self.on_paradex_message,
+                                      params={"market": market})
+            await ws_client.subscribe(ParadexWebsocketChannel.BBO, callback=self.on_paradex_message,
+                                      params={"market": market})
+
+
+async def _record(tickers: List[str], out_dir: str, env: str, codec: str) -> None:
+    from paradex_py import Paradex
+    from pysdk.grvt_ccxt_env import GrvtEnv
+    from pysdk.grvt_ccxt_ws import GrvtCcxtWS
+
+    recorder = MarketDataRecorder(out_dir, codec=codec)
+    await recorder.start()
+
+    grvt_env = {'prod': GrvtEnv.PROD, 'testnet': GrvtEnv.TESTNET}[env]
+    grvt_ws = GrvtCcxtWS(env=grvt_env, loop=asyncio.get_running_loop(), parameters={})
+    await grvt_ws.initialize()
+    await recorder.subscribe_grvt(grvt_ws, [f"{t}_USDT_Perp" for t in tickers])
+
+    paradex = Paradex(env=env)
+    await paradex.ws_client.connect()
+    await recorder.subscribe_paradex(paradex.ws_client, [f"{t}-USD-PERP" for t in tickers])
+
+    try:
+        while True:
+            await asyncio.sleep(60)
+            recorder.logger.info(f"recorded {recorder.messages} messages / {recorder.rows} rows")
+    finally:
+        await recorder.close()
+        await grvt_ws.__aexit__()
+        await paradex.ws_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record GRVT/Paradex market data to .gpmd files")
+    parser.add_argument("--tickers", type=str, required=True, help="Comma separated tickers (e.g., BTC,ETH)")
+    parser.add_argument("--out", type=str, default="data/marketdata", help="Output directory")
+    parser.add_argument("--env", type=str, default="prod", choices=["prod", "testnet"])
+    parser.add_argument("--codec", type=str, default="zlib", choices=["zlib", "raw"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+    try:
+        asyncio.run(_record(tickers, args.out, args.env, args.codec))
+    except KeyboardInterrupt:
+        print("\nStopping recorder...")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from typing import Any, Literal
 
 import requests
 
+from .grvt_ccxt_auth import CookieManager, get_cookie_manager
 from .grvt_ccxt_base import GrvtCcxtBase
 from .grvt_ccxt_env import GrvtEnv, get_grvt_endpoint
 from .grvt_ccxt_types import (
@@ -24,9 +25,7 @@ from .grvt_ccxt_types import (
 from .grvt_ccxt_utils import (
     EnumEncoder,
     GrvtOrder,
-    get_cookie_with_expiration,
     get_grvt_order,
-    get_order_payload,
 )
 
 
@@ -58,17 +57,25 @@ class GrvtCcxt(GrvtCcxtBase):
         self._clsname: str = type(self).__name__
         self._session: requests.Session = requests.Session()
         self._session.headers.update({"Content-Type": "application/json"})
-        self.refresh_cookie()
+        # Cookies come from the shared CookieManager; the first private request logs in
+        self.cookie_manager: CookieManager | None = (
+            get_cookie_manager(self.env, self._api_key) if self._api_key else None
+        )
+        if self.cookie_manager is not None:
+            self.cookie_manager.attach(self._on_cookie)
         # Assign markets here
         self.markets: dict[str, dict] = self.load_markets()
 
     def refresh_cookie(self) -> dict | None:
-        """Refresh the session cookie."""
-        if not self.should_refresh_cookie():
-            return self._cookie
-        path = get_grvt_endpoint(self.env, "AUTH")
-        self._cookie = get_cookie_with_expiration(path, self._api_key)
-        self._path_return_value_map[path] = self._cookie
+        """Make sure a session cookie is available, logging in ahead of expiry."""
+        if self.cookie_manager is None:
+            return None
+        self.cookie_manager.ensure_sync()
+        return self._cookie
+
+    def _on_cookie(self, cookie: dict) -> None:
+        self._cookie = cookie
+        self._path_return_value_map[get_grvt_endpoint(self.env, "AUTH")] = cookie
         if self._cookie:
             self._session.cookies.update({"gravity": self._cookie["gravity"]})
             if self._cookie["X-Grvt-Account-Id"]:
@@ -78,7 +85,6 @@ class GrvtCcxt(GrvtCcxtBase):
             self.logger.info(
                 f"refresh_cookie {self._cookie=} {self._session.cookies=} {self._session.headers=}"
             )
-        return self._cookie
 
     # PRIVATE API CALLS
     def _auth_and_post(self, path: str, payload: dict) -> dict:
@@ -88,7 +94,7 @@ class GrvtCcxt(GrvtCcxtBase):
         if not path:
             self.logger.warning(f"{FN} Invalid path {path=} {payload=}")
             raise GrvtInvalidOrder(f"{FN} Invalid path {path=} {payload=}")
-        # Always see if need to referesh cookie before sending a request
+        # Log in only when the cookie is missing or close to expiry
         self.refresh_cookie()
         payload_json = json.dumps(payload, cls=EnumEncoder)
         self.logger.info(f"{FN} {payload=}\n{payload_json=}")
@@ -117,12 +123,7 @@ class GrvtCcxt(GrvtCcxtBase):
         Return: dictionary representing the order response.
         """
         FN = f"{self._clsname} _create_grvt_order cloid:{order.metadata.client_order_id}"
-        order_payload = get_order_payload(
-            order,
-            private_key=self._private_key,
-            env=self.env,
-            instruments=self.markets,
-        )
+        order_payload = self._get_order_signer().get_order_payload(order, self.markets)
         path = get_grvt_endpoint(self.env, "CREATE_ORDER")
         self.logger.info(f"{FN} {path=} {order_payload=}")
         response: dict = self._auth_and_post(path, payload=order_payload)
@@ -525,24 +526,19 @@ class GrvtCcxt(GrvtCcxtBase):
         return response
 
     # **************** PUBLIC API CALLS
-    def load_markets(self) -> dict[str, dict]:
-        self.logger.info("load_markets START")
-        instruments = self.fetch_markets(
-            params={
-                "kind": GrvtInstrumentKind.PERPETUAL,
-                # "base": "BTC",
-                # "quote": "USDT",
-            }
-        )
-        if instruments:
-            self.markets = {
-                str(i.get("instrument", "")): i for i in instruments if i.get("instrument")
-            }
-            self.logger.info(f"load_markets: loaded {len(self.markets)} markets.")
+    def load_markets(self, reload: bool = False) -> dict[str, dict]:
+        """Perpetual markets from the shared instrument cache; fetches only when it is stale."""
+        self.markets = self.market_cache.get_sync(self._fetch_perpetual_markets, reload=reload)
+        if self.markets:
+            self.logger.info(f"load_markets: {len(self.markets)} markets (age {self.market_cache.age:.0f}s).")
         else:
             self.logger.warning("load_markets: No markets found.")
         return self.markets
 
+    def _fetch_perpetual_markets(self) -> list[dict]:
+        self.logger.info("load_markets: fetching instruments")
+        return self.fetch_markets(params={"kind": GrvtInstrumentKind.PERPETUAL})
+
     def fetch_markets(
         self,
         params: dict = {},
@@ -0,0 +1,182 @@
+# ruff: noqa: E501
+"""
+Shared GRVT session cookie, one per (env, api_key).
+
+Clients attach a callback and get every new cookie pushed to them (REST session cookie jar
+and headers, WS reconnect headers). Once started, a background task logs in again ahead of
+expiry, so requests find a fresh cookie and never wait for a login. Concurrent refreshes
+(background task, first request, several clients) share one login.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable
+
+import aiohttp
+
+from .grvt_ccxt_env import GrvtEnv, get_grvt_endpoint
+from .grvt_ccxt_utils import get_cookie_with_expiration, get_cookie_with_expiration_async
+
+# Log in again this long before the cookie expires (at most half of its lifetime)
+REFRESH_AHEAD = 300.0
+# A cookie closer than this to expiry is not used at all
+EXPIRY_MARGIN = 5.0
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
+
+
+class CookieManager:
+    """Session cookie of one (env, api_key), refreshed ahead of expiry."""
+
+    def __init__(
+        self,
+        env: GrvtEnv,
+        api_key: str,
+        refresh_ahead: float = REFRESH_AHEAD,
+        logger: logging.Logger | None = None,
+    ):
+        self.env = env
+        self._api_key = api_key
+        self.refresh_ahead = refresh_ahead
+        self.logger = logger or logging.getLogger(__name__)
+        self.cookie: dict | None = None
+        self.refreshes = 0
+        self.failures = 0
+        self._issued_at = 0.0
+        self._listeners: list[weakref.WeakMethod] = []
+        self._session: aiohttp.ClientSession | None = None
+        self._inflight: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+        self._sync_lock = threading.Lock()
+
+    # **************** State
+    @property
+    def expires_in(self) -> float:
+        if not self.cookie or "expires" not in self.cookie:
+            return float("-inf")
+        return float(self.cookie["expires"]) - time.time()
+
+    def is_fresh(self) -> bool:
+        return self.expires_in > EXPIRY_MARGIN
+
+    def attach(self, on_cookie: Callable[[dict], None], session: aiohttp.ClientSession | None = None) -> None:
+        """
+        Register a bound method called with every new cookie (held weakly) and, optionally,
+        a keep-alive session to log in with. Called immediately if a cookie is already known.
+        """
+        self._listeners.append(weakref.WeakMethod(on_cookie))
+        if session is not None:
+            self._session = session
+        if self.cookie:
+            on_cookie(self.cookie)
+
+    def detach(self, on_cookie: Callable[[dict], None]) -> None:
+        """Unregister a callback; the background refresh stops once nobody is attached."""
+        self._listeners = [ref for ref in self._listeners if ref() is not None and ref() != on_cookie]
+        if not self._listeners:
+            self.stop()
+
+    def _publish(self, cookie: dict) -> None:
+        self.cookie = cookie
+        self._issued_at = time.time()
+        self.refreshes += 1
+        alive = []
+        for ref in self._listeners:
+            method = ref()
+            if method is None:
+                continue
+            alive.append(ref)
+            try:
+                method(cookie)
+            except Exception:
+                self.logger.exception("CookieManager: cookie listener failed")
+        self._listeners = alive
+
+    # **************** Async refresh
+    async def ensure(self) -> dict | None:
+        """The current cookie; only logs in (once, shared) when there is no fresh one."""
+        if self.is_fresh():
+            return self.cookie
+        await asyncio.shield(self._refresh())
+        return self.cookie if self.is_fresh() else None
+
+    def _refresh(self) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._inflight = loop.create_task(self._login())
+        return task
+
+    async def _login(self) -> None:
+        path = get_grvt_endpoint(self.env, "AUTH")
+        session = self._session if self._session is not None and not self._session.closed else None
+        cookie = await get_cookie_with_expiration_async(path, self._api_key, session=session)
+        if cookie:
+            self._publish(cookie)
+            self.logger.info(f"CookieManager: cookie refreshed, expires in {self.expires_in:.0f}s")
+        else:
+            self.failures += 1
+            self.logger.warning(f"CookieManager: login failed ({self.failures} failures)")
+
+    def start(self) -> None:
+        """Start the background refresh on the running loop (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _next_refresh_delay(self) -> float:
+        lifetime = float(self.cookie["expires"]) - self._issued_at if self.cookie else 0.0
+        ahead = min(self.refresh_ahead, lifetime / 2) if lifetime > 0 else self.refresh_ahead
+        return max(0.0, self.expires_in - ahead)
+
+    async def _run(self) -> None:
+        retry_delay = RETRY_DELAY
+        while True:
+            if self.cookie:
+                await asyncio.sleep(self._next_refresh_delay())
+            before = self.cookie
+            try:
+                await asyncio.shield(self._refresh())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"CookieManager: refresh error {e}")
+            if self.cookie is before:
+                # Failed: retry with backoff, still well before the old cookie expires
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
+            else:
+                retry_delay = RETRY_DELAY
+
+    # **************** Blocking refresh (GrvtCcxt)
+    def ensure_sync(self) -> dict | None:
+        """Blocking ensure() for the requests-based client."""
+        with self._sync_lock:
+            # Refresh ahead of expiry, since there is no background task here
+            if self.cookie and self.expires_in > min(self.refresh_ahead, 60.0):
+                return self.cookie
+            cookie = get_cookie_with_expiration(get_grvt_endpoint(self.env, "AUTH"), self._api_key)
+            if cookie:
+                self._publish(cookie)
+            else:
+                self.failures += 1
+            return self.cookie if self.is_fresh() else None
+
+
+_managers: dict[tuple[str, str], CookieManager] = {}
+
+
+def get_cookie_manager(env: GrvtEnv, api_key: str) -> CookieManager:
+    """The process-wide CookieManager of (env, api_key)."""
+    key = (env.value, api_key)
+    manager = _managers.get(key)
+    if manager is None:
+        manager = _managers[key] = CookieManager(env, api_key)
+    return manager
@@ -13,6 +13,7 @@ from decimal import Decimal
 from typing import Any, get_args
 
 from .grvt_ccxt_env import GrvtEnv
+from .grvt_ccxt_markets import MarketCache, get_market_cache
 from .grvt_ccxt_types import (
     CandlestickInterval,
     CandlestickType,
@@ -22,7 +23,7 @@ from .grvt_ccxt_types import (
     Num,
     ccxt_interval_to_grvt_candlestick_interval,
 )
-from .grvt_ccxt_utils import get_kuq_from_symbol, sign_derisk_mm_ratio_request
+from .grvt_ccxt_utils import OrderSigner, get_kuq_from_symbol, sign_derisk_mm_ratio_request
 
 # COOKIE_REFRESH_INTERVAL_SECS = 60 * 60  # 30 minutes
 
@@ -57,10 +58,31 @@ class GrvtCcxtBase:
 
         self._path_return_value_map: dict = {}
         self._cookie: dict | None = None
-        self.markets: dict = {}
+        # Instruments are shared by every client of this env (see grvt_ccxt_markets.py)
+        self.market_cache: MarketCache = parameters.get("market_cache") or get_market_cache(env)
+        self.markets: dict = self.market_cache.markets
+        self.market_cache.add_listener(self._on_markets_updated)
+        self._order_signer: OrderSigner | None = None
+        # Optional latency hook: any object with now() -> int ns and record_since(stage, exchange, start_ns)
+        self.latency_recorder = parameters.get("latency_recorder")
         self._clsname: str = type(self).__name__
         self.logger.info(f"GrvtCcxtBase: {self.env=}, {self._trading_account_id=}")
 
+    def _get_order_signer(self) -> OrderSigner:
+        """Returns the cached OrderSigner, created on first use."""
+        if self._order_signer is None:
+            self._order_signer = OrderSigner(self._private_key, self.env)
+        return self._order_signer
+
+    def _on_markets_updated(self) -> None:
+        if self._order_signer is not None:
+            self._order_signer.clear_instrument_cache()
+
+    @property
+    def order_signer(self) -> OrderSigner:
+        """The OrderSigner used by this client, for signing orders ahead of submission."""
+        return self._get_order_signer()
+
     def describe(self) -> list[str]:
         """Returns the description of the class methods."""
         return [
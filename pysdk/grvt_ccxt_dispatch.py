@@ -0,0 +1,144 @@
+# ruff: noqa: E501
+"""
+Per-subscription dispatch queues for GrvtCcxtWS.
+
+Each (stream, selector) subscription gets a StreamDispatcher: the socket reader only enqueues,
+a worker task awaits the user callback. A slow callback then delays its own stream, never the
+reader or other subscriptions.
+
+Overflow policies:
+    conflate     keep only the newest message (snapshots: book.s, mini.s, ticker.s)
+    drop_oldest  bounded queue, the oldest message is dropped when full
+    block        never drop; the reader waits for room (deltas, orders, fills, positions)
+"""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable
+
+POLICY_CONFLATE = "conflate"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_BLOCK = "block"
+POLICIES = (POLICY_CONFLATE, POLICY_DROP_OLDEST, POLICY_BLOCK)
+
+DEFAULT_MAX_QUEUE = 256
+
+# Streams whose every message is a full snapshot, so only the latest one matters.
+# Deltas (book.d, mini.d, ticker.d) must not be conflated: dropping one corrupts the local state.
+CONFLATED_STREAMS = ("book.s", "mini.s", "ticker.s")
+
+
+def default_policy(stream: str) -> str:
+    """Default overflow policy for a (versioned or not) stream name."""
+    return POLICY_CONFLATE if stream.endswith(CONFLATED_STREAMS) else POLICY_BLOCK
+
+
+class StreamDispatcher:
+    """Bounded queue + worker task delivering one subscription's messages in order."""
+
+    def __init__(
+        self,
+        name: str,
+        callback: Callable,
+        policy: str = POLICY_BLOCK,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        logger: logging.Logger | None = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {POLICIES}")
+        self.name = name
+        self.callback = callback
+        self.policy = policy
+        self.max_queue = 1 if policy == POLICY_CONFLATE else max_queue
+        # A blocked reader resumes once the worker has drained down to half the queue,
+        # instead of ping-ponging one message at a time
+        self._low_water = self.max_queue // 2
+        self.logger = logger or logging.getLogger(__name__)
+        self._queue: deque[tuple[float, dict]] = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._worker: asyncio.Task | None = None
+        # Metrics
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.blocked = 0
+        self.max_backlog = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def backlog(self) -> int:
+        return len(self._queue)
+
+    async def put(self, message: dict) -> None:
+        queue = self._queue
+        if len(queue) >= self.max_queue:
+            if self.policy == POLICY_BLOCK:
+                self.blocked += 1
+                if self.blocked == 1 or self.blocked % 100 == 0:
+                    self.logger.warning(
+                        "%s dispatch queue full (%d), reader waiting (blocked %d times)",
+                        self.name, len(queue), self.blocked,
+                    )
+                self._space.clear()
+                await self._space.wait()
+            else:
+                queue.popleft()
+                self.dropped += 1
+        loop = asyncio.get_running_loop()
+        queue.append((loop.time(), message))
+        self.enqueued += 1
+        if len(queue) > self.max_backlog:
+            self.max_backlog = len(queue)
+        self._ready.set()
+        if self._worker is None:
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            if not queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            received_at, message = queue.popleft()
+            if len(queue) <= self._low_water:
+                self._space.set()
+            lag = loop.time() - received_at
+            self.last_lag = lag
+            if lag > self.max_lag:
+                self.max_lag = lag
+            try:
+                await self.callback(message)
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                self.logger.exception("%s callback failed", self.name)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "backlog": self.backlog,
+            "max_backlog": self.max_backlog,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "errors": self.errors,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._queue.clear()
+        self._space.set()
@@ -0,0 +1,74 @@
+# ruff: noqa: E501
+"""
+JSON decoding for GRVT WebSocket frames.
+
+The fastest available decoder is picked once at import: orjson, then msgspec, then the
+standard library json module. peek_route() reads stream and selector straight from the
+raw frame, so the reader can route (or drop) a feed message before paying for the full parse.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+
+    _fast_loads: Callable[[str | bytes], Any] = orjson.loads
+    _FAST_ERRORS: tuple[type[Exception], ...] = (orjson.JSONDecodeError,)
+    DECODER = "orjson"
+except ImportError:
+    try:
+        import msgspec
+
+        _fast_loads = msgspec.json.Decoder().decode
+        _FAST_ERRORS = (msgspec.DecodeError,)
+        DECODER = "msgspec"
+    except ImportError:
+        _fast_loads = json.loads
+        _FAST_ERRORS = ()
+        DECODER = "json"
+
+_FEED_KEY = '"feed":'
+_STREAM_KEY = '"stream":"'
+_SELECTOR_KEY = '"selector":"'
+
+
+def decode_frame(raw: str | bytes) -> Any:
+    """Decode one WebSocket frame."""
+    try:
+        return _fast_loads(raw)
+    except _FAST_ERRORS:
+        # orjson rejects integers wider than 64 bits, which json accepts
+        return json.loads(raw)
+
+
+def peek_route(raw: str | bytes) -> tuple[str, str] | None:
+    """
+    (stream, selector) of a feed frame such as
+    {"stream":"v1.book.s","selector":"BTC_USDT_Perp@500-10","sequence_number":"1","feed":{...}}
+    without decoding it. Returns None for anything else (JSON-RPC responses, binary frames,
+    frames whose routing keys are not written compactly before "feed"); callers fall back to
+    decode_frame() for those.
+    """
+    if not isinstance(raw, str):
+        return None
+    feed = raw.find(_FEED_KEY)
+    if feed < 0:
+        return None
+    start = raw.find(_STREAM_KEY, 0, feed)
+    if start < 0:
+        return None
+    start += len(_STREAM_KEY)
+    end = raw.find('"', start, feed)
+    if end < 0:
+        return None
+    stream = raw[start:end]
+    start = raw.find(_SELECTOR_KEY, 0, feed)
+    if start < 0:
+        return None
+    start += len(_SELECTOR_KEY)
+    end = raw.find('"', start, feed)
+    if end < 0:
+        return None
+    return stream, raw[start:end]
@@ -0,0 +1,230 @@
+# ruff: noqa: E501
+"""
+Process-wide instrument cache, one per GrvtEnv, persisted to disk.
+
+Every client of the same env (GrvtCcxt, GrvtCcxtPro, GrvtCcxtWS) shares one MarketCache and
+one `markets` dict, which is updated in place. The first load reads the disk copy; within
+`ttl` no request is made at all, a stale copy is served immediately and refreshed in the
+background, and only a missing or unreadable copy blocks on GET_INSTRUMENTS.
+
+Cache file: $GRVT_MARKETS_CACHE_DIR (default ~/.cache/grvt)/markets_<env>.json
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from decimal import Decimal
+
+from .grvt_ccxt_env import GrvtEnv
+
+DEFAULT_TTL = 6 * 3600.0
+# A disk copy older than this is not served at all, even while a refresh runs
+MAX_STALE = 7 * 24 * 3600.0
+CACHE_DIR = os.getenv("GRVT_MARKETS_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "grvt")
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class InstrumentSpec:
+    """Parsed, typed view of one GET_INSTRUMENTS entry."""
+
+    instrument: str
+    instrument_hash: int
+    base: str
+    quote: str
+    kind: str
+    base_decimals: int
+    tick_size: Decimal
+    min_size: Decimal
+
+    @classmethod
+    def from_market(cls, market: dict) -> "InstrumentSpec":
+        instrument_hash = market.get("instrument_hash", 0)
+        if isinstance(instrument_hash, str):
+            instrument_hash = int(instrument_hash, 16)
+        return cls(
+            instrument=str(market.get("instrument", "")),
+            instrument_hash=int(instrument_hash),
+            base=str(market.get("base", "")),
+            quote=str(market.get("quote", "")),
+            kind=str(market.get("kind", "")),
+            base_decimals=int(market.get("base_decimals", 0)),
+            tick_size=Decimal(str(market.get("tick_size", 0))),
+            min_size=Decimal(str(market.get("min_size", 0))),
+        )
+
+    @property
+    def size_multiplier(self) -> Decimal:
+        """Multiplier from order size to the signed integer size."""
+        return Decimal(10**self.base_decimals)
+
+
+class MarketCache:
+    """Instrument list of one env: memory, then disk (ttl), then GET_INSTRUMENTS."""
+
+    def __init__(
+        self,
+        env: GrvtEnv,
+        path: str | None = None,
+        ttl: float = DEFAULT_TTL,
+        logger: logging.Logger | None = None,
+    ):
+        self.env = env
+        self.path = path or os.path.join(CACHE_DIR, f"markets_{env.value}.json")
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger(__name__)
+        # Shared with every client of this env; always updated in place
+        self.markets: dict[str, dict] = {}
+        self.specs: dict[str, InstrumentSpec] = {}
+        self.fetched_at: float = 0.0
+        self._disk_checked = False
+        self._listeners: list[weakref.WeakMethod] = []
+        self._inflight: asyncio.Task | None = None
+        self._sync_lock = threading.Lock()
+
+    # **************** State
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at if self.fetched_at else float("inf")
+
+    def is_fresh(self) -> bool:
+        return bool(self.markets) and self.age < self.ttl
+
+    def add_listener(self, method: Callable[[], None]) -> None:
+        """Call a bound method after every update (held weakly)."""
+        self._listeners.append(weakref.WeakMethod(method))
+
+    def update(self, instruments: list[dict], fetched_at: float | None = None) -> None:
+        markets = {str(i["instrument"]): i for i in instruments if i.get("instrument")}
+        if not markets:
+            return
+        self.markets.clear()
+        self.markets.update(markets)
+        self.specs = {symbol: InstrumentSpec.from_market(m) for symbol, m in markets.items()}
+        self.fetched_at = fetched_at or time.time()
+        alive = []
+        for ref in self._listeners:
+            method = ref()
+            if method is not None:
+                method()
+                alive.append(ref)
+        self._listeners = alive
+
+    # **************** Lookups (no I/O)
+    def spec(self, symbol: str) -> InstrumentSpec | None:
+        return self.specs.get(symbol)
+
+    def find(self, base: str, quote: str = "USDT", kind: str = "PERPETUAL") -> InstrumentSpec | None:
+        for spec in self.specs.values():
+            if spec.base == base and spec.quote == quote and spec.kind == kind:
+                return spec
+        return None
+
+    # **************** Disk
+    def load_from_disk(self) -> bool:
+        """Populate from the disk copy if it is usable. Returns True on success."""
+        self._disk_checked = True
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"MarketCache: ignoring unreadable {self.path}: {e}")
+            return False
+        if data.get("version") != FORMAT_VERSION or data.get("env") != self.env.value:
+            return False
+        fetched_at = float(data.get("fetched_at", 0))
+        if time.time() - fetched_at > MAX_STALE:
+            return False
+        self.update(data.get("instruments") or [], fetched_at)
+        self.logger.info(f"MarketCache: loaded {len(self.markets)} markets from {self.path} (age {self.age:.0f}s)")
+        return bool(self.markets)
+
+    def save_to_disk(self) -> None:
+        data = {
+            "version": FORMAT_VERSION,
+            "env": self.env.value,
+            "fetched_at": self.fetched_at,
+            "instruments": list(self.markets.values()),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.logger.warning(f"MarketCache: could not write {self.path}: {e}")
+
+    # **************** Loading
+    async def get(self, fetch: Callable[[], Awaitable[list[dict]]], reload: bool = False) -> dict[str, dict]:
+        """
+        Markets for this env. Concurrent callers share one fetch. Without `reload`, a fresh
+        cache returns immediately and a stale one returns immediately while refreshing.
+        """
+        if not reload:
+            if not self.markets and not self._disk_checked:
+                self.load_from_disk()
+            if self.is_fresh():
+                return self.markets
+            if self.markets:
+                self._refresh(fetch)
+                return self.markets
+        await asyncio.shield(self._refresh(fetch))
+        return self.markets
+
+    def _refresh(self, fetch: Callable[[], Awaitable[list[dict]]]) -> asyncio.Task:
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._inflight = asyncio.get_running_loop().create_task(self._fetch(fetch))
+        return task
+
+    async def _fetch(self, fetch: Callable[[], Awaitable[list[dict]]]) -> None:
+        try:
+            instruments = await fetch()
+        except Exception as e:
+            if not self.markets:
+                raise
+            self.logger.warning(f"MarketCache: refresh failed, keeping cached markets: {e}")
+            return
+        if instruments:
+            self.update(instruments)
+            await asyncio.to_thread(self.save_to_disk)
+
+    def get_sync(self, fetch: Callable[[], list[dict]], reload: bool = False) -> dict[str, dict]:
+        """Blocking variant of get() for GrvtCcxt; a stale cache is refreshed in place."""
+        with self._sync_lock:
+            if not reload:
+                if not self.markets and not self._disk_checked:
+                    self.load_from_disk()
+                if self.is_fresh():
+                    return self.markets
+            try:
+                instruments = fetch()
+            except Exception as e:
+                if not self.markets:
+                    raise
+                self.logger.warning(f"MarketCache: refresh failed, keeping cached markets: {e}")
+                return self.markets
+            if instruments:
+                self.update(instruments)
+                self.save_to_disk()
+            return self.markets
+
+
+_caches: dict[str, MarketCache] = {}
+
+
+def get_market_cache(env: GrvtEnv) -> MarketCache:
+    """The process-wide MarketCache of `env`."""
+    cache = _caches.get(env.value)
+    if cache is None:
+        cache = _caches[env.value] = MarketCache(env)
+    return cache
@@ -13,6 +13,7 @@ from typing import Literal
 
 import aiohttp
 
+from .grvt_ccxt_auth import CookieManager, get_cookie_manager
 from .grvt_ccxt_base import GrvtCcxtBase
 
 # import requests
@@ -29,12 +30,36 @@ from .grvt_ccxt_types import (
 from .grvt_ccxt_utils import (
     EnumEncoder,
     GrvtOrder,
-    get_cookie_with_expiration,
-    get_cookie_with_expiration_async,
     get_grvt_order,
-    get_order_payload,
+    get_signed_order_payload,
 )
 
+# Keep-alive connection pool settings for the shared aiohttp session
+HTTP_POOL_LIMIT = 32
+HTTP_KEEPALIVE_SECS = 60
+HTTP_DNS_CACHE_SECS = 300
+
+
+def new_keepalive_session(
+    limit: int = HTTP_POOL_LIMIT,
+    keepalive_timeout: float = HTTP_KEEPALIVE_SECS,
+) -> aiohttp.ClientSession:
+    """
+    Creates an aiohttp session backed by a keep-alive connection pool.
+    Must be called from a running event loop.
+    The same session can be shared by several GrvtCcxtPro/GrvtCcxtWS instances
+        so that concurrent requests reuse warm TLS connections.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECS,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"Content-Type": "application/json"},
+    )
+
 
 class GrvtCcxtPro(GrvtCcxtBase):
     """
@@ -57,24 +82,42 @@ class GrvtCcxtPro(GrvtCcxtBase):
         logger: logging.Logger | None = None,
         parameters: dict = {},
         order_book_ccxt_format: bool = False,
+        session: aiohttp.ClientSession | None = None,
     ):
-        """Initialize the GrvtCcxt instance."""
+        """Initialize the GrvtCcxt instance.
+        If `session` is given it is shared and NOT closed by this instance.
+        """
         super().__init__(env, logger, parameters, order_book_ccxt_format)
         self._clsname: str = type(self).__name__
-        self._session = aiohttp.ClientSession(headers={"Content-Type": "application/json"})
-        # Force sync call to get cookie here
-        self._cookie = get_cookie_with_expiration(
-            get_grvt_endpoint(self.env, "AUTH"), self._api_key
+        self._owns_session: bool = session is None
+        self._session = session or new_keepalive_session()
+        # No login here: the shared CookieManager pushes cookies into this session
+        # (first one from refresh_cookie() / the first private request)
+        self.cookie_manager: CookieManager | None = (
+            get_cookie_manager(self.env, self._api_key) if self._api_key else None
         )
-        self.update_session_with_cookie()
+        if self.cookie_manager is not None:
+            self.cookie_manager.attach(self._on_cookie, self._session)
 
     def __del__(self):
         """Close the aiohttp session when the instance is deleted."""
         self.logger.info(f"{self._clsname} __del__() called")
-        if self._session:
+        if self._session and self._owns_session and not self._session.closed:
             self.logger.info(f"{self._clsname} closing session")
             asyncio.get_running_loop().create_task(self._session.close())
 
+    async def close(self) -> None:
+        """Close the aiohttp session if it is owned by this instance."""
+        if self.cookie_manager is not None:
+            self.cookie_manager.detach(self._on_cookie)
+        if self._session and self._owns_session and not self._session.closed:
+            await self._session.close()
+
+    def _on_cookie(self, cookie: dict) -> None:
+        self._cookie = cookie
+        self._path_return_value_map[get_grvt_endpoint(self.env, "AUTH")] = cookie
+        self.update_session_with_cookie()
+
     def update_session_with_cookie(self) -> None:
         if self._cookie:
             self._session.cookie_jar.update_cookies({"gravity": self._cookie["gravity"]})
@@ -88,13 +131,14 @@ class GrvtCcxtPro(GrvtCcxtBase):
             )
 
     async def refresh_cookie(self) -> dict | None:
-        """Refresh the session cookie."""
-        if not self.should_refresh_cookie():
-            return self._cookie
-        path: str = get_grvt_endpoint(self.env, "AUTH")
-        self._cookie = await get_cookie_with_expiration_async(path, self._api_key)
-        self._path_return_value_map[path] = self._cookie
-        self.update_session_with_cookie()
+        """
+        Make sure a session cookie is available and keep it refreshed in the background.
+        Only waits for a login when there is no fresh cookie yet.
+        """
+        if self.cookie_manager is None:
+            return None
+        await self.cookie_manager.ensure()
+        self.cookie_manager.start()
         return self._cookie
 
     # PRIVATE API CALLS
@@ -105,8 +149,11 @@ class GrvtCcxtPro(GrvtCcxtBase):
         if not path:
             self.logger.warning(f"{FN} Invalid path {path=} {payload=}")
             raise GrvtInvalidOrder(f"{FN} Invalid path {path=} {payload=}")
-        # Always see if need to referesh cookie before sending a request
-        await self.refresh_cookie()
+        # The cookie is refreshed in the background; only wait if there is no fresh one
+        if self.cookie_manager is not None and not self.cookie_manager.is_fresh():
+            await self.refresh_cookie()
+        latency = self.latency_recorder
+        start_ns = latency.now() if latency else 0
         payload_json = json.dumps(payload, cls=EnumEncoder)
         self.logger.info(f"{FN} {payload=}\n{payload_json=}")
         return_text: str = ""
@@ -133,22 +180,27 @@ class GrvtCcxtPro(GrvtCcxtBase):
                     self.logger.info(f"{FN} OK {return_value=} response=**TOO LONG**")
                 else:
                     self.logger.info(f"{FN} OK {return_value=} response={response}")
+        if latency:
+            latency.record_since("rest_post", "grvt", start_ns)
         self._path_return_value_map[path] = response
         return response or {}
 
-    async def _create_grvt_order(self, order: GrvtOrder) -> dict:
+    async def _create_grvt_order(self, order: GrvtOrder, presigned: bool = False) -> dict:
         """
         Send a GrvtOrder object to the exchange.
         :param order: The GrvtOrder object.
+        :param presigned: True if order.signature is already filled, skips signing.
         Return: dictionary representing the order response.
         """
         FN = f"{self._clsname} _create_grvt_order cloid:{order.metadata.client_order_id}"
-        order_payload = get_order_payload(
-            order,
-            private_key=self._private_key,
-            env=self.env,
-            instruments=self.markets,
-        )
+        if presigned:
+            order_payload = get_signed_order_payload(order)
+        else:
+            latency = self.latency_recorder
+            start_ns = latency.now() if latency else 0
+            order_payload = self._get_order_signer().get_order_payload(order, self.markets)
+            if latency:
+                latency.record_since("sign", "grvt", start_ns)
         path = get_grvt_endpoint(self.env, "CREATE_ORDER")
         self.logger.info(f"{FN} {path=} {order_payload=}")
         response: dict = await self._auth_and_post(path, payload=order_payload)
@@ -200,6 +252,14 @@ class GrvtCcxtPro(GrvtCcxtBase):
         order = self._get_order_with_validations(symbol, order_type, side, amount, price, params)
         return await self._create_grvt_order(order)
 
+    async def create_signed_order(self, order: GrvtOrder) -> dict:
+        """
+        Send an order whose signature was prepared ahead of time (see OrderSigner.sign).
+        Only the unsigned metadata (client_order_id) may be changed after signing.
+        """
+        self._check_account_auth()
+        return await self._create_grvt_order(order, presigned=True)
+
     async def create_limit_order(
         self,
         symbol: str,
@@ -561,20 +621,22 @@ class GrvtCcxtPro(GrvtCcxtBase):
         return response
 
     # **************** PUBLIC API CALLS
-    async def load_markets(self) -> dict | None:
-        self.logger.info("load_markets START")
-        instruments = await self.fetch_markets(
-            params={
-                "kind": GrvtInstrumentKind.PERPETUAL,
-            }
-        )
-        if instruments:
-            self.markets = {i.get("instrument"): i for i in instruments}
-            self.logger.info(f"load_markets: loaded {len(self.markets)} markets.")
+    async def load_markets(self, reload: bool = False) -> dict | None:
+        """
+        Perpetual markets from the shared instrument cache. Only fetches when the cache
+        has nothing usable (or `reload` is set); a stale cache is refreshed in the background.
+        """
+        self.markets = await self.market_cache.get(self._fetch_perpetual_markets, reload=reload)
+        if self.markets:
+            self.logger.info(f"load_markets: {len(self.markets)} markets (age {self.market_cache.age:.0f}s).")
         else:
             self.logger.warning("load_markets: No markets found.")
         return self.markets
 
+    async def _fetch_perpetual_markets(self) -> list[dict]:
+        self.logger.info("load_markets: fetching instruments")
+        return await self.fetch_markets(params={"kind": GrvtInstrumentKind.PERPETUAL})
+
     async def fetch_markets(
         self,
         params: dict = {},
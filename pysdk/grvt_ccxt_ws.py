@@ -14,6 +14,7 @@ from asyncio.events import AbstractEventLoop
 from collections.abc import Callable
 from decimal import Decimal
 
+import aiohttp
 import websockets
 
 # import requests
@@ -25,6 +26,8 @@ from .grvt_ccxt_env import (
     get_grvt_ws_endpoint,
     is_trading_ws_endpoint,
 )
+from .grvt_ccxt_dispatch import DEFAULT_MAX_QUEUE, StreamDispatcher, default_policy
+from .grvt_ccxt_json import decode_frame, peek_route
 from .grvt_ccxt_pro import GrvtCcxtPro
 from .grvt_ccxt_types import (
     GrvtInvalidOrder,
@@ -32,9 +35,22 @@ from .grvt_ccxt_types import (
     GrvtOrderType,
     Num,
 )
-from .grvt_ccxt_utils import get_order_rpc_payload
+from .grvt_ccxt_utils import GrvtOrder, get_order_rpc_payload, get_signed_order_payload
 
 WS_READ_TIMEOUT = 5
+RPC_RESPONSE_TIMEOUT = 5
+
+
+if hasattr(asyncio, "timeout"):  # Python 3.11+: no extra Task per frame
+
+    async def _recv(ws, timeout: float):
+        async with asyncio.timeout(timeout):
+            return await ws.recv()
+
+else:
+
+    async def _recv(ws, timeout: float):
+        return await asyncio.wait_for(ws.recv(), timeout=timeout)
 
 
 class GrvtCcxtWS(GrvtCcxtPro):
@@ -58,19 +74,29 @@ class GrvtCcxtWS(GrvtCcxtPro):
         loop: AbstractEventLoop,
         logger: logging.Logger | None = None,
         parameters: dict = {},
+        session: aiohttp.ClientSession | None = None,
     ):
         """Initialize the GrvtCcxt instance."""
-        super().__init__(env, logger, parameters)
+        super().__init__(env, logger, parameters, session=session)
         self._loop = loop
         self._clsname: str = type(self).__name__
         self.api_ws_version = parameters.get("api_ws_version", "v1")
         self.force_reconnect_flag: bool = False
         self.ws: dict[GrvtWSEndpointType, websockets.WebSocketClientProtocol | None] = {}
         self.callbacks: dict[GrvtWSEndpointType, dict[str, dict[str, Callable]]] = {}
+        # Flat view of callbacks for the reader: (versioned_stream, selector) -> (dispatcher, stream)
+        self._routes: dict[
+            GrvtWSEndpointType, dict[tuple[str, str], tuple[StreamDispatcher, str]]
+        ] = {}
+        # Overflow policy per non-versioned stream (e.g. {"book.s": "conflate"}), see grvt_ccxt_dispatch
+        self.dispatch_policies: dict[str, str] = dict(parameters.get("dispatch_policies", {}))
+        self.dispatch_max_queue: int = parameters.get("dispatch_max_queue", DEFAULT_MAX_QUEUE)
         self.subscribed_streams: dict[GrvtWSEndpointType, dict] = {}
         self.api_url: dict[GrvtWSEndpointType, str] = {}
         self._last_message: dict[str, dict] = {}
         self._request_id = 0
+        # JSON-RPC requests awaiting a response, keyed by request id
+        self._rpc_waiters: dict[int, asyncio.Future] = {}
         self.endpoint_types = [
             GrvtWSEndpointType.MARKET_DATA,
             GrvtWSEndpointType.TRADE_DATA,
@@ -83,6 +109,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
                 self.env.value, grvt_endpoint_type
             )
             self.callbacks[grvt_endpoint_type] = {}
+            self._routes[grvt_endpoint_type] = {}
             self.subscribed_streams[grvt_endpoint_type] = {}
             self.ws[grvt_endpoint_type] = None
             self._loop.create_task(self._read_messages(grvt_endpoint_type))
@@ -95,6 +122,9 @@ class GrvtCcxtWS(GrvtCcxtPro):
     async def __aexit__(self):
         for grvt_endpoint_type in self.endpoint_types:
             await self._close_connection(grvt_endpoint_type)
+            for dispatcher, _ in self._routes[grvt_endpoint_type].values():
+                dispatcher.close()
+        await self.close()
 
     def force_reconnect(self) -> None:
         self.force_reconnect_flag = True
@@ -273,46 +303,67 @@ class GrvtCcxtWS(GrvtCcxtPro):
         elif "result" in message and "stream" in message["result"]:
             stream_subscribed = message.get("result", {}).get("stream", "")
         if stream_subscribed:
-            if not self.subscribed_streams[grvt_endpoint_type].get(stream_subscribed):
-                self.logger.info(
-                    f"{self._clsname} subscribed to stream:{stream_subscribed}"
-                )
-                self.subscribed_streams[grvt_endpoint_type][stream_subscribed] = True
+            self._mark_stream_subscribed(grvt_endpoint_type, stream_subscribed)
+
+    def _mark_stream_subscribed(
+        self, grvt_endpoint_type: GrvtWSEndpointType, stream_subscribed: str
+    ) -> None:
+        if not self.subscribed_streams[grvt_endpoint_type].get(stream_subscribed):
+            self.logger.info(
+                "%s subscribed to stream:%s", self._clsname, stream_subscribed
+            )
+            self.subscribed_streams[grvt_endpoint_type][stream_subscribed] = True
 
     async def _read_messages(self, grvt_endpoint_type: GrvtWSEndpointType):
         FN = f"{self._clsname} _read_messages {grvt_endpoint_type.value}"
+        routes = self._routes[grvt_endpoint_type]
+        logger = self.logger
         while True:
             if self.is_connection_open(grvt_endpoint_type):
                 try:
-                    self.logger.debug(f"{FN} waiting for message")
-                    response = await asyncio.wait_for(
-                        self.ws[grvt_endpoint_type].recv(), timeout=WS_READ_TIMEOUT
-                    )
-                    message = json.loads(response)
-                    self.logger.debug(f"{FN} received {message=}")
+                    debug = logger.isEnabledFor(logging.DEBUG)
+                    if debug:
+                        logger.debug("%s waiting for message", FN)
+                    response = await _recv(self.ws[grvt_endpoint_type], WS_READ_TIMEOUT)
+                    # Fast path: route feed frames on stream/selector before parsing them
+                    route = peek_route(response)
+                    if route is not None:
+                        self._mark_stream_subscribed(grvt_endpoint_type, route[0])
+                        target = routes.get(route)
+                        if target is None:
+                            logger.warning(
+                                "%s No callback for stream_subscribed=%r/selector=%r",
+                                FN, *route,
+                            )
+                            continue
+                        message = decode_frame(response)
+                        if debug:
+                            logger.debug("%s received message=%s", FN, message)
+                        dispatcher, stream = target
+                        self._last_message[stream] = message
+                        await dispatcher.put(message)
+                        continue
+                    message = decode_frame(response)
+                    if debug:
+                        logger.debug("%s received message=%s", FN, message)
                     self._check_susbcribed_stream(grvt_endpoint_type, message)
                     if "feed" in message:
                         stream_subscribed: str | None = message.get("stream")
                         selector: str = message.get("selector")
                         if stream_subscribed is None:
-                            self.logger.warning(f"{FN} missing stream in {message=}")
+                            logger.warning("%s missing stream in message=%s", FN, message)
                         if selector is None:
-                            self.logger.warning(f"{FN} missing selector in {message=}")
+                            logger.warning("%s missing selector in message=%s", FN, message)
                         if stream_subscribed and selector:
-                            callback = (
-                                self.callbacks[grvt_endpoint_type]
-                                .get(stream_subscribed, {})
-                                .get(selector, None)
-                            )
-                            if callback:
-                                await callback(message)
-                                stream: str = self.get_non_versioned_stream(
-                                    stream_subscribed
-                                )
+                            target = routes.get((stream_subscribed, selector))
+                            if target:
+                                dispatcher, stream = target
                                 self._last_message[stream] = message
+                                await dispatcher.put(message)
                             else:
-                                self.logger.warning(
-                                    f"{FN} No callback for {stream_subscribed=}/{selector=}"
+                                logger.warning(
+                                    "%s No callback for stream_subscribed=%r/selector=%r",
+                                    FN, stream_subscribed, selector,
                                 )
                     elif "jsonrpc" in message:
                         """
@@ -330,7 +381,18 @@ class GrvtCcxtWS(GrvtCcxtPro):
                         'book_size': ['0.001'], 'traded_size': ['0.0'], 'update_time': '1728918862633971628'}}}, 
                         'id': 2}
                     """
-                        self.logger.debug(f"{FN} jsonrpc result:{message.get('result')}")
+                        if debug:
+                            logger.debug("%s jsonrpc result:%s", FN, message.get("result"))
+                        # Only resolve: the waiter is removed by wait_rpc_response, which may not
+                        # have started yet if the sender is still inside send_rpc_message.
+                        # A response nobody claims is dropped after RPC_RESPONSE_TIMEOUT.
+                        request_id = message.get("id")
+                        waiter = self._rpc_waiters.get(request_id)
+                        if waiter and not waiter.done():
+                            waiter.set_result(message)
+                            self._loop.call_later(
+                                RPC_RESPONSE_TIMEOUT, self._rpc_waiters.pop, request_id, None
+                            )
                     else:
                         self.logger.info(f"{FN} Non-actionable message:{message}")
                 except (
@@ -342,7 +404,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
                     )
                     await self._reconnect(grvt_endpoint_type)
                 except asyncio.TimeoutError:  # noqa: UP041
-                    self.logger.debug(f"{FN} Timeout {WS_READ_TIMEOUT} secs")
+                    logger.debug("%s Timeout %s secs", FN, WS_READ_TIMEOUT)
                     pass
                 except Exception:
                     self.logger.exception(
@@ -417,12 +479,16 @@ class GrvtCcxtWS(GrvtCcxtPro):
         callback: Callable,
         ws_end_point_type: GrvtWSEndpointType | None = None,
         params: dict = {},
+        overflow: str | None = None,
     ) -> None:
         """
         Subscribe to a stream with optional parameters.
         Call the callback function when a message is received.
         callback function should have the following signature:
         (dict) -> None.
+        Callbacks run in a per-subscription worker task; overflow selects what happens when
+        the callback falls behind ("conflate", "drop_oldest" or "block"), defaulting to
+        conflate for snapshot streams and block for everything else.
         """
         FN = f"{self._clsname} subscribe {stream=}"
         if not ws_end_point_type:  # use default endpoint type
@@ -439,9 +505,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
         # create selector string and register callback
         selector: str = self._construct_selector(stream, params)
         versioned_stream: str = self.get_versioned_stream(stream)
-        if versioned_stream not in self.callbacks[ws_end_point_type]:
-            self.callbacks[ws_end_point_type][versioned_stream] = {}
-        self.callbacks[ws_end_point_type][versioned_stream][selector] = callback
+        self._register_callback(ws_end_point_type, versioned_stream, selector, callback, overflow)
         self.logger.info(
             f"{FN} {params=} {ws_end_point_type=}/{versioned_stream=}/{selector=} callback:{callback}"
         )
@@ -457,6 +521,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
         callback: Callable,
         ws_end_point_type: GrvtWSEndpointType | None = None,
         params: dict = {},
+        overflow: str | None = None,
     ) -> None:
         """ This method should be called in a separate task - 
         otherwise it will block the event loop for 5 seconds.
@@ -483,9 +548,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
         # create selector string and register callback
         selector: str = self._construct_selector(stream, params)
         versioned_stream: str = self.get_versioned_stream(stream)
-        if versioned_stream not in self.callbacks[ws_end_point_type]:
-            self.callbacks[ws_end_point_type][versioned_stream] = {}
-        self.callbacks[ws_end_point_type][versioned_stream][selector] = callback
+        self._register_callback(ws_end_point_type, versioned_stream, selector, callback, overflow)
         # self.logger.info(
         #     f"{FN} {params=} {ws_end_point_type=}/{versioned_stream=}/{selector=} callback:{callback}"
         # )
@@ -494,6 +557,47 @@ class GrvtCcxtWS(GrvtCcxtPro):
         await self._subscribe_to_stream(ws_end_point_type, versioned_stream, selector)
         
 
+    def _register_callback(
+        self,
+        ws_end_point_type: GrvtWSEndpointType,
+        versioned_stream: str,
+        selector: str,
+        callback: Callable,
+        overflow: str | None = None,
+    ) -> None:
+        if versioned_stream not in self.callbacks[ws_end_point_type]:
+            self.callbacks[ws_end_point_type][versioned_stream] = {}
+        self.callbacks[ws_end_point_type][versioned_stream][selector] = callback
+        key = (versioned_stream, selector)
+        existing = self._routes[ws_end_point_type].get(key)
+        if existing and overflow in (None, existing[0].policy):
+            # Re-subscription: keep the queue (and its ordering), swap the callback
+            existing[0].callback = callback
+            return
+        if existing:
+            existing[0].close()
+        stream = versioned_stream if self.api_ws_version == "v0" else versioned_stream.split(".", 1)[1]
+        policy = overflow or self.dispatch_policies.get(stream) or default_policy(stream)
+        dispatcher = StreamDispatcher(
+            f"{self._clsname} {ws_end_point_type.name} {versioned_stream}/{selector}",
+            callback,
+            policy=policy,
+            max_queue=self.dispatch_max_queue,
+            logger=self.logger,
+        )
+        self._routes[ws_end_point_type][key] = (
+            dispatcher,
+            self.get_non_versioned_stream(versioned_stream),
+        )
+
+    def dispatch_stats(self) -> dict[str, dict]:
+        """Backlog / drop / lag metrics per subscription, keyed by 'stream/selector'."""
+        return {
+            f"{stream}/{selector}": dispatcher.stats()
+            for routes in self._routes.values()
+            for (stream, selector), (dispatcher, _) in routes.items()
+        }
+
     def get_versioned_stream(self, stream: str) -> str:
         return (
             stream if self.api_ws_version == "v0" else f"{self.api_ws_version}.{stream}"
@@ -604,14 +708,61 @@ class GrvtCcxtWS(GrvtCcxtPro):
         }
 
     async def send_rpc_message(
-        self, end_point_type: GrvtWSEndpointType, message: dict
+        self,
+        end_point_type: GrvtWSEndpointType,
+        message: dict,
+        expect_response: bool = False,
     ) -> None:
         """
         Send a message to the server.
+        With expect_response=True a waiter for the message `id` is registered BEFORE
+        sending, and the caller must collect the response with wait_rpc_response().
         """
-        await self._send(end_point_type, json.dumps(message))
+        if expect_response:
+            self._rpc_waiters[message["id"]] = self._loop.create_future()
+        try:
+            await self._send(end_point_type, json.dumps(message))
+        except BaseException:
+            if expect_response:
+                self._rpc_waiters.pop(message["id"], None)
+            raise
         self.logger.info(f"{self._clsname} send_rpc_message {end_point_type=} {message=}")
 
+    async def wait_rpc_response(
+        self, request_id: int, timeout: float = RPC_RESPONSE_TIMEOUT
+    ) -> dict:
+        """
+        Wait for the JSON-RPC response with the given request id.<br>
+        Args:
+            request_id: `id` of a message sent with expect_response=True
+                (e.g. the `id` of the payload returned by rpc_create_order()).<br>
+            timeout: seconds to wait for the response.<br>
+        Returns:
+            the full JSON-RPC response message (with `result` or `error`).<br>
+        Raises:
+            GrvtInvalidOrder if no request with this id is pending.<br>
+            asyncio.TimeoutError if no response arrives in time.<br>
+        """
+        waiter = self._rpc_waiters.get(request_id)
+        if waiter is None:
+            raise GrvtInvalidOrder(f"{self._clsname} no pending rpc request {request_id=}")
+        try:
+            return await asyncio.wait_for(waiter, timeout=timeout)
+        finally:
+            self._rpc_waiters.pop(request_id, None)
+
+    async def rpc_request(
+        self,
+        end_point_type: GrvtWSEndpointType,
+        message: dict,
+        timeout: float = RPC_RESPONSE_TIMEOUT,
+    ) -> dict:
+        """
+        Send a JSON-RPC message and wait for its response.
+        """
+        await self.send_rpc_message(end_point_type, message, expect_response=True)
+        return await self.wait_rpc_response(message["id"], timeout)
+
     async def rpc_create_order(
         self,
         symbol: str,
@@ -620,9 +771,11 @@ class GrvtCcxtWS(GrvtCcxtPro):
         amount: float | Decimal | str | int,
         price: Num = None,
         params={},
+        expect_response: bool = False,
     ) -> dict:
         """
         Create an order.
+        With expect_response=True the ack can be awaited with wait_rpc_response(payload["id"]).
         """
         FN = f"{self._clsname} rpc_create_order"
         if not self.is_endpoint_connected(GrvtWSEndpointType.TRADE_DATA_RPC_FULL):
@@ -631,11 +784,42 @@ class GrvtCcxtWS(GrvtCcxtPro):
             symbol, order_type, side, amount, price, params
         )
         self.logger.info(f"{FN} {order=}")
-        payload = get_order_rpc_payload(order, self._private_key, self.env, self.markets)
+        latency = self.latency_recorder
+        start_ns = latency.now() if latency else 0
+        payload = get_order_rpc_payload(
+            order, self._private_key, self.env, self.markets, signer=self._get_order_signer()
+        )
+        if latency:
+            latency.record_since("sign", "grvt", start_ns)
         self._request_id += 1
         payload["id"] = self._request_id
         self.logger.info(f"{FN} {payload=}")
-        await self.send_rpc_message(GrvtWSEndpointType.TRADE_DATA_RPC_FULL, payload)
+        await self.send_rpc_message(
+            GrvtWSEndpointType.TRADE_DATA_RPC_FULL, payload, expect_response=expect_response
+        )
+        return payload
+
+    async def rpc_create_signed_order(
+        self, order: GrvtOrder, version: str = "v1", expect_response: bool = False
+    ) -> dict:
+        """
+        Create an order whose signature was prepared ahead of time (see OrderSigner.sign).
+        Only serialises and sends; no signing on this path.
+        """
+        FN = f"{self._clsname} rpc_create_signed_order"
+        if not self.is_endpoint_connected(GrvtWSEndpointType.TRADE_DATA_RPC_FULL):
+            raise GrvtInvalidOrder("Trade data connection not available.")
+        self._request_id += 1
+        payload = {
+            "jsonrpc": "2.0",
+            "method": f"{version}/create_order",
+            "params": get_signed_order_payload(order),
+            "id": self._request_id,
+        }
+        self.logger.info(f"{FN} {payload=}")
+        await self.send_rpc_message(
+            GrvtWSEndpointType.TRADE_DATA_RPC_FULL, payload, expect_response=expect_response
+        )
         return payload
 
     async def rpc_create_limit_order(
@@ -645,12 +829,16 @@ class GrvtCcxtWS(GrvtCcxtPro):
         amount: float | Decimal | str | int,
         price: Num,
         params={},
+        expect_response: bool = False,
     ) -> dict:
-        return await self.rpc_create_order(symbol, "limit", side, amount, price, params)
+        return await self.rpc_create_order(
+            symbol, "limit", side, amount, price, params, expect_response=expect_response
+        )
 
     async def rpc_cancel_all_orders(
         self,
         params: dict = {},
+        expect_response: bool = False,
     ) -> dict:
         """
         Ccxt compliant signature BUT lacks symbol
@@ -660,13 +848,14 @@ class GrvtCcxtWS(GrvtCcxtPro):
                 `base` (str): base currency. If missing/empty then fetch
                                     orders for all base currencies.<br>
                 `quote` (str): quote currency. Defaults to all.<br>
+        expect_response: register a waiter for wait_rpc_response()<br>
         """
         self._check_account_auth()
         # FN = f"{self._clsname} rpc_cancel_all_orders"
         payload: dict = self._get_payload_cancel_all_orders(params)
         jsonrpc_payload: dict = self.jsonrpc_wrap_payload(payload, method="cancel_all_orders")
         await self.send_rpc_message(
-            GrvtWSEndpointType.TRADE_DATA_RPC_FULL, jsonrpc_payload
+            GrvtWSEndpointType.TRADE_DATA_RPC_FULL, jsonrpc_payload, expect_response=expect_response
         )
         return jsonrpc_payload
 
@@ -675,6 +864,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
         id: str | None = None,
         symbol: str | None = None,
         params: dict = {},
+        expect_response: bool = False,
     ) -> dict:
         """
         Ccxt compliant signature
@@ -689,6 +879,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
             params: 
                 * client_order_id (str): client assigned order ID<br>
                 * time_to_live_ms (str): lifetime of cancel requiest in millisecs<br>
+            expect_response (bool): register a waiter for wait_rpc_response()<br>
         Returns:
             payload used to cancel order.<br>
         """
@@ -711,7 +902,7 @@ class GrvtCcxtWS(GrvtCcxtPro):
         # Send cancel requiest
         jsonrpc_payload = self.jsonrpc_wrap_payload(payload, method="cancel_order")
         await self.send_rpc_message(
-            GrvtWSEndpointType.TRADE_DATA_RPC_FULL, jsonrpc_payload
+            GrvtWSEndpointType.TRADE_DATA_RPC_FULL, jsonrpc_payload, expect_response=expect_response
         )
         return jsonrpc_payload
 
@@ -1,35 +1,80 @@
-import requests
-import time
 from decimal import Decimal
+from typing import Optional
+
+from helpers.notifier import Notification, Notifier, TelegramChannel
+
+
+class RoundReport(Notification):
+    """單輪報告；同一 ticker 尚未送出的報告會合併成一則 (輪次區間、磨損加總、最新累計值)"""
+
+    def __init__(self, ticker: str, round_num: int, grvt_pnl: Decimal, pdex_pnl: Decimal,
+                 total_wear: Decimal, total_volume: Decimal, fees: Decimal = Decimal('0'),
+                 funding: Decimal = Decimal('0')):
+        self.key = f"round:{ticker}"
+        self.ticker = ticker
+        self.first_round = self.last_round = round_num
+        self.grvt_pnl = grvt_pnl
+        self.pdex_pnl = pdex_pnl
+        self.total_wear = total_wear
+        self.total_volume = total_volume
+        self.fees = fees
+        self.funding = funding
+
+    def merge(self, newer: 'RoundReport') -> 'RoundReport':
+        newer.first_round = self.first_round
+        newer.grvt_pnl += self.grvt_pnl
+        newer.pdex_pnl += self.pdex_pnl
+        newer.fees += self.fees
+        newer.funding += self.funding
+        return newer
+
+    def format(self) -> str:
+        single = self.first_round == self.last_round
+        rounds = f"第 {self.last_round} 輪" if single else f"第 {self.first_round}-{self.last_round} 輪"
+        round_wear = self.grvt_pnl + self.pdex_pnl
+        return (
+            f"🔹 {self.ticker} {rounds}已結束\n"
+            f"━━━━━━━━━━━━━━\n"
+            f"💰 GRVT 平倉盈虧: {self.grvt_pnl:+.4f}\n"
+            f"💰 Paradex 平倉盈虧: {self.pdex_pnl:+.4f}\n"
+            f"💸 手續費(已計入): {self.fees:.4f}\n"
+            f"🏦 資金費(已計入): {self.funding:+.4f}\n"
+            f"--------------------------\n"
+            f"📉 {'此輪' if single else '這幾輪'}磨損(兩邊盈虧加總): {round_wear:+.4f}\n"
+            f"📊 目前總磨損: {self.total_wear:+.4f}\n"
+            f"📈 目前總交易量: {self.total_volume:.2f} U"
+        )
+
 
 class TelegramReporter:
-    def __init__(self, token: str, chat_id: str, enabled: bool = False):
-        self.token = token
-        self.chat_id = chat_id
-        self.enabled = enabled
+    """
+    輪次報告：只把訊息放入 Notifier 佇列後立即返回，由背景任務批次發送到 Telegram / Lark，
+    交易迴圈不等待任何網路請求。未傳入 notifier 時以 token / chat_id 建立只含 Telegram 的 Notifier。
+    """
+
+    def __init__(self, token: Optional[str] = None, chat_id: Optional[str] = None, enabled: bool = False,
+                 notifier: Optional[Notifier] = None):
+        if notifier is None:
+            channels = [TelegramChannel(token, chat_id)] if enabled and token and chat_id else []
+            notifier = Notifier(channels)
+        self.notifier = notifier
+        self.enabled = notifier.enabled
         self.total_wear_and_tear = Decimal('0')
 
-    def send_round_report(self, ticker: str, round_num: int, grvt_pnl: Decimal, pdex_pnl: Decimal, total_volume: Decimal):
-        if not self.enabled or not self.token or not self.chat_id:
+    def send_round_report(self, ticker: str, round_num: int, grvt_pnl: Decimal, pdex_pnl: Decimal, total_volume: Decimal,
+                          fees: Decimal = Decimal('0'), funding: Decimal = Decimal('0')):
+        """grvt_pnl / pdex_pnl 為實際成交計算的單邊盈虧，已扣除手續費並計入資金費 (見 hedge/pnl.py)"""
+        if not self.enabled:
             return
 
         round_wear = grvt_pnl + pdex_pnl
         self.total_wear_and_tear += round_wear
+        self.notifier.notify(RoundReport(ticker, round_num, grvt_pnl, pdex_pnl,
+                                         self.total_wear_and_tear, total_volume, fees, funding))
 
-        # 依照你要求的格式建構訊息
-        message = (
-            f"🔹 {ticker} 第 {round_num} 輪已結束\n"
-            f"━━━━━━━━━━━━━━\n"
-            f"💰 GRVT 平倉盈虧: {grvt_pnl:+.4f}\n"
-            f"💰 Paradex 平倉盈虧: {pdex_pnl:+.4f}\n"
-            f"--------------------------\n"
-            f"📉 此輪磨損(兩邊盈虧加總): {round_wear:+.4f}\n"
-            f"📊 目前總磨損: {self.total_wear_and_tear:+.4f}\n"
-            f"📈 目前總交易量: {total_volume:.2f} U"
-        )
+    def send_text(self, text: str, key: Optional[str] = None):
+        if self.enabled:
+            self.notifier.notify(text, key)
 
-        try:
-            url = f"https://api.telegram.org/bot{self.token}/sendMessage"
-            requests.post(url, json={"chat_id": self.chat_id, "text": message}, timeout=5)
-        except Exception as e:
-            print(f"Telegram 發送失敗: {e}")
\ No newline at end of file
+    async def close(self):
+        await self.notifier.close()
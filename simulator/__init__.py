@@ -0,0 +1,19 @@
+"""
+Offline exchange simulator for HedgeBot: matching engine, simulated clients and a virtual clock.
+"""
+
+from .clock import VirtualClockLoop, run_virtual
+from .exchange import LatencyModel, MatchingEngine, SimGrvtClient, SimParadexAccount, SimStats
+from .feeds import JsonlBookFeed, RandomWalkBookFeed
+
+__all__ = [
+    'VirtualClockLoop',
+    'run_virtual',
+    'LatencyModel',
+    'MatchingEngine',
+    'SimGrvtClient',
+    'SimParadexAccount',
+    'SimStats',
+    'JsonlBookFeed',
+    'RandomWalkBookFeed',
+]
@@ -0,0 +1,365 @@
+"""
+Parallel HedgeBot parameter sweeps over recorded GRVT/Paradex market data.
+
+    python -m simulator.backtest --data data/marketdata/md_20250101.gpmd --ticker BTC \\
+        --grid chase_interval=1,2,4 --grid holding_time=30,60 --grid quoting=fixed,adaptive --workers 8
+
+The source (a .gpmd recording, a book JSONL file, or a random walk when --data is omitted) is
+first prepared into a dataset directory:
+
+    grvt.gpmd     the GRVT book messages of the instrument, re-encoded with the raw codec so the
+                  columns are cast in place from the mmap (no decompression, no per-worker copy)
+    paradex.bbo   recorded Paradex BBO as flat int64 columns ts / bid / ask (fixed point, PRICE_SCALE)
+    meta.json     instrument names, time range and counts
+
+Every grid point runs the real HedgeBot state machine on a virtual clock (simulator.run) in a
+ProcessPoolExecutor worker. Workers open the dataset once and map it read-only, so all of them
+share the same page-cache pages however many points the sweep has. Hedges fill at the recorded
+Paradex BBO; without Paradex quotes they fall back to the GRVT mid +/- paradex_spread_bps / 2.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from marketdata import (
+    KIND_BBO,
+    SIDE_ASK,
+    SIDE_BID,
+    ChunkBuffer,
+    MarketDataReader,
+    MarketDataWriter,
+    from_fixed,
+)
+from marketdata.recorder import append_grvt_book
+
+from .exchange import LatencyModel
+from .run import SimConfig, make_feed, run_simulation
+
+BBO_MAGIC = b'GPBBO\x00\x01\x00'
+BBO_HEADER = struct.Struct('<8sQ')
+CHUNK_ROWS = 65536
+DEFAULT_DATASET_DIR = os.path.join('data', 'backtest')
+
+# SimConfig fields that can be swept, with their parsers ('none' disables optional values)
+SWEEP_PARAMS = {
+    'quantity': Decimal,
+    'chase_interval': float,
+    'holding_time': int,
+    'start_side': str,
+    'hedge_mode': str,
+    'hedge_window': float,
+    'min_hedge_size': Decimal,
+    'quoting': str,
+    'taker_deadline': float,
+    'paradex_slippage_bps': Decimal,
+    'paradex_spread_bps': Decimal,
+}
+
+# Columns of the result table: (metric, header, width, format)
+REPORT_COLUMNS = (
+    ('rounds', 'rounds', 6, ''),
+    ('time_to_fill_avg', 'fill_avg', 8, '.2f'),
+    ('time_to_fill_p95', 'fill_p95', 8, '.2f'),
+    ('time_to_hedge_p95', 'hedge_p95', 9, '.3f'),
+    ('requests_per_lot', 'req/lot', 7, '.2f'),
+    ('wear_per_round', 'wear/round', 10, '.4f'),
+    ('wear_per_volume_bps', 'wear_bps', 8, '.3f'),
+    ('exposure_avg_notional', 'expo_avg$', 9, '.2f'),
+    ('exposure_peak', 'expo_peak', 9, ''),
+    ('exposure_seconds_per_round', 'expo_s/rnd', 10, '.4f'),
+    ('wall_seconds', 'wall_s', 7, '.2f'),
+)
+
+
+# ==================== Dataset ====================
+
+def _paradex_bbo(reader: MarketDataReader, market: str) -> Iterator[Tuple[int, int, int]]:
+    """(ts, bid, ask) from the recorded Paradex BBO channel (a bid row followed by an ask row)."""
+    ts = bid = None
+    for symbol, row_ts, _, kind, side, price, _, first in reader.iter_rows():
+        if symbol != market or kind != KIND_BBO:
+            continue
+        if first:
+            ts, bid = row_ts, price if side == SIDE_BID else None
+        elif side == SIDE_ASK and ts == row_ts and bid and price:
+            yield ts, bid, price
+
+
+def _write_bbo(path: str, quotes: Iterable[Tuple[int, int, int]]) -> int:
+    columns = [array('q'), array('q'), array('q')]
+    for quote in sorted(quotes):
+        for column, value in zip(columns, quote):
+            column.append(value)
+    with open(path, 'wb') as f:
+        f.write(BBO_HEADER.pack(BBO_MAGIC, len(columns[0])))
+        for column in columns:
+            f.write(column.tobytes())
+    return len(columns[0])
+
+
+def prepare_dataset(out_dir: str, ticker: str, source: Optional[str] = None,
+                    base: Optional[SimConfig] = None, steps: int = 100_000) -> 'BacktestDataset':
+    """
+    Build a dataset directory from a .gpmd recording, a book JSONL file or (source=None) a
+    random walk of `steps` books drawn with `base`'s market settings. Reused as is when it was
+    already prepared from the same source file.
+    """
+    instrument = f"{ticker}_USDT_Perp"
+    market = f"{ticker}-USD-PERP"
+    meta_path = os.path.join(out_dir, 'meta.json')
+    cfg = replace(base or SimConfig(), ticker=ticker, book_path=source)
+    # What the dataset was built from: the source file, or the random-walk settings
+    origin = {'source': source, 'source_mtime': os.path.getmtime(source) if source else None}
+    if source is None:
+        origin.update(steps=steps, mid=str(cfg.mid), tick_size=str(cfg.tick_size), level_size=str(cfg.level_size),
+                      volatility_ticks=cfg.volatility_ticks, interval_ms=cfg.book_interval_ms, seed=cfg.seed)
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('origin') == origin and meta.get('instrument') == instrument:
+            return BacktestDataset(out_dir)
+
+    os.makedirs(out_dir, exist_ok=True)
+    if source is None:
+        feed = itertools.islice(make_feed(cfg), steps)
+    else:
+        feed = make_feed(cfg)
+
+    grvt_path = os.path.join(out_dir, 'grvt.gpmd')
+    if os.path.exists(grvt_path):
+        os.remove(grvt_path)
+    writer = MarketDataWriter(grvt_path, codec='raw')
+    buffer = ChunkBuffer()
+    messages = 0
+    start_ns = end_ns = None
+    try:
+        for message in feed:
+            ts = int(message.get('feed', {}).get('event_time') or 0)
+            append_grvt_book(buffer, f"grvt:{instrument}", message, ts)
+            start_ns = ts if start_ns is None else start_ns
+            end_ns = ts
+            messages += 1
+            if len(buffer) >= CHUNK_ROWS:
+                writer.write_chunk(buffer)
+                buffer = ChunkBuffer()
+        writer.write_chunk(buffer)
+    finally:
+        writer.close()
+
+    quotes = []
+    if source and source.endswith('.gpmd'):
+        with MarketDataReader(source) as reader:
+            quotes = list(_paradex_bbo(reader, f"paradex:{market}"))
+    n_quotes = _write_bbo(os.path.join(out_dir, 'paradex.bbo'), quotes)
+
+    meta = {
+        'instrument': instrument, 'market': market, 'origin': origin, 'messages': messages, 'paradex_quotes': n_quotes,
+        'start_ns': start_ns or 0, 'end_ns': end_ns or 0,
+    }
+    tmp = f"{meta_path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, meta_path)
+    return BacktestDataset(out_dir)
+
+
+class ParadexQuotes:
+    """
+    Recorded Paradex BBO mapped read-only; at(seconds) returns the last quote at or before
+    start_ns + seconds (the simulator's virtual clock starts at the first GRVT book).
+    """
+
+    def __init__(self, path: str, start_ns: int):
+        self.start_ns = start_ns
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n = BBO_HEADER.unpack_from(self._mm, 0)
+        if magic != BBO_MAGIC:
+            raise ValueError(f"{path} is not a Paradex BBO file")
+        view = memoryview(self._mm)[BBO_HEADER.size:]
+        self.ts, self.bid, self.ask = (view[i * n * 8:(i + 1) * n * 8].cast('q') for i in range(3))
+        self._last: Tuple[int, Optional[Tuple[Decimal, Decimal]]] = (-1, None)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def at(self, seconds: float) -> Optional[Tuple[Decimal, Decimal]]:
+        i = bisect_right(self.ts, self.start_ns + int(seconds * 1e9)) - 1
+        if i < 0:
+            return None
+        if self._last[0] != i:
+            self._last = (i, (Decimal(from_fixed(self.bid[i])), Decimal(from_fixed(self.ask[i]))))
+        return self._last[1]
+
+    def close(self) -> None:
+        for column in (self.ts, self.bid, self.ask):
+            column.release()
+        self._mm.close()
+        self._file.close()
+
+
+class BacktestDataset:
+    """A prepared dataset directory, opened read-only (cheap: only maps the files)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        self.instrument: str = self.meta['instrument']
+        self.reader = MarketDataReader(os.path.join(path, 'grvt.gpmd'))
+        self.quotes = ParadexQuotes(os.path.join(path, 'paradex.bbo'), self.meta['start_ns']) \
+            if self.meta.get('paradex_quotes') else None
+
+    @property
+    def seconds(self) -> float:
+        return (self.meta['end_ns'] - self.meta['start_ns']) / 1e9
+
+    def book_messages(self) -> Iterator[Dict[str, Any]]:
+        return self.reader.book_messages(f"grvt:{self.instrument}")
+
+    def close(self) -> None:
+        if self.quotes is not None:
+            self.quotes.close()
+        self.reader.close()
+
+
+# ==================== Sweep ====================
+
+def parse_grid(specs: Iterable[str]) -> Dict[str, List[Any]]:
+    """['chase_interval=1,2', 'quoting=fixed,adaptive'] -> {'chase_interval': [1.0, 2.0], ...}"""
+    grid: Dict[str, List[Any]] = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        name = name.strip().replace('-', '_')
+        if name not in SWEEP_PARAMS:
+            raise ValueError(f"cannot sweep {name!r}; choose from {', '.join(SWEEP_PARAMS)}")
+        parse = SWEEP_PARAMS[name]
+        grid[name] = [None if v.strip().lower() == 'none' else parse(v.strip()) for v in values.split(',')]
+    return grid
+
+
+def grid_points(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+_dataset: Optional[BacktestDataset] = None
+
+
+def _init_worker(path: str) -> None:
+    """Process initializer: map the dataset once per worker."""
+    global _dataset
+    _dataset = BacktestDataset(path)
+
+
+def _run_point(base: SimConfig, params: Dict[str, Any]) -> Dict[str, Any]:
+    cfg = replace(base, latency=replace(base.latency), **params)
+    return run_simulation(cfg, _dataset.book_messages(), paradex_quotes=_dataset.quotes)
+
+
+def run_sweep(dataset_path: str, base: SimConfig, grid: Dict[str, List[Any]],
+              workers: Optional[int] = None, on_result=None) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Run every grid point against the dataset on `workers` processes (default: CPU count) and
+    return (params, metrics) pairs in grid order. on_result(params, metrics) is called as
+    points complete.
+    """
+    points = grid_points(grid)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(points)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dataset_path,)) as pool:
+        futures = {pool.submit(_run_point, base, params): i for i, params in enumerate(points)}
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            if on_result:
+                on_result(points[i], results[i])
+    return list(zip(points, results))
+
+
+def _format_row(params: Dict[str, Any], metrics: Dict[str, Any], names: List[str]) -> str:
+    cells = [f"{str(params[name]):>14}" for name in names]
+    cells += [f"{metrics[key]:>{width}{fmt}}" for key, _, width, fmt in REPORT_COLUMNS]
+    return ' '.join(cells)
+
+
+def write_csv(path: str, results: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+    if not results:
+        return
+    param_names = list(results[0][0])
+    metric_names = list(results[0][1])
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(param_names + metric_names)
+        for params, metrics in results:
+            writer.writerow([params[n] for n in param_names] + [metrics[n] for n in metric_names])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel HedgeBot parameter sweep on recorded market data")
+    parser.add_argument("--data", type=str, default=None,
+                        help="Recorded .gpmd or book JSONL file (default: random walk of --steps books)")
+    parser.add_argument("--dataset-dir", type=str, default=None,
+                        help=f"Prepared dataset directory (default: {DEFAULT_DATASET_DIR}/<source>_<ticker>)")
+    parser.add_argument("--ticker", type=str, default="BTC")
+    parser.add_argument("--steps", type=int, default=100_000, help="Random-walk books when --data is omitted")
+    parser.add_argument("--grid", type=str, action="append", default=[],
+                        help=f"name=v1,v2 (repeatable); one of {', '.join(SWEEP_PARAMS)}")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--rounds", type=int, default=1000, help="Upper bound; recorded data may end first")
+    parser.add_argument("--size", type=str, default="0.01", help="Order quantity")
+    parser.add_argument("--tick-size", type=str, default="0.1")
+    parser.add_argument("--order-latency-ms", type=float, default=20.0)
+    parser.add_argument("--hedge-latency-ms", type=float, default=50.0)
+    parser.add_argument("--grvt-fee-bps", type=str, default="0")
+    parser.add_argument("--grvt-taker-fee-bps", type=str, default=None, help="Default: --grvt-fee-bps")
+    parser.add_argument("--paradex-fee-bps", type=str, default="0")
+    parser.add_argument("--csv", type=str, default=None, help="Also write every metric to this CSV file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ticker = args.ticker.upper()
+    base = SimConfig(
+        ticker=ticker, quantity=Decimal(args.size), rounds=args.rounds, tick_size=Decimal(args.tick_size),
+        latency=LatencyModel(order_ms=args.order_latency_ms, cancel_ms=args.order_latency_ms,
+                             hedge_ms=args.hedge_latency_ms, seed=args.seed),
+        grvt_fee_bps=Decimal(args.grvt_fee_bps),
+        grvt_taker_fee_bps=Decimal(args.grvt_taker_fee_bps) if args.grvt_taker_fee_bps is not None else None,
+        paradex_fee_bps=Decimal(args.paradex_fee_bps), seed=args.seed,
+    )
+    grid = parse_grid(args.grid) or {'chase_interval': [base.chase_interval]}
+
+    name = os.path.splitext(os.path.basename(args.data))[0] if args.data else f"randomwalk{args.steps}_s{args.seed}"
+    dataset_dir = args.dataset_dir or os.path.join(DEFAULT_DATASET_DIR, f"{name}_{ticker}")
+    start = time.perf_counter()
+    dataset = prepare_dataset(dataset_dir, ticker, args.data, base, steps=args.steps)
+    print(f"dataset {dataset_dir}: {dataset.meta['messages']} GRVT books, {dataset.meta['paradex_quotes']} "
+          f"Paradex quotes, {dataset.seconds / 3600:.1f}h ({time.perf_counter() - start:.1f}s to prepare)")
+    dataset.close()
+
+    names = list(grid)
+    print(' '.join([f"{n:>14}" for n in names] + [f"{header:>{width}}" for _, header, width, _ in REPORT_COLUMNS]))
+    start = time.perf_counter()
+    results = run_sweep(dataset_dir, base, grid, args.workers,
+                        on_result=lambda params, metrics: print(_format_row(params, metrics, names), flush=True))
+    print(f"{len(results)} runs in {time.perf_counter() - start:.1f}s")
+
+    best = max(results, key=lambda r: r[1]['wear_per_volume_bps'])
+    print(f"lowest wear per volume: {best[0]} ({best[1]['wear_per_volume_bps']:.3f} bps)")
+    if args.csv:
+        write_csv(args.csv, results)
+
+
+if __name__ == "__main__":
+    main()
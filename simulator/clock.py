@@ -0,0 +1,60 @@
+"""
+Virtual-clock asyncio event loop for simulations.
+"""
+
+import asyncio
+import selectors
+
+
+class _InstantSelector(selectors.DefaultSelector):
+    """
+    Selector that never blocks: whenever the loop would wait for its next timer,
+    the virtual clock jumps forward by that timeout instead.
+    """
+
+    def __init__(self, loop_ref: list):
+        super().__init__()
+        self._loop_ref = loop_ref
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if not events and timeout is not None and timeout > 0:
+            self._loop_ref[0]._virtual_time += timeout
+        return events
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose time() is virtual. asyncio.sleep / wait_for / call_later complete
+    as soon as nothing else is runnable, so hours of strategy time run in seconds and
+    the schedule is deterministic for a given input.
+
+    Only meant for code that does no real I/O and starts no threads: a worker thread
+    would keep running in wall-clock time while virtual time races ahead.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        loop_ref: list = [None]
+        super().__init__(selector=_InstantSelector(loop_ref))
+        loop_ref[0] = self
+        self._virtual_time = start_time
+
+    def time(self) -> float:
+        return self._virtual_time
+
+
+def run_virtual(coro, start_time: float = 0.0):
+    """asyncio.run() equivalent on a VirtualClockLoop."""
+    loop = VirtualClockLoop(start_time)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        try:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
@@ -0,0 +1,540 @@
+"""
+Simulated GRVT / Paradex stand-ins for running HedgeBot offline.
+
+MatchingEngine keeps the replayed GRVT book (LocalOrderBook) and the bot's resting
+post-only orders; IOC taker orders walk the replayed depth. SimGrvtClient and SimParadexAccount implement the parts of
+GrvtHedgeClient and ParadexAccount that HedgeBot uses, with injected latency. Both report their
+fills in the exchanges' own formats (GRVT fill feed, Paradex /fills results) for hedge/pnl.py.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from exchanges.base import OrderInfo, OrderResult
+from exchanges.orderbook import LocalOrderBook
+
+BPS = Decimal('0.0001')
+
+
+@dataclass
+class LatencyModel:
+    """One-way latencies in milliseconds, each sample adds uniform jitter in [0, jitter_ms]."""
+    order_ms: float = 20.0
+    cancel_ms: float = 20.0
+    hedge_ms: float = 50.0
+    jitter_ms: float = 5.0
+    seed: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def sample(self, base_ms: float) -> float:
+        return (base_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+
+
+@dataclass
+class SimOrder:
+    order_id: str
+    side: str
+    price: Decimal
+    size: Decimal
+    remaining: Decimal
+    # Displayed size in front of us, and the displayed level size when last seen
+    queue_ahead: Decimal
+    level_size: Decimal
+    status: str = 'OPEN'
+    filled: Decimal = Decimal('0')
+    taker: bool = False
+
+
+class SimStats:
+    """Fill rate, time-to-hedge, wear ("磨損") and unhedged inventory collected from simulated fills."""
+
+    def __init__(self, grvt_fee_bps: Decimal = Decimal('0'), paradex_fee_bps: Decimal = Decimal('0'),
+                 grvt_taker_fee_bps: Optional[Decimal] = None):
+        self.grvt_fee_bps = grvt_fee_bps
+        self.grvt_taker_fee_bps = grvt_fee_bps if grvt_taker_fee_bps is None else grvt_taker_fee_bps
+        self.paradex_fee_bps = paradex_fee_bps
+
+        self.grvt_orders = 0
+        self.grvt_rejects = 0
+        self.grvt_cancels = 0
+        self.grvt_taker_orders = 0
+        self.grvt_taker_qty = Decimal('0')
+        self.grvt_filled_orders = 0
+        self.grvt_fill_qty = Decimal('0')
+        self.paradex_orders = 0
+        self.paradex_fill_qty = Decimal('0')
+
+        self.grvt_cash = Decimal('0')
+        self.paradex_cash = Decimal('0')
+        self.fees = Decimal('0')
+        self.grvt_position = Decimal('0')
+        self.paradex_position = Decimal('0')
+        self.volume = Decimal('0')
+
+        # Unhedged GRVT lots (time, signed size) matched FIFO by Paradex fills
+        self._unhedged: Deque[List[Any]] = deque()
+        self.hedge_latencies: List[float] = []
+
+        # Net exposure (GRVT + Paradex position) integrated over time, and its peak
+        self.exposure_area = 0.0
+        self.exposure_peak = Decimal('0')
+        self._exposure_since = 0.0
+
+    def _mark_exposure(self, now: float) -> None:
+        """Accumulate the exposure held since the last fill; call before changing a position."""
+        self.exposure_area += float(abs(self.grvt_position + self.paradex_position)) * (now - self._exposure_since)
+        self._exposure_since = now
+
+    def record_grvt_fill(self, now: float, side: str, price: Decimal, size: Decimal, taker: bool = False) -> Decimal:
+        """Returns the fee charged on the fill."""
+        signed = size if side == 'buy' else -size
+        fee = size * price * (self.grvt_taker_fee_bps if taker else self.grvt_fee_bps) * BPS
+        self._mark_exposure(now)
+        self.grvt_fill_qty += size
+        self.grvt_position += signed
+        self.exposure_peak = max(self.exposure_peak, abs(self.grvt_position + self.paradex_position))
+        self.grvt_cash -= signed * price
+        self.fees += fee
+        if taker:
+            self.grvt_taker_qty += size
+        self.volume += size * price
+        self._unhedged.append([now, signed])
+        return fee
+
+    def record_paradex_fill(self, now: float, side: str, price: Decimal, size: Decimal) -> Decimal:
+        """Returns the fee charged on the fill."""
+        signed = size if side.lower() == 'buy' else -size
+        fee = size * price * self.paradex_fee_bps * BPS
+        self._mark_exposure(now)
+        self.paradex_orders += 1
+        self.paradex_fill_qty += size
+        self.paradex_position += signed
+        self.exposure_peak = max(self.exposure_peak, abs(self.grvt_position + self.paradex_position))
+        self.paradex_cash -= signed * price
+        self.fees += fee
+        self.volume += size * price
+
+        # A hedge offsets GRVT lots of the opposite sign, oldest first
+        remaining = -signed
+        while remaining and self._unhedged and (self._unhedged[0][1] > 0) == (remaining > 0):
+            lot = self._unhedged[0]
+            matched = min(abs(lot[1]), abs(remaining))
+            self.hedge_latencies.append(now - lot[0])
+            step = matched if remaining > 0 else -matched
+            lot[1] -= step
+            remaining -= step
+            if lot[1] == 0:
+                self._unhedged.popleft()
+        return fee
+
+    def summary(self, rounds: int, mark_price: Decimal, lot_size: Optional[Decimal] = None,
+                duration: float = 0.0) -> Dict[str, Any]:
+        """`duration` (seconds simulated) turns the exposure integral into a time-weighted average."""
+        latencies = sorted(self.hedge_latencies)
+        if duration > self._exposure_since:
+            self._mark_exposure(duration)
+
+        def pct(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+
+        # Open positions are marked at the last mid
+        wear = (self.grvt_cash + self.paradex_cash - self.fees
+                + (self.grvt_position + self.paradex_position) * mark_price)
+        accepted = self.grvt_orders - self.grvt_rejects
+        # Every GRVT request (post-only, IOC, cancel) per lot of order quantity filled
+        requests = self.grvt_orders + self.grvt_taker_orders + self.grvt_cancels
+        lots = self.grvt_fill_qty / lot_size if lot_size else Decimal('0')
+        return {
+            'rounds': rounds,
+            'grvt_orders': self.grvt_orders,
+            'grvt_cancels': self.grvt_cancels,
+            'grvt_taker_orders': self.grvt_taker_orders,
+            'grvt_requests': requests,
+            'requests_per_lot': float(requests / lots) if lots else 0.0,
+            'taker_share': float(self.grvt_taker_qty / self.grvt_fill_qty) if self.grvt_fill_qty else 0.0,
+            'post_only_reject_rate': self.grvt_rejects / self.grvt_orders if self.grvt_orders else 0.0,
+            'fill_rate': self.grvt_filled_orders / accepted if accepted else 0.0,
+            'grvt_fill_qty': self.grvt_fill_qty,
+            'paradex_orders': self.paradex_orders,
+            'time_to_hedge_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'time_to_hedge_p50': pct(0.5),
+            'time_to_hedge_p95': pct(0.95),
+            'fees': self.fees,
+            'wear': wear,
+            'wear_per_round': wear / rounds if rounds else Decimal('0'),
+            'volume': self.volume,
+            # Wear per unit of traded notional (both venues), in bps
+            'wear_per_volume_bps': float(wear / self.volume / BPS) if self.volume else 0.0,
+            'residual_exposure': self.grvt_position + self.paradex_position,
+            # Inventory risk: unhedged size held between a GRVT fill and its Paradex hedge
+            'exposure_avg': self.exposure_area / duration if duration else 0.0,
+            'exposure_avg_notional': self.exposure_area / duration * float(mark_price) if duration else 0.0,
+            'exposure_peak': self.exposure_peak,
+            'exposure_seconds_per_round': self.exposure_area / rounds if rounds else 0.0,
+        }
+
+
+class MatchingEngine:
+    """
+    GRVT book replay plus our resting post-only orders.
+
+    - post-only orders that would cross the replayed book are rejected
+    - an order fills (possibly partially) when the opposite side trades through its price,
+      limited by the displayed size at or better than the price
+    - with queue_depletion, size leaving our price level while it is the best level first
+      consumes the queue in front of us and then fills us; cancels in front of us are counted
+      as trades, which is optimistic. Size leaving a level behind the best only moves us up
+      the queue (trades happen at the top of the book).
+    """
+
+    def __init__(self, instrument: str, tick_size: Decimal, stats: SimStats, queue_depletion: bool = True):
+        self.instrument = instrument
+        self.tick_size = tick_size
+        self.stats = stats
+        self.queue_depletion = queue_depletion
+        # Replayed on the virtual clock: wall-clock staleness does not apply
+        self.book = LocalOrderBook(instrument, max_age=None)
+        self.orders: Dict[str, SimOrder] = {}
+        self.fill_listeners: List[Callable[[SimOrder, Decimal, Decimal], None]] = []
+        self.book_listeners: List[Callable[[], None]] = []
+        self._next_id = 0
+
+    def on_book_message(self, message: Dict[str, Any]) -> None:
+        self.book.on_message(message)
+        if self.orders:
+            self._match()
+        for listener in self.book_listeners:
+            listener()
+
+    def place_post_only(self, side: str, price: Decimal, size: Decimal) -> SimOrder:
+        self._next_id += 1
+        self.stats.grvt_orders += 1
+        best_bid, best_ask = self.book.bbo()
+        crosses = (best_ask > 0 and price >= best_ask) if side == 'buy' else (best_bid > 0 and price <= best_bid)
+        level_size = self.book.size_at(side, price)
+        order = SimOrder(order_id=str(self._next_id), side=side, price=price, size=size, remaining=size,
+                         queue_ahead=level_size, level_size=level_size)
+        if crosses or size <= 0:
+            order.status = 'REJECTED'
+            self.stats.grvt_rejects += 1
+            return order
+        self.orders[order.order_id] = order
+        return order
+
+    def take(self, side: str, size: Decimal, limit_price: Decimal) -> SimOrder:
+        """
+        IOC order: fills against the displayed opposite depth up to limit_price, the rest is
+        cancelled. The replayed book is not modified, so repeated takes see the same depth.
+        """
+        self._next_id += 1
+        self.stats.grvt_taker_orders += 1
+        order = SimOrder(order_id=str(self._next_id), side=side, price=limit_price, size=size, remaining=size,
+                         queue_ahead=Decimal('0'), level_size=Decimal('0'), taker=True)
+        opposite = 'sell' if side == 'buy' else 'buy'
+        fills: List[Tuple[Decimal, Decimal]] = []
+        for price, level_size in self.book.depth(opposite, 50):
+            if order.remaining <= 0:
+                break
+            if (side == 'buy' and price > limit_price) or (side == 'sell' and price < limit_price):
+                break
+            filled = min(order.remaining, level_size)
+            order.remaining -= filled
+            order.filled += filled
+            fills.append((price, filled))
+        order.status = 'FILLED' if order.remaining <= 0 else 'CANCELLED'
+        for price, filled in fills:
+            for listener in self.fill_listeners:
+                listener(order, price, filled)
+        return order
+
+    def cancel(self, order_id: str) -> bool:
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order.status = 'CANCELLED'
+        return True
+
+    def cancel_all(self) -> None:
+        for order_id in list(self.orders):
+            self.cancel(order_id)
+
+    def _match(self) -> None:
+        for order in list(self.orders.values()):
+            opposite = 'sell' if order.side == 'buy' else 'buy'
+            crossing = Decimal('0')
+            for price, size in self.book.depth(opposite, 50):
+                if (order.side == 'buy' and price > order.price) or (order.side == 'sell' and price < order.price):
+                    break
+                crossing += size
+            if crossing > 0:
+                self._fill(order, min(order.remaining, crossing))
+                continue
+            if not self.queue_depletion:
+                continue
+
+            level_size = self.book.size_at(order.side, order.price)
+            best = self.book.best_bid() if order.side == 'buy' else self.book.best_ask()
+            if level_size < order.level_size:
+                traded = order.level_size - level_size
+                if traded > order.queue_ahead and order.price == best:
+                    self._fill(order, min(order.remaining, traded - order.queue_ahead))
+                order.queue_ahead = max(Decimal('0'), order.queue_ahead - traded)
+            # Size added to the level queues behind us
+            order.level_size = level_size
+
+    def _fill(self, order: SimOrder, size: Decimal) -> None:
+        if order.filled == 0:
+            self.stats.grvt_filled_orders += 1
+        order.remaining -= size
+        order.filled += size
+        if order.remaining <= 0:
+            order.status = 'FILLED'
+            self.orders.pop(order.order_id, None)
+        for listener in self.fill_listeners:
+            listener(order, order.price, size)
+
+
+class SimGrvtClient:
+    """GrvtHedgeClient surface used by HedgeBot, backed by MatchingEngine."""
+
+    # The replayed book does not contain our own resting orders
+    book_includes_own_orders = False
+
+    def __init__(self, engine: MatchingEngine, config, latency: LatencyModel):
+        self.engine = engine
+        self.config = config
+        self.latency = latency
+        self.config.contract_id = engine.instrument
+        self.config.tick_size = engine.tick_size
+
+        self.order_book = engine.book
+        self.position = Decimal('0')
+        self._position_event = asyncio.Event()
+        self._update_event = asyncio.Event()
+        self._position_listeners: List[Callable[[Decimal], None]] = []
+        self._fill_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._next_trade_id = 0
+        # fill_history results; event_time is wall-clock ns at the start plus virtual time
+        self.fills: List[Dict[str, Any]] = []
+        self._epoch_ns = time.time_ns()
+        self._live_order: Optional[OrderInfo] = None
+        self.presigned_orders = None
+        engine.fill_listeners.append(self._on_fill)
+        engine.book_listeners.append(self._update_event.set)
+
+    # ---- lifecycle (no-ops offline) ----
+
+    async def get_contract_attributes(self) -> Tuple[str, Decimal]:
+        return self.config.contract_id, self.config.tick_size
+
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def start_position_tracking(self, reconcile: bool = True) -> None:
+        pass
+
+    async def start_order_book(self) -> None:
+        pass
+
+    def start_presigned_orders(self, neighbour_ticks: int = 1) -> None:
+        pass
+
+    # ---- market data / position ----
+
+    async def fetch_bbo_prices(self, contract_id: str) -> Tuple[Decimal, Decimal]:
+        return self.engine.book.bbo()
+
+    @property
+    def live_order(self) -> Optional[OrderInfo]:
+        return self._live_order
+
+    async def wait_for_update(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._update_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._update_event.clear()
+
+    async def get_account_positions(self) -> Decimal:
+        return self.position
+
+    async def fetch_fill_history(self, since_ns: int) -> List[Dict[str, Any]]:
+        return [f for f in self.fills if int(f['event_time']) >= since_ns]
+
+    def apply_position_snapshot(self, size: Decimal, source: str = "reconcile") -> None:
+        if size != self.position:
+            self.position = size
+            self._position_event.set()
+            for callback in self._position_listeners:
+                callback(size)
+
+    def add_position_listener(self, callback: Callable[[Decimal], None]) -> None:
+        self._position_listeners.append(callback)
+
+    def add_fill_listener(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        self._fill_listeners.append(callback)
+
+    def add_funding_listener(self, callback: Callable[[Decimal], None]) -> None:
+        # No funding offline
+        pass
+
+    async def wait_for_position_change(self, timeout: float) -> Decimal:
+        try:
+            await asyncio.wait_for(self._position_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._position_event.clear()
+        return self.position
+
+    def _on_fill(self, order: SimOrder, price: Decimal, size: Decimal) -> None:
+        now = asyncio.get_running_loop().time()
+        fee = self.engine.stats.record_grvt_fill(now, order.side, price, size, taker=order.taker)
+        self._next_trade_id += 1
+        feed = {'instrument': self.engine.instrument, 'is_buyer': order.side == 'buy', 'is_taker': order.taker,
+                'size': str(size), 'price': str(price), 'fee': str(fee), 'trade_id': str(self._next_trade_id),
+                'order_id': order.order_id, 'event_time': str(self._epoch_ns + int(now * 1e9))}
+        self.fills.append(feed)
+        for callback in self._fill_listeners:
+            callback(feed)
+        self.position += size if order.side == 'buy' else -size
+        self._position_event.set()
+        self._update_event.set()
+        for callback in self._position_listeners:
+            callback(self.position)
+        if self._live_order is not None and self._live_order.order_id == order.order_id:
+            if order.status == 'FILLED':
+                self._live_order = None
+            else:
+                self._live_order.size = order.remaining
+
+    # ---- orders ----
+
+    async def cancel_all_orders(self, contract_id: str) -> bool:
+        self.engine.cancel_all()
+        self._live_order = None
+        return True
+
+    async def _cancel(self, order_id: str) -> OrderResult:
+        await asyncio.sleep(self.latency.sample(self.latency.cancel_ms))
+        self.engine.stats.grvt_cancels += 1
+        ok = self.engine.cancel(order_id)
+        return OrderResult(success=ok, order_id=order_id, error_message=None if ok else 'order not open')
+
+    async def _place(self, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
+        await asyncio.sleep(self.latency.sample(self.latency.order_ms))
+        order = self.engine.place_post_only(side, price, quantity)
+        return OrderResult(success=order.status != 'REJECTED', order_id=order.order_id, side=side,
+                           size=quantity, price=price, status=order.status,
+                           error_message='post-only would cross' if order.status == 'REJECTED' else None)
+
+    async def replace_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str) -> OrderResult:
+        live = self._live_order
+        if live is not None and live.side == side and live.price == price:
+            return OrderResult(success=True, order_id=live.order_id, side=side, size=live.size,
+                               price=price, status=live.status)
+        if live is not None:
+            # Same sequence as GrvtHedgeClient.replace_order: confirm the cancel before placing
+            self._live_order = None
+            cancel_result = await self._cancel(live.order_id)
+            if not cancel_result.success:
+                return OrderResult(success=False, side=side, size=quantity, price=price,
+                                   error_message=f"cancel failed: {cancel_result.error_message}")
+            if live.side == side:
+                quantity = min(quantity, live.size)
+        result = await self._place(quantity, price, side)
+
+        order = self.engine.orders.get(result.order_id) if result.success else None
+        self._live_order = OrderInfo(order_id=result.order_id, side=side, size=quantity, price=price,
+                                     status=order.status) if order is not None else None
+        return result
+
+    async def place_taker_order(self, contract_id: str, quantity: Decimal, price: Decimal, side: str,
+                                reduce_only: bool = False) -> OrderResult:
+        await asyncio.sleep(self.latency.sample(self.latency.order_ms))
+        if reduce_only:
+            # Only the part that reduces the position at arrival is accepted
+            reducible = abs(self.position) if (side == 'sell') == (self.position > 0) else Decimal('0')
+            quantity = min(quantity, reducible)
+            if quantity <= 0:
+                return OrderResult(success=False, side=side, size=Decimal('0'), price=price, status='REJECTED',
+                                   error_message='reduce-only order would increase the position')
+        order = self.engine.take(side, quantity, price)
+        return OrderResult(success=order.filled > 0, order_id=order.order_id, side=side, size=order.filled,
+                           price=price, status=order.status,
+                           error_message=None if order.filled > 0 else 'no liquidity within limit price')
+
+    async def cancel_live_order(self) -> None:
+        if self._live_order is None:
+            return
+        order_id = self._live_order.order_id
+        self._live_order = None
+        await self._cancel(order_id)
+
+
+class SimParadexAccount:
+    """
+    ParadexAccount surface used by HedgeBot. Market orders fill at the recorded Paradex BBO when
+    `quotes` is given (any object with at(seconds) -> (bid, ask) or None, seconds on the virtual
+    clock), otherwise at the replayed GRVT mid +/- spread_bps / 2; slippage_bps applies to both.
+    """
+
+    def __init__(self, engine: MatchingEngine, latency: LatencyModel, spread_bps: Decimal = Decimal('1'),
+                 slippage_bps: Decimal = Decimal('0'), reject_rate: float = 0.0, seed: int = 0,
+                 quotes=None):
+        self.engine = engine
+        self.quotes = quotes
+        self.latency = latency
+        self.spread_bps = spread_bps
+        self.slippage_bps = slippage_bps
+        self.reject_rate = reject_rate
+        self._rng = random.Random(seed)
+        self._next_id = 0
+        # /fills results; created_at is wall-clock ms at the start plus virtual time
+        self.fills: List[Dict[str, Any]] = []
+        self._epoch_ms = int(time.time() * 1000)
+
+    async def place_market_order_async(self, market: str, side: str, size: Decimal,
+                                       reduce_only: bool = False) -> Optional[dict]:
+        await asyncio.sleep(self.latency.sample(self.latency.hedge_ms))
+        if self._rng.random() < self.reject_rate:
+            raise Exception("simulated Paradex rejection")
+        now = asyncio.get_running_loop().time()
+        quote = self.quotes.at(now) if self.quotes is not None else None
+        if quote is not None:
+            bid, ask = quote
+            offset = self.slippage_bps * BPS
+            price = ask * (1 + offset) if side.upper() == 'BUY' else bid * (1 - offset)
+        else:
+            best_bid, best_ask = self.engine.book.bbo()
+            mid = (best_bid + best_ask) / 2
+            offset = (self.spread_bps / 2 + self.slippage_bps) * BPS
+            price = mid * (1 + offset) if side.upper() == 'BUY' else mid * (1 - offset)
+        fee = self.engine.stats.record_paradex_fill(now, side, price, size)
+        self._next_id += 1
+        self.fills.append({'id': f"f{self._next_id}", 'order_id': str(self._next_id), 'market': market,
+                           'side': side.upper(), 'size': str(size), 'price': str(price), 'fee': str(fee),
+                           'realized_funding': '0', 'created_at': self._epoch_ms + int(now * 1000)})
+        return {"id": str(self._next_id)}
+
+    async def fetch_fills_async(self, market: str, start_at: int, page_size: int = 100) -> List[dict]:
+        return [f for f in self.fills if f['market'] == market and f['created_at'] >= start_at]
+
+    def fetch_position(self, market: str) -> Decimal:
+        return self.engine.stats.paradex_position
+
+    async def fetch_position_async(self, market: str) -> Decimal:
+        return self.engine.stats.paradex_position
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,83 @@
+"""
+Order book message sources for the simulator.
+
+A feed is any iterable of GRVT book WebSocket messages
+({stream, sequence_number, prev_sequence_number, feed: {instrument, event_time, bids, asks}}),
+ordered by feed.event_time (unix ns).
+"""
+
+import json
+import random
+from decimal import Decimal
+from itertools import count
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _levels(prices: List[Decimal], sizes: List[Decimal]) -> List[Dict[str, str]]:
+    return [{'price': str(p), 'size': str(s), 'num_orders': 1} for p, s in zip(prices, sizes)]
+
+
+class RandomWalkBookFeed:
+    """
+    Seeded synthetic book.s snapshots: the mid does a random walk in whole ticks and
+    level sizes are redrawn every step, so queues in front of resting orders shrink
+    and grow. Deterministic for a given seed; endless when steps is None.
+    """
+
+    def __init__(self, instrument: str, mid: Decimal, tick_size: Decimal, steps: Optional[int] = None,
+                 interval_ms: int = 250, spread_ticks: int = 1, levels: int = 10,
+                 level_size: Decimal = Decimal('1'), volatility_ticks: float = 1.0,
+                 start_ns: int = 0, seed: int = 0):
+        self.instrument = instrument
+        self.mid = mid
+        self.tick_size = tick_size
+        self.steps = steps
+        self.interval_ns = interval_ms * 1_000_000
+        self.spread_ticks = spread_ticks
+        self.levels = levels
+        self.level_size = level_size
+        self.volatility_ticks = volatility_ticks
+        self.start_ns = start_ns
+        self.seed = seed
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        rng = random.Random(self.seed)
+        tick = self.tick_size
+        best_bid = (self.mid / tick).to_integral_value() * tick
+        for step in (range(self.steps) if self.steps is not None else count()):
+            move = round(rng.gauss(0, self.volatility_ticks))
+            best_bid = max(tick, best_bid + tick * move)
+            best_ask = best_bid + tick * self.spread_ticks
+            bid_prices = [best_bid - tick * i for i in range(self.levels) if best_bid - tick * i > 0]
+            ask_prices = [best_ask + tick * i for i in range(self.levels)]
+            sizes = [(self.level_size * Decimal(str(round(rng.uniform(0.2, 2.0), 2))))
+                     for _ in range(len(bid_prices) + len(ask_prices))]
+            yield {
+                'stream': 'v1.book.s',
+                'sequence_number': str(step + 1),
+                'prev_sequence_number': '0',
+                'feed': {
+                    'instrument': self.instrument,
+                    'event_time': str(self.start_ns + step * self.interval_ns),
+                    'bids': _levels(bid_prices, sizes[:len(bid_prices)]),
+                    'asks': _levels(ask_prices, sizes[len(bid_prices):]),
+                },
+            }
+
+
+class JsonlBookFeed:
+    """Recorded WebSocket book.s / book.d messages, one JSON object per line."""
+
+    def __init__(self, path: str, instrument: str = ''):
+        self.path = path
+        self.instrument = instrument
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if self.instrument and message.get('feed', {}).get('instrument') != self.instrument:
+                    continue
+                yield message
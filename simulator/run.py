@@ -0,0 +1,205 @@
+"""
+Offline HedgeBot simulation on a virtual clock.
+
+    python -m simulator.run --rounds 200 --chase-interval 1,2,4 --holding-time 30,60
+    python -m simulator.run --rounds 200 --quoting fixed,adaptive --taker-deadline 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
+
+from hedge.hedge_mode_grvtparadex import CHASE_INTERVAL, HedgeBot
+from helpers.latency import LatencyRecorder
+
+from .clock import run_virtual
+from .exchange import LatencyModel, MatchingEngine, SimGrvtClient, SimParadexAccount, SimStats
+from .feeds import JsonlBookFeed, RandomWalkBookFeed
+
+
+@dataclass
+class SimConfig:
+    ticker: str = 'BTC'
+    quantity: Decimal = Decimal('0.01')
+    rounds: int = 100
+    chase_interval: float = CHASE_INTERVAL
+    holding_time: int = 60
+    start_side: str = 'buy'
+    hedge_mode: str = 'full'
+    hedge_window: float = 0.2
+    min_hedge_size: Decimal = Decimal('0')
+    quoting: str = 'adaptive'
+    taker_deadline: Optional[float] = None
+
+    # Market: random-walk book unless book_path (recorded JSONL or .gpmd) is given
+    book_path: Optional[str] = None
+    mid: Decimal = Decimal('60000')
+    tick_size: Decimal = Decimal('0.1')
+    book_interval_ms: int = 250
+    volatility_ticks: float = 1.0
+    level_size: Decimal = Decimal('0.5')
+    queue_depletion: bool = True
+
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    grvt_fee_bps: Decimal = Decimal('0')
+    grvt_taker_fee_bps: Optional[Decimal] = None
+    paradex_fee_bps: Decimal = Decimal('0')
+    paradex_spread_bps: Decimal = Decimal('1')
+    paradex_slippage_bps: Decimal = Decimal('0')
+    paradex_reject_rate: float = 0.0
+    seed: int = 0
+
+    @property
+    def instrument(self) -> str:
+        return f"{self.ticker}_USDT_Perp"
+
+
+def make_feed(cfg: SimConfig) -> Iterable[Dict[str, Any]]:
+    if cfg.book_path and cfg.book_path.endswith('.gpmd'):
+        from marketdata import MarketDataReader
+        return MarketDataReader(cfg.book_path).book_messages(f"grvt:{cfg.instrument}")
+    if cfg.book_path:
+        return JsonlBookFeed(cfg.book_path, cfg.instrument)
+    return RandomWalkBookFeed(cfg.instrument, cfg.mid, cfg.tick_size, interval_ms=cfg.book_interval_ms,
+                              level_size=cfg.level_size, volatility_ticks=cfg.volatility_ticks, seed=cfg.seed)
+
+
+async def _replay(feed: Iterable[Dict[str, Any]], engine: MatchingEngine, bot: HedgeBot) -> None:
+    """Apply book messages at their event_time on the virtual clock (first message at t=0)."""
+    loop = asyncio.get_running_loop()
+    t0: Optional[int] = None
+    for message in feed:
+        event_ns = int(message.get('feed', {}).get('event_time') or 0)
+        if t0 is None:
+            t0 = event_ns
+        delay = (event_ns - t0) / 1e9 - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        engine.on_book_message(message)
+    # Recorded data exhausted: let the bot finish its current step and stop
+    bot.stop_flag = True
+
+
+async def _simulate(cfg: SimConfig, feed: Iterable[Dict[str, Any]], paradex_quotes=None) -> Dict[str, Any]:
+    stats = SimStats(grvt_fee_bps=cfg.grvt_fee_bps, paradex_fee_bps=cfg.paradex_fee_bps,
+                     grvt_taker_fee_bps=cfg.grvt_taker_fee_bps)
+    loop = asyncio.get_running_loop()
+    # Bot-level latency on the virtual clock, kept apart from the process-wide recorder
+    latency = LatencyRecorder(clock=lambda: int(loop.time() * 1e9))
+    engine = MatchingEngine(cfg.instrument, cfg.tick_size, stats, queue_depletion=cfg.queue_depletion)
+
+    bot = HedgeBot(ticker=cfg.ticker, order_quantity=cfg.quantity, iterations=cfg.rounds,
+                   start_side=cfg.start_side, holding_time=cfg.holding_time, hedge_mode=cfg.hedge_mode,
+                   hedge_window=cfg.hedge_window, min_hedge_size=cfg.min_hedge_size,
+                   chase_interval=cfg.chase_interval, latency=latency, quoting=cfg.quoting,
+                   taker_deadline=cfg.taker_deadline, journal=False)
+    bot.tg_reporter.enabled = False
+    bot.logger.setLevel(logging.WARNING)
+    grvt_config = type('Config', (), {
+        'ticker': cfg.ticker, 'quantity': cfg.quantity, 'tick_size': cfg.tick_size, 'contract_id': None
+    })
+    bot.grvt_client = SimGrvtClient(engine, grvt_config, cfg.latency)
+    bot.paradex_account = SimParadexAccount(engine, cfg.latency, spread_bps=cfg.paradex_spread_bps,
+                                            slippage_bps=cfg.paradex_slippage_bps,
+                                            reject_rate=cfg.paradex_reject_rate, seed=cfg.seed,
+                                            quotes=paradex_quotes)
+
+    replay = asyncio.create_task(_replay(feed, engine, bot))
+    # Wait for the first book before quoting
+    while not engine.book.is_ready() and not replay.done():
+        await asyncio.sleep(0.001)
+    try:
+        await bot.trading_loop()
+    finally:
+        replay.cancel()
+        if bot._hedge_task:
+            bot._hedge_task.cancel()
+        if bot.fill_poller is not None:
+            bot.fill_poller.stop()
+
+    best_bid, best_ask = engine.book.bbo()
+    # Recorded data can run out before cfg.rounds; per-round figures use the rounds completed
+    rounds = bot.pnl.rounds
+    result = stats.summary(rounds, (best_bid + best_ask) / 2, lot_size=cfg.quantity, duration=loop.time())
+    time_to_fill = latency.get("time_to_fill", "grvt")
+    result['time_to_fill_avg'] = time_to_fill.mean / 1e9 if time_to_fill and time_to_fill.count else 0.0
+    result['time_to_fill_p95'] = time_to_fill.percentile(0.95) / 1e9 if time_to_fill and time_to_fill.count else 0.0
+    # Wear of completed rounds as HedgeBot itself accounts it from the fill reports
+    result['fill_wear'] = bot.pnl.total_wear
+    result['sim_seconds'] = asyncio.get_running_loop().time()
+    return result
+
+
+def run_simulation(cfg: SimConfig, feed: Optional[Iterable[Dict[str, Any]]] = None,
+                   paradex_quotes=None) -> Dict[str, Any]:
+    """
+    Run one simulation on a fresh virtual-clock loop and return its metrics. `paradex_quotes`
+    prices the hedges at recorded Paradex quotes (see SimParadexAccount).
+    """
+    start = time.perf_counter()
+    result = run_virtual(_simulate(cfg, feed if feed is not None else make_feed(cfg), paradex_quotes))
+    result['wall_seconds'] = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline GRVT/Paradex HedgeBot simulation")
+    parser.add_argument("--ticker", type=str, default="BTC")
+    parser.add_argument("--size", type=str, default="0.01", help="Order quantity")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--chase-interval", type=str, default=str(CHASE_INTERVAL),
+                        help="Seconds, comma separated to compare several values")
+    parser.add_argument("--holding-time", type=str, default="60", help="Seconds, comma separated")
+    parser.add_argument("--hedge-mode", type=str, default="full", choices=["full", "incremental"])
+    parser.add_argument("--quoting", type=str, default="adaptive",
+                        help="adaptive / fixed, comma separated to compare both")
+    parser.add_argument("--taker-deadline", type=float, default=None,
+                        help="Seconds before the adaptive quoter crosses the spread with IOC (default: never)")
+    parser.add_argument("--book", type=str, default=None, help="Recorded book.s/book.d JSONL or .gpmd file to replay")
+    parser.add_argument("--mid", type=str, default="60000", help="Random-walk start price")
+    parser.add_argument("--tick-size", type=str, default="0.1")
+    parser.add_argument("--volatility-ticks", type=float, default=1.0)
+    parser.add_argument("--order-latency-ms", type=float, default=20.0)
+    parser.add_argument("--hedge-latency-ms", type=float, default=50.0)
+    parser.add_argument("--grvt-fee-bps", type=str, default="0")
+    parser.add_argument("--grvt-taker-fee-bps", type=str, default=None, help="Default: --grvt-fee-bps")
+    parser.add_argument("--paradex-fee-bps", type=str, default="0")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base = SimConfig(
+        ticker=args.ticker.upper(), quantity=Decimal(args.size), rounds=args.rounds,
+        hedge_mode=args.hedge_mode, taker_deadline=args.taker_deadline, book_path=args.book, mid=Decimal(args.mid),
+        tick_size=Decimal(args.tick_size), volatility_ticks=args.volatility_ticks,
+        latency=LatencyModel(order_ms=args.order_latency_ms, cancel_ms=args.order_latency_ms,
+                             hedge_ms=args.hedge_latency_ms, seed=args.seed),
+        grvt_fee_bps=Decimal(args.grvt_fee_bps),
+        grvt_taker_fee_bps=Decimal(args.grvt_taker_fee_bps) if args.grvt_taker_fee_bps is not None else None,
+        paradex_fee_bps=Decimal(args.paradex_fee_bps),
+        seed=args.seed,
+    )
+    chase_intervals = [float(v) for v in args.chase_interval.split(",")]
+    holding_times = [int(v) for v in args.holding_time.split(",")]
+    quotings = [v.strip() for v in args.quoting.split(",")]
+
+    print(f"{'quoting':>8} {'chase':>6} {'hold':>5} {'fill_rate':>9} {'reject':>7} {'req/lot':>7} "
+          f"{'fill_avg':>8} {'fill_p95':>8} {'hedge_p50':>9} {'hedge_p95':>9} {'wear/round':>11} "
+          f"{'sim_s':>9} {'wall_s':>7}")
+    for quoting, chase_interval, holding_time in itertools.product(quotings, chase_intervals, holding_times):
+        cfg = replace(base, quoting=quoting, chase_interval=chase_interval, holding_time=holding_time,
+                      latency=replace(base.latency))
+        r = run_simulation(cfg)
+        print(f"{quoting:>8} {chase_interval:>6} {holding_time:>5} {r['fill_rate']:>9.3f} "
+              f"{r['post_only_reject_rate']:>7.3f} {r['requests_per_lot']:>7.2f} "
+              f"{r['time_to_fill_avg']:>8.2f} {r['time_to_fill_p95']:>8.2f} "
+              f"{r['time_to_hedge_p50']:>9.3f} {r['time_to_hedge_p95']:>9.3f} {r['wear_per_round']:>11.4f} "
+              f"{r['sim_seconds']:>9.0f} {r['wall_seconds']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()